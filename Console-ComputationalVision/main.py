@@ -1,22 +1,57 @@
 from __future__ import annotations
 
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import argparse
+import importlib
 import logging
 import queue
 import sys
 import threading
-import time
 import tkinter as tk
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from tkinter import messagebox, scrolledtext, ttk
-from typing import Callable
-
-import cv2
-from PIL import Image, ImageTk
+from typing import TYPE_CHECKING, Callable, Iterator
 
 from services.GrblSender import GrblSender
-from services.vision_service import VisionService
+from services.camera_discovery import discover_cameras, sysfs_available as camera_sysfs_available
+from services.model_preloader import ModelPreloader
+from services.model_registry import load_registry
+from services.resource_governor import ResourceGovernor, parse_cpu_list
+
+if TYPE_CHECKING:
+    from PIL import ImageTk
+
+    from services.vision_service import VisionService
+
+IMGSZ_CHOICES = ("default", "auto", "320", "416", "512", "640", "768", "960", "1280")
+
+# Imported on a background thread once the window is up; torch, ultralytics,
+# cvzone and OpenCV dominate startup time otherwise.
+_HEAVY_MODULES = ("services.vision_service", "PIL.Image", "PIL.ImageTk")
+
+
+def _vision_module():
+    return importlib.import_module("services.vision_service")
+
+
+def _imgsz_arg(value: str) -> str:
+    """argparse type for --imgsz: 'auto' or a positive number of pixels."""
+
+    text = value.strip().lower()
+    if text == "auto":
+        return text
+    try:
+        size = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected 'auto' or a positive integer, got '{value}'") from None
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive image size, got {size}")
+    return str(size)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -77,6 +112,267 @@ def parse_arguments() -> argparse.Namespace:
         default=None,
         help="Manually select the inference device. Defaults to CUDA when available.",
     )
+    parser.add_argument(
+        "--imgsz",
+        type=_imgsz_arg,
+        default=None,
+        help=(
+            "Inference image size in pixels (rounded up to a multiple of 32), or 'auto' to "
+            "benchmark candidate sizes at startup and keep the largest that meets "
+            "--target-latency-ms. Defaults to the model's training size."
+        ),
+    )
+    parser.add_argument(
+        "--target-latency-ms",
+        type=float,
+        default=50.0,
+        help="Per-frame inference latency target used by --imgsz auto.",
+    )
+    parser.add_argument(
+        "--warmup-iterations",
+        type=int,
+        default=10,
+        help="Upper bound on warmup predictions; warmup stops earlier once latency is stable.",
+    )
+    parser.add_argument(
+        "--lean-inference",
+        action="store_true",
+        help=(
+            "Call the network directly with a preallocated letterboxed input and vectorised NMS "
+            "instead of model.predict, skipping the ultralytics Results objects."
+        ),
+    )
+    parser.add_argument(
+        "--optimize",
+        choices=("none", "trace", "compile"),
+        default="none",
+        help=(
+            "Optimise the network for the capture shape: 'trace' builds a frozen TorchScript module "
+            "cached under models/.cache, 'compile' uses torch.compile. Implies the lean inference "
+            "path; falls back to the eager model when unsupported."
+        ),
+    )
+    parser.add_argument(
+        "--channels-last",
+        action="store_true",
+        help=(
+            "Convert the network and its inputs to channels-last memory format (often faster on CPU). "
+            "Applies to the eager, lean and optimised paths; ignored for exported models."
+        ),
+    )
+    parser.add_argument(
+        "--class-conf",
+        default=None,
+        help=(
+            "Per-class confidence thresholds such as 'soap=0.5,coke=0.8'. Other classes use "
+            "max(--confidence-threshold, 0.75). Thresholds are applied right after NMS."
+        ),
+    )
+    parser.add_argument(
+        "--tiled",
+        action="store_true",
+        help=(
+            "Split each frame into overlapping tiles and run them as one batch so small items "
+            "keep more pixels; boxes are merged back to frame coordinates with class-aware NMS."
+        ),
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=640,
+        help="Tile edge in frame pixels for --tiled.",
+    )
+    parser.add_argument(
+        "--tile-overlap",
+        type=float,
+        default=0.2,
+        help="Fraction of the tile size shared by neighbouring tiles for --tiled.",
+    )
+    parser.add_argument(
+        "--tile-nms-iou",
+        type=float,
+        default=0.5,
+        help="IoU above which boxes of the same class from different tiles are merged.",
+    )
+    parser.add_argument(
+        "--tile-full-frame",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Add the whole frame to the tile batch so large items cut by tile borders are still found.",
+    )
+    parser.add_argument(
+        "--roi",
+        action="append",
+        default=None,
+        help=(
+            "Static region of interest as x1,y1,x2,y2 fractions of the frame (repeatable, or "
+            "';'-separated). Inference runs on these crops only and detections outside them are "
+            "ignored. ROIs can also be drawn on the preview."
+        ),
+    )
+    parser.add_argument(
+        "--roi-tracks",
+        action="store_true",
+        help="Infer on crops around the previous detections instead of the full frame.",
+    )
+    parser.add_argument(
+        "--roi-track-margin",
+        type=float,
+        default=0.5,
+        help="Fraction of a detection's size added on each side of its --roi-tracks crop.",
+    )
+    parser.add_argument(
+        "--roi-full-frame-every",
+        type=int,
+        default=10,
+        help="With ROIs or --roi-tracks, make every Nth inference a full-frame pass to catch new objects (0 never).",
+    )
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help=(
+            "Gate the detector with a cheap colour/size and motion check on every frame; the full "
+            "model only runs when candidates appear, change or move, or confidences are ambiguous."
+        ),
+    )
+    parser.add_argument(
+        "--cascade-profile",
+        default=None,
+        help="Colour profile from tools.build_cascade_profile (default models/cascade_profile.json).",
+    )
+    parser.add_argument(
+        "--cascade-motion-threshold",
+        type=float,
+        default=0.02,
+        help="Fraction of changed pixels since the last full inference that forces a new one.",
+    )
+    parser.add_argument(
+        "--cascade-max-skipped",
+        type=int,
+        default=30,
+        help="Run the full model after this many gated frames in a row, whatever the first stage says.",
+    )
+    parser.add_argument(
+        "--grbl-streaming",
+        action="store_true",
+        help=(
+            "Stream multi-line GRBL programs with character-counting flow control (keeps the "
+            "128-byte RX buffer full) instead of waiting for each 'ok' before the next line."
+        ),
+    )
+    parser.add_argument(
+        "--grbl-session",
+        action="store_true",
+        help=(
+            "Set units, relative mode and feed once and send each move as a single line, re-sending "
+            "modal words only when they change. The controller is left in G91 between moves."
+        ),
+    )
+    parser.add_argument(
+        "--refine-frame-width",
+        type=int,
+        default=1920,
+        help=(
+            "Capture width of the single high-resolution frame used to refine a pick target; "
+            "stream at a lower --frame-width and refine on demand."
+        ),
+    )
+    parser.add_argument(
+        "--refine-frame-height",
+        type=int,
+        default=1080,
+        help="Capture height of the high-resolution refinement frame.",
+    )
+    parser.add_argument(
+        "--idle-after",
+        type=float,
+        default=0.0,
+        help=(
+            "Seconds without detections before switching the camera to the idle resolution and frame "
+            "rate and inferring less often; any detection or motion switches back (0 disables)."
+        ),
+    )
+    parser.add_argument("--idle-frame-width", type=int, default=640, help="Capture width while idle.")
+    parser.add_argument("--idle-frame-height", type=int, default=360, help="Capture height while idle.")
+    parser.add_argument("--idle-fps", type=float, default=10.0, help="Capture frame rate while idle.")
+    parser.add_argument(
+        "--idle-inference-interval",
+        type=int,
+        default=10,
+        help="Run inference every N frames while idle.",
+    )
+    parser.add_argument(
+        "--idle-motion-threshold",
+        type=float,
+        default=0.01,
+        help="Fraction of changed pixels between idle frames that switches back to full mode.",
+    )
+    parser.add_argument(
+        "--max-frame-age-ms",
+        type=float,
+        default=0.0,
+        help=(
+            "Drop frames older than this many milliseconds instead of processing them "
+            "(0 disables the latency SLO)."
+        ),
+    )
+    parser.add_argument(
+        "--capture-fourcc",
+        choices=("auto", "MJPG", "YUYV", "none"),
+        default="auto",
+        help=(
+            "Pixel format negotiated with the camera. 'auto' prefers MJPG at the requested size "
+            "and falls back to YUYV; 'none' leaves the backend default untouched."
+        ),
+    )
+    parser.add_argument(
+        "--capture-probe-all",
+        action="store_true",
+        help="Measure every capture mode candidate (and log its latency) instead of stopping at the first good one.",
+    )
+    parser.add_argument(
+        "--resident-timeout",
+        type=float,
+        default=300.0,
+        help=(
+            "Seconds to keep the warmed model and the open camera after Stop so that the next "
+            "Start is immediate (0 releases them as soon as the stream stops)."
+        ),
+    )
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        default=None,
+        help="torch intra-op threads for inference (defaults to one per core).",
+    )
+    parser.add_argument(
+        "--torch-interop-threads",
+        type=int,
+        default=None,
+        help="torch inter-op threads (defaults to one per core).",
+    )
+    parser.add_argument(
+        "--cv2-threads",
+        type=int,
+        default=None,
+        help="OpenCV worker threads for resize/decode (0 disables OpenCV threading).",
+    )
+    for role, description in (
+        ("capture", "camera reads (runs capture on its own thread)"),
+        ("inference", "the inference loop and model loading"),
+        ("gui", "the Tk main loop"),
+    ):
+        parser.add_argument(
+            f"--cpus-{role}",
+            type=parse_cpu_list,
+            default=None,
+            help=f"CPUs such as '0-3,6' reserved for {description}; see tools/tune_resources.py.",
+        )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Log a breakdown of startup time (imports, camera, serial and model loading).",
+    )
     parser.add_argument(
         "--window-name",
         default="YOLOv12 Detection",
@@ -102,6 +398,54 @@ class CommandRequest:
     on_error: Callable[[Exception | None], None] | None = None
 
 
+class StartupProfiler:
+    """Collect the startup phase timings reported by ``--profile-startup``."""
+
+    def __init__(self, enabled: bool, origin: float = _PROCESS_START) -> None:
+        self.enabled = enabled
+        self.origin = origin
+        self._lock = threading.Lock()
+        self._phases: list[tuple[str, float, float]] = []
+        self._pending: set[str] = set()
+        self._reported = False
+        self.on_complete: Callable[[list[str]], None] | None = None
+
+    def expect(self, *names: str) -> None:
+        with self._lock:
+            self._pending.update(names)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def mark(self, name: str) -> None:
+        """Record a milestone measured from process start."""
+
+        self.record(name, self.origin, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float) -> None:
+        with self._lock:
+            self._phases.append((name, start - self.origin, end - start))
+            self._pending.discard(name)
+            complete = not self._pending and not self._reported
+            if complete:
+                self._reported = True
+        if complete and self.enabled and self.on_complete is not None:
+            self.on_complete(self.report_lines())
+
+    def report_lines(self) -> list[str]:
+        with self._lock:
+            phases = sorted(self._phases, key=lambda phase: phase[1])
+        lines = ["Startup profile (offset from process start / duration):"]
+        for name, offset, duration in phases:
+            lines.append(f"  {name:<24} +{offset * 1000:8.1f} ms  {duration * 1000:8.1f} ms")
+        return lines
+
+
 class TkQueueHandler(logging.Handler):
     def __init__(self, target_queue: queue.Queue[str]) -> None:
         super().__init__()
@@ -158,8 +502,14 @@ class QueueStreamRedirector:
 
 
 class VisionGUI:
-    def __init__(self, root: tk.Tk, initial_args: argparse.Namespace) -> None:
+    def __init__(
+        self,
+        root: tk.Tk,
+        initial_args: argparse.Namespace,
+        startup_profiler: StartupProfiler | None = None,
+    ) -> None:
         self.root = root
+        self.startup_profiler = startup_profiler or StartupProfiler(enabled=False)
         self.root.title(initial_args.window_name)
         self.initial_args = initial_args
 
@@ -187,6 +537,7 @@ class VisionGUI:
             "inference_interval": str(getattr(initial_args, "inference_interval", 3)),
             "confidence_threshold": str(getattr(initial_args, "confidence_threshold", 0.6)),
             "digital_zoom": f"{float(getattr(initial_args, 'digital_zoom', 1.0)):.1f}",
+            "imgsz": str(getattr(initial_args, "imgsz", None) or "default"),
             "window_name": self.window_title,
         }
 
@@ -195,19 +546,25 @@ class VisionGUI:
 
         self.device_var = tk.StringVar(value=initial_args.device or "auto")
         self.status_var = tk.StringVar(value="Idle")
+        self.frame_age_var = tk.StringVar(value="")
+        self.model_status_var = tk.StringVar(value="")
+        self._last_frame_age_update = 0.0
         self.camera_choice_var = tk.StringVar()
         self.available_labels: list[str] = []
         self.selected_labels_cache: list[str] = []
 
         self.model_paths: list[str] = []
+        self._model_display_labels: dict[str, str] = {}
         self.camera_options: list[dict] = []
 
         self.serial_port_var = tk.StringVar()
         self.grbl_command_var = tk.StringVar()
         self.grbl_log_queue: queue.Queue[str] = queue.Queue()
-        self.grbl_sender = GrblSender()
-        self.grbl_reader_thread: threading.Thread | None = None
-        self.grbl_reader_stop: threading.Event | None = None
+        self.grbl_sender = GrblSender(
+            streaming=bool(getattr(initial_args, "grbl_streaming", False)),
+            modal_session=bool(getattr(initial_args, "grbl_session", False)),
+        )
+        self.grbl_sender.add_line_listener(lambda line: self._log_grbl(f"<< {line}"))
         self._serial_ports_lookup: dict[str, dict] = {}
         self.grbl_coordinate_vars: dict[str, tk.StringVar] = {
             axis: tk.StringVar(value="0") for axis in ("x", "y", "z")
@@ -223,6 +580,12 @@ class VisionGUI:
         self.photo_image: ImageTk.PhotoImage | None = None
         self.video_canvas_image_id: int | None = None
         self.service: VisionService | None = None
+        initial_rois = getattr(initial_args, "roi", None) or []
+        self.roi_spec: list[str] = [initial_rois] if isinstance(initial_rois, str) else list(initial_rois)
+        self.roi_draw_var = tk.BooleanVar(value=False)
+        self.roi_status_var = tk.StringVar(value=self._describe_rois())
+        self._roi_drag_start: tuple[float, float] | None = None
+        self._roi_drag_item: int | None = None
         self.worker: threading.Thread | None = None
         self.stop_event: threading.Event | None = None
         self.running = False
@@ -260,7 +623,23 @@ class VisionGUI:
         self._command_worker_thread: threading.Thread | None = None
         self._command_inflight = threading.Event()
 
+        self.startup_profiler.on_complete = self._report_startup_profile
+        self.startup_profiler.expect("window shown", "heavy imports", "camera enumeration")
+        self._model_preload_generation = 0
+        self._model_preload_started_at: float | None = None
+        self._start_pending = False
+        self.model_preloader = ModelPreloader(
+            on_progress=lambda gen, stage, fraction: self._post_to_ui(
+                self._on_model_preload_progress, gen, stage, fraction
+            ),
+            on_ready=lambda gen, loaded: self._post_to_ui(self._on_model_preload_ready, gen, loaded),
+            on_error=lambda gen, exc: self._post_to_ui(self._on_model_preload_error, gen, exc),
+        )
+        self._camera_scan_generation = 0
+
         self._build_layout()
+        self.root.after(0, lambda: self.startup_profiler.mark("window shown"))
+        self._start_heavy_import_thread()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self._schedule_preview_update()
         self._schedule_grbl_log_update()
@@ -290,6 +669,14 @@ class VisionGUI:
         refresh_models_btn = ttk.Button(control_frame, text="🔃", width=3, command=self._on_model_refresh_clicked)
         refresh_models_btn.grid(row=row, column=2, padx=4)
 
+        row += 1
+        ttk.Label(control_frame, textvariable=self.model_status_var, foreground="gray").grid(
+            row=row,
+            column=1,
+            columnspan=2,
+            sticky="w",
+        )
+
         row += 1
         ttk.Label(control_frame, text="Camera").grid(row=row, column=0, sticky="w", pady=2)
         self.camera_combobox = ttk.Combobox(
@@ -299,7 +686,7 @@ class VisionGUI:
         )
         self.camera_combobox.grid(row=row, column=1, sticky="ew", pady=2)
         self.camera_combobox.bind("<<ComboboxSelected>>", lambda _event: self._on_camera_selected())
-        rescan_btn = ttk.Button(control_frame, text="🔃", width=3, command=self._populate_camera_combobox)
+        rescan_btn = ttk.Button(control_frame, text="🔃", width=3, command=self._on_camera_rescan_clicked)
         rescan_btn.grid(row=row, column=2, padx=4)
 
         row += 1
@@ -350,6 +737,23 @@ class VisionGUI:
         )
         self.zoom_spinbox.grid(row=row, column=1, sticky="ew", pady=2)
 
+        row += 1
+        ttk.Label(control_frame, text="Image size").grid(row=row, column=0, sticky="w", pady=2)
+        self.imgsz_combobox = ttk.Combobox(
+            control_frame,
+            textvariable=self.arg_vars["imgsz"],
+            values=IMGSZ_CHOICES,
+        )
+        self.imgsz_combobox.grid(row=row, column=1, sticky="ew", pady=2)
+        self.imgsz_combobox.bind("<<ComboboxSelected>>", lambda _event: self._request_model_preload())
+        imgsz_help = ttk.Button(
+            control_frame,
+            text="?",
+            width=3,
+            command=self._show_imgsz_info,
+        )
+        imgsz_help.grid(row=row, column=2, padx=4)
+
         row += 1
         ttk.Label(control_frame, text="Device").grid(row=row, column=0, sticky="w", pady=2)
         device_box = ttk.Combobox(
@@ -360,6 +764,7 @@ class VisionGUI:
         )
         device_box.grid(row=row, column=1, sticky="ew", pady=2)
         device_box.current(("auto", "cpu", "cuda").index(self.device_var.get() or "auto"))
+        device_box.bind("<<ComboboxSelected>>", lambda _event: self._request_model_preload())
         device_help = ttk.Button(
             control_frame,
             text="?",
@@ -385,6 +790,12 @@ class VisionGUI:
         status_frame.grid(row=status_row, column=0, columnspan=3, sticky="w", pady=(8, 0))
         ttk.Label(status_frame, text="State:").grid(row=0, column=0, sticky="w")
         ttk.Label(status_frame, textvariable=self.status_var).grid(row=0, column=1, sticky="w", padx=(4, 0))
+        ttk.Label(status_frame, textvariable=self.frame_age_var, foreground="gray").grid(
+            row=1,
+            column=0,
+            columnspan=2,
+            sticky="w",
+        )
 
         labels_row = status_row + 1
         control_frame.rowconfigure(labels_row, weight=1)
@@ -530,7 +941,8 @@ class VisionGUI:
 
         self._refresh_model_paths(initial=True)
         self._populate_camera_combobox()
-        self._refresh_serial_ports()
+        with self.startup_profiler.measure("serial enumeration"):
+            self._refresh_serial_ports()
 
         preview_frame = ttk.LabelFrame(self.root, text="Camera Preview")
         preview_frame.grid(row=0, column=1, sticky="nsew", padx=(0, 10), pady=10)
@@ -550,6 +962,20 @@ class VisionGUI:
         )
         self.video_canvas.grid(row=0, column=0, sticky="nsew")
         self.video_canvas.bind("<Configure>", lambda _event: self._center_video_image())
+        self.video_canvas.bind("<ButtonPress-1>", self._on_roi_drag_start)
+        self.video_canvas.bind("<B1-Motion>", self._on_roi_drag_motion)
+        self.video_canvas.bind("<ButtonRelease-1>", self._on_roi_drag_end)
+
+        roi_bar = ttk.Frame(video_canvas_container)
+        roi_bar.grid(row=1, column=0, sticky="ew", pady=(4, 0))
+        ttk.Checkbutton(roi_bar, text="Draw ROI", variable=self.roi_draw_var).grid(row=0, column=0, sticky="w")
+        ttk.Button(roi_bar, text="Clear ROIs", command=self._clear_rois).grid(row=0, column=1, padx=(6, 0))
+        ttk.Label(roi_bar, textvariable=self.roi_status_var, foreground="gray").grid(
+            row=0,
+            column=2,
+            sticky="w",
+            padx=(6, 0),
+        )
 
         python_log_frame = ttk.LabelFrame(preview_frame, text="Python Logs")
         python_log_frame.grid(row=1, column=0, sticky="nsew", padx=6, pady=(6, 6))
@@ -566,12 +992,124 @@ class VisionGUI:
 
     def _on_model_refresh_clicked(self) -> None:
         self._refresh_model_paths()
-        self._load_labels_if_possible()
 
     def _on_model_selected(self) -> None:
         selection = self.model_combobox.get().strip()
+        by_label = {label: path for path, label in self._model_display_labels.items()}
+        selection = by_label.get(selection, selection)
         self.arg_vars["model_path"].set(selection)
-        self._load_labels_if_possible()
+        self._request_model_preload()
+
+    def _post_to_ui(self, callback: Callable[..., None], *args: object) -> None:
+        try:
+            self.root.after(0, lambda: callback(*args))
+        except (tk.TclError, RuntimeError):
+            pass
+
+    def _collect_model_args(self) -> argparse.Namespace | None:
+        """Collect only what model loading needs, so preloading works before a camera is chosen."""
+
+        model_path = self.arg_vars["model_path"].get().strip()
+        if not model_path:
+            return None
+        values = dict(vars(self.initial_args))
+        values["model_path"] = model_path
+        device_value = self.device_var.get()
+        values["device"] = None if device_value == "auto" else device_value
+        try:
+            values["imgsz"] = self._collect_imgsz()
+        except ValueError:
+            return None
+        for key in ("frame_width", "frame_height"):
+            try:
+                values[key] = int(self.arg_vars[key].get().strip())
+            except ValueError:
+                pass
+        return argparse.Namespace(**values)
+
+    def _request_model_preload(self) -> None:
+        """Load and warm the selected model in the background so Start is instant.
+
+        While streaming, the warmed model is swapped into the running service
+        instead of waiting for the next Start.
+        """
+
+        args = self._collect_model_args()
+        if args is None:
+            return
+        resolved = Path(args.model_path)
+        if not resolved.is_absolute():
+            resolved = (self._project_root / args.model_path).resolve()
+        if not resolved.exists():
+            self.model_status_var.set("")
+            return
+
+        if self.service is not None and self.service.loaded_model.matches(args):
+            self.model_preloader.cancel()
+            self._model_preload_generation = 0
+            self.model_status_var.set("")
+            return
+
+        if self._model_preload_started_at is None:
+            self._model_preload_started_at = time.perf_counter()
+            self.startup_profiler.expect("model preload")
+        generation = self.model_preloader.request(args)
+        if generation != self._model_preload_generation:
+            self._model_preload_generation = generation
+            self.model_status_var.set("Model: queued for loading…")
+
+    def _on_model_preload_progress(self, generation: int, stage: str, fraction: float) -> None:
+        if generation != self._model_preload_generation:
+            return
+        self.model_status_var.set(f"Model: {stage} ({fraction:.0%})")
+
+    def _on_model_preload_ready(self, generation: int, loaded) -> None:
+        if generation != self._model_preload_generation:
+            return
+        if self._model_preload_started_at is not None:
+            self.startup_profiler.record("model preload", self._model_preload_started_at, time.perf_counter())
+        report = loaded.warmup_report
+        self.model_status_var.set(f"Model ready on {loaded.device} ({report.steady_state_ms:.0f} ms/frame)")
+        self.logger.info("Preloaded %s: %s", loaded.model_path, report.describe())
+
+        model_path = self.arg_vars["model_path"].get().strip()
+        if model_path != loaded.model_path:
+            return
+
+        service = self.service
+        hot_swap = self.running and service is not None and service.loaded_model is not loaded
+        if hot_swap and self.model_preloader.claim(generation) is None:
+            hot_swap = False
+
+        if model_path != self.last_loaded_model:
+            self.last_loaded_model = model_path
+            labels = loaded.labels()
+            self._populate_label_list(labels)
+            self.logger.info("Loaded %d labels from %s", len(labels), model_path)
+
+        if hot_swap:
+            selected = self._get_selected_labels()
+            self.selected_labels_cache = selected
+            service.swap_model(loaded, selected or None)
+            self.model_status_var.set(f"Model swapped in on {loaded.device} ({report.steady_state_ms:.0f} ms/frame)")
+        else:
+            self._apply_label_selection()
+
+        if self._start_pending:
+            self._start_pending = False
+            self.start_button.configure(state="normal")
+            self.start_stream()
+
+    def _on_model_preload_error(self, generation: int, error: BaseException) -> None:
+        if generation != self._model_preload_generation:
+            return
+        self.model_status_var.set("Model: failed to load")
+        self.logger.error("Failed to preload model: %s", error)
+        if self._start_pending:
+            self._start_pending = False
+            self.status_var.set("Idle")
+            self.start_button.configure(state="normal")
+            messagebox.showerror("Failed to start vision service", str(error))
 
     def _ensure_model_in_list(self, path: str) -> None:
         if not path:
@@ -579,7 +1117,13 @@ class VisionGUI:
         if path not in self.model_paths:
             self.model_paths.append(path)
             self.model_paths.sort()
-        self.model_combobox.configure(values=self.model_paths)
+        self._set_model_values(self.model_paths)
+
+    def _set_model_values(self, paths: list[str]) -> None:
+        """Show ``paths`` in the model combobox under their registry labels."""
+
+        self._model_display_labels = self._describe_model_paths(paths)
+        self.model_combobox.configure(values=[self._model_display_labels[path] for path in paths])
 
     def _discover_model_files(self) -> list[str]:
         model_dir = self._project_root / "models"
@@ -587,7 +1131,8 @@ class VisionGUI:
             return []
 
         discovered: list[str] = []
-        for file_path in sorted(model_dir.rglob("*.pt")):
+        files = [*model_dir.rglob("*.pt"), *model_dir.rglob("*.torchscript")]
+        for file_path in sorted(files):
             try:
                 relative = file_path.relative_to(self._project_root)
                 discovered.append(relative.as_posix())
@@ -595,6 +1140,20 @@ class VisionGUI:
                 discovered.append(file_path.as_posix())
         return discovered
 
+    def _describe_model_paths(self, paths: list[str]) -> dict[str, str]:
+        """Annotate registered builds (e.g. INT8) with their measured latency and mAP change."""
+
+        labels: dict[str, str] = {}
+        registries: dict[Path, dict] = {}
+        for path in paths:
+            full_path = Path(path) if Path(path).is_absolute() else self._project_root / path
+            folder = full_path.parent
+            if folder not in registries:
+                registries[folder] = load_registry(folder)
+            record = registries[folder].get(full_path.name)
+            labels[path] = f"{path} — {record.describe()}" if record else path
+        return labels
+
     def _refresh_model_paths(self, initial: bool = False) -> None:
         discovered = self._discover_model_files()
         extras = [path for path in self.model_paths if path not in discovered]
@@ -605,7 +1164,7 @@ class VisionGUI:
             combined.insert(0, current)
 
         self.model_paths = combined
-        self.model_combobox.configure(values=self.model_paths)
+        self._set_model_values(combined)
 
         if not self.model_paths:
             self.model_combobox.set("")
@@ -617,10 +1176,34 @@ class VisionGUI:
         elif current:
             self.model_combobox.set(current)
 
-        self._load_labels_if_possible()
+        self._request_model_preload()
+
+    def _populate_camera_combobox(self, *, force: bool = False) -> None:
+        self._camera_scan_generation += 1
+        generation = self._camera_scan_generation
+        if not self.camera_options:
+            self.camera_combobox.configure(values=("Scanning cameras…",), state="disabled")
+            self.camera_choice_var.set("Scanning cameras…")
+
+        def _scan() -> None:
+            start = time.perf_counter()
+            try:
+                cameras = self._enumerate_cameras(force=force)
+            except Exception as exc:  # pragma: no cover - hardware feedback
+                self.logger.error("Camera enumeration failed: %s", exc)
+                cameras = []
+            self.startup_profiler.record("camera enumeration", start, time.perf_counter())
+            try:
+                self.root.after(0, lambda: self._apply_camera_options(cameras, generation))
+            except (tk.TclError, RuntimeError):
+                pass
+
+        threading.Thread(target=_scan, name="CameraScan", daemon=True).start()
 
-    def _populate_camera_combobox(self) -> None:
-        self.camera_options = self._enumerate_cameras()
+    def _apply_camera_options(self, cameras: list[dict], generation: int) -> None:
+        if generation != self._camera_scan_generation:
+            return
+        self.camera_options = cameras
         if not self.camera_options:
             self.camera_combobox.configure(values=("No cameras detected",), state="disabled")
             self.camera_choice_var.set("No cameras detected")
@@ -643,62 +1226,21 @@ class VisionGUI:
         self.camera_choice_var.set(selected["label"])
         self._apply_camera_selection(selected)
 
-    def _enumerate_cameras(self, max_devices: int = 10) -> list[dict]:
-        cameras: list[dict] = []
-        for index in range(max_devices):
-            cap = cv2.VideoCapture(index)
-            if not cap.isOpened():
-                cap.release()
-                v4l2_backend = getattr(cv2, "CAP_V4L2", None)
-                if v4l2_backend is not None:
-                    cap = cv2.VideoCapture(index, v4l2_backend)
-                else:
-                    cap = cv2.VideoCapture(index)
-            if not cap.isOpened():
-                cap.release()
-                continue
-
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
-            backend_name = ""
-            get_backend = getattr(cap, "getBackendName", None)
-            if callable(get_backend):
-                try:
-                    backend_name = str(get_backend())
-                except Exception:
-                    backend_name = ""
-            cap.release()
-
+    def _enumerate_cameras(self, max_devices: int = 10, *, force: bool = False) -> list[dict]:
+        cameras = discover_cameras(max_devices, force=force)
+        for camera in cameras:
+            width, height = camera.get("default_resolution", (0, 0))
             if width <= 0:
                 width = int(self.initial_args.frame_width)
             if height <= 0:
                 height = int(self.initial_args.frame_height)
-
-            name = self._resolve_camera_name(index)
-            descriptor_parts = [name]
-            if backend_name:
-                descriptor_parts.append(backend_name)
-            descriptor = " - ".join(part for part in descriptor_parts if part)
-            resolution = f"{width}x{height}"
-            label = f"{index}: {descriptor} ({resolution})"
-            cameras.append(
-                {
-                    "index": index,
-                    "name": name,
-                    "label": label,
-                    "default_resolution": (width, height),
-                }
-            )
+            camera["default_resolution"] = (width, height)
         return cameras
 
-    def _resolve_camera_name(self, index: int) -> str:
-        sysfs_name = Path(f"/sys/class/video4linux/video{index}/name")
-        if sysfs_name.exists():
-            try:
-                return sysfs_name.read_text(encoding="utf-8").strip()
-            except OSError:
-                pass
-        return f"Camera {index}"
+    def _on_camera_rescan_clicked(self) -> None:
+        # sysfs-backed discovery invalidates itself when the device set changes;
+        # elsewhere an explicit rescan is the only signal that devices changed.
+        self._populate_camera_combobox(force=not camera_sysfs_available())
 
     def _on_camera_selected(self) -> None:
         if not self.camera_options:
@@ -738,6 +1280,17 @@ class VisionGUI:
             ),
         )
 
+    def _show_imgsz_info(self) -> None:
+        messagebox.showinfo(
+            "Image size",
+            (
+                "Size the frame is letterboxed to before inference. Smaller sizes are faster "
+                "but lose small products; 'auto' benchmarks the candidates and keeps the "
+                "largest one that meets the latency target. Coordinates are always reported "
+                "in original frame pixels."
+            ),
+        )
+
     def _show_device_info(self) -> None:
         messagebox.showinfo(
             "Device (Vision Compiler)",
@@ -823,13 +1376,11 @@ class VisionGUI:
         self.connect_serial_button.configure(state="disabled")
         self.disconnect_serial_button.configure(state="normal")
         self._update_command_button_state()
-        self._start_grbl_reader()
         self._refresh_serial_ports()
         self._refresh_current_position_display(force=True)
 
     def _disconnect_grbl(self) -> None:
         port = self.grbl_sender.port
-        self._stop_grbl_reader()
         self.grbl_sender.close_connection()
         self.grbl_sender.clear_trace()
         if port:
@@ -1159,11 +1710,11 @@ class VisionGUI:
 
             start = time.monotonic()
             success = True
-            responses: list[str] = []
             error: Exception | None = None
             self._emit_command_event("dequeue_at", request=request)
             try:
-                responses = request.execute() or []
+                # Responses reach the log through the sender's line listener.
+                request.execute()
             except Exception as exc:  # pragma: no cover - hardware interactions
                 success = False
                 error = exc
@@ -1175,10 +1726,7 @@ class VisionGUI:
                 duration=f"{duration:.6f}",
                 status="success" if success else "error",
             )
-            if success:
-                for line in responses:
-                    self._log_grbl(f"<< {line}")
-            else:
+            if not success:
                 message = f"{request.name} failed: {error}"
                 self._log_grbl(message)
                 self.logger.error(message)
@@ -1246,48 +1794,7 @@ class VisionGUI:
         self._emit_command_event("enqueue_at", request=request)
         self._command_queue.put(request)
 
-    def _start_grbl_reader(self) -> None:
-        if self.grbl_reader_thread and self.grbl_reader_thread.is_alive():
-            return
-
-        self.grbl_reader_stop = threading.Event()
-        self.grbl_reader_thread = threading.Thread(target=self._grbl_reader_loop, daemon=True)
-        self.grbl_reader_thread.start()
-
-    def _stop_grbl_reader(self) -> None:
-        if self.grbl_reader_stop is not None:
-            self.grbl_reader_stop.set()
-        self.grbl_reader_stop = None
-        self.grbl_reader_thread = None
-
-    def _grbl_reader_loop(self) -> None:
-        assert self.grbl_reader_stop is not None
-        while not self.grbl_reader_stop.is_set():
-            ser = self.grbl_sender.ser
-            if not ser or not ser.is_open:
-                time.sleep(0.1)
-                continue
-
-            if self._command_inflight.is_set():
-                time.sleep(0.02)
-                continue
-
-            try:
-                raw = ser.readline()
-            except Exception as exc:  # pragma: no cover - hardware feedback
-                self._log_grbl(f"Serial error: {exc}")
-                self.grbl_reader_stop.set()
-                break
-
-            if not raw:
-                continue
-
-            text = raw.decode("utf-8", errors="replace").strip()
-            if text:
-                self._log_grbl(f"<< {text}")
-
     def _teardown_grbl(self) -> None:
-        self._stop_grbl_reader()
         self.grbl_sender.close_connection()
         self.grbl_sender.clear_trace()
         self._refresh_current_position_display(force=True)
@@ -1308,18 +1815,61 @@ class VisionGUI:
             pass
         self.python_log_handler.close()
 
+    def _start_heavy_import_thread(self) -> None:
+        def _import_heavy_modules() -> None:
+            start = time.perf_counter()
+            for module_name in _HEAVY_MODULES:
+                try:
+                    importlib.import_module(module_name)
+                except Exception as exc:  # pragma: no cover - environment feedback
+                    self.logger.error("Failed to import %s: %s", module_name, exc)
+            self.startup_profiler.record("heavy imports", start, time.perf_counter())
+
+        threading.Thread(target=_import_heavy_modules, name="HeavyImports", daemon=True).start()
+
+    def _report_startup_profile(self, lines: list[str]) -> None:
+        for line in lines:
+            self.logger.info(line)
+        try:
+            print("\n".join(lines), file=self._original_stdout, flush=True)
+        except Exception:  # pragma: no cover - console may be detached
+            pass
+
     def _schedule_preview_update(self) -> None:
         try:
-            frame = self.frame_queue.get_nowait()
+            frame, frame_info = self.frame_queue.get_nowait()
         except queue.Empty:
             pass
         else:
+            from PIL import Image, ImageTk
+
             image = Image.fromarray(frame[:, :, ::-1])
             self.photo_image = ImageTk.PhotoImage(image=image)
             self._draw_video_frame()
+            self._record_displayed_frame(frame_info)
         finally:
             self.root.after(30, self._schedule_preview_update)
 
+    def _record_displayed_frame(self, frame_info) -> None:
+        service = self.service
+        if service is None:
+            return
+        service.record_displayed_frame(frame_info)
+
+        now = time.monotonic()
+        if now - self._last_frame_age_update < 1.0:
+            return
+        self._last_frame_age_update = now
+        metrics = service.get_metrics()
+        pipeline = metrics["frame_age_ms"]
+        display = metrics["display_age_ms"]
+        self.frame_age_var.set(
+            f"Frame age p50/p90/p99: pipeline {pipeline['p50']:.0f}/{pipeline['p90']:.0f}/{pipeline['p99']:.0f} ms, "
+            f"display {display['p50']:.0f}/{display['p90']:.0f}/{display['p99']:.0f} ms, "
+            f"dropped {metrics['dropped_frames']}, {metrics['power_mode']} "
+            f"(CPU {metrics['usage'].get(metrics['power_mode'], {}).get('cpu_percent', 0.0):.0f}%)"
+        )
+
     def _draw_video_frame(self) -> None:
         if not hasattr(self, "video_canvas"):
             return
@@ -1363,6 +1913,92 @@ class VisionGUI:
             canvas_height / 2,
         )
 
+    def _describe_rois(self) -> str:
+        count = sum(len([chunk for chunk in spec.split(";") if chunk.strip()]) for spec in self.roi_spec)
+        return f"{count} ROI(s), inference limited to them" if count else "Full frame"
+
+    def _canvas_to_frame(self, x: float, y: float) -> tuple[float, float] | None:
+        """Convert canvas pixels to fractions of the captured frame, undoing the digital zoom."""
+
+        if self.photo_image is None:
+            return None
+        image_width = self.photo_image.width()
+        image_height = self.photo_image.height()
+        left = (self.video_canvas.winfo_width() - image_width) / 2
+        top = (self.video_canvas.winfo_height() - image_height) / 2
+        display_x = min(max((x - left) / image_width, 0.0), 1.0)
+        display_y = min(max((y - top) / image_height, 0.0), 1.0)
+        zoom = float(getattr(self.service.args if self.service else self.initial_args, "digital_zoom", 1.0))
+        frame_x, frame_y = _vision_module().display_to_frame(display_x, display_y, zoom)
+        return min(max(frame_x, 0.0), 1.0), min(max(frame_y, 0.0), 1.0)
+
+    def _on_roi_drag_start(self, event) -> None:
+        if not self.roi_draw_var.get() or self.photo_image is None:
+            return
+        self._roi_drag_start = (event.x, event.y)
+        self._roi_drag_item = self.video_canvas.create_rectangle(
+            event.x,
+            event.y,
+            event.x,
+            event.y,
+            outline="#0080ff",
+            dash=(4, 2),
+        )
+
+    def _on_roi_drag_motion(self, event) -> None:
+        if self._roi_drag_start is None or self._roi_drag_item is None:
+            return
+        self.video_canvas.coords(self._roi_drag_item, *self._roi_drag_start, event.x, event.y)
+
+    def _on_roi_drag_end(self, event) -> None:
+        start = self._roi_drag_start
+        self._roi_drag_start = None
+        if self._roi_drag_item is not None:
+            self.video_canvas.delete(self._roi_drag_item)
+            self._roi_drag_item = None
+        if start is None:
+            return
+        if abs(event.x - start[0]) < 8 or abs(event.y - start[1]) < 8:
+            return
+
+        first = self._canvas_to_frame(*start)
+        second = self._canvas_to_frame(event.x, event.y)
+        if first is None or second is None:
+            return
+        self.roi_spec.append(",".join(f"{value:.4f}" for value in (*first, *second)))
+        self._apply_rois()
+
+    def _clear_rois(self) -> None:
+        self.roi_spec = []
+        self._apply_rois()
+
+    def _apply_rois(self) -> None:
+        self.roi_status_var.set(self._describe_rois())
+        if self.service is None:
+            return
+        try:
+            self.service.set_rois(self.roi_spec)
+        except ValueError as exc:
+            self.roi_spec.pop()
+            self.roi_status_var.set(self._describe_rois())
+            messagebox.showerror("Invalid ROI", str(exc))
+            return
+        self.logger.info("Inference ROIs: %s", ";".join(self.roi_spec) or "full frame")
+
+    def _collect_imgsz(self) -> str | None:
+        raw = self.arg_vars["imgsz"].get().strip().lower()
+        if raw in ("", "default"):
+            return None
+        if raw == "auto":
+            return raw
+        try:
+            value = int(raw)
+        except ValueError as exc:
+            raise ValueError("Image size must be 'default', 'auto' or a number of pixels.") from exc
+        if value <= 0:
+            raise ValueError("Image size must be a positive number of pixels.")
+        return str(value)
+
     def _collect_args(self) -> argparse.Namespace:
         values: dict[str, object] = {}
 
@@ -1404,6 +2040,12 @@ class VisionGUI:
         device_value = self.device_var.get()
         values["device"] = None if device_value == "auto" else device_value
         values["window_name"] = self.window_title
+        values["imgsz"] = self._collect_imgsz()
+        values["roi"] = list(self.roi_spec) or None
+
+        # Options without a widget keep the value given on the command line.
+        for key, value in vars(self.initial_args).items():
+            values.setdefault(key, value)
 
         args = argparse.Namespace(**values)
         return args
@@ -1421,8 +2063,22 @@ class VisionGUI:
         window_title = getattr(args, "window_name", "YOLOv12 Detection") or "YOLOv12 Detection"
         self.root.title(window_title)
 
+        loaded_model = self.model_preloader.take(args)
+        resident = self.service is not None and self.service.loaded_model.matches(args)
+        if loaded_model is None and not resident:
+            # Loading and warmup run on the preloader thread; this thread only swaps the
+            # result in, from _on_model_preload_ready() which calls start_stream() again.
+            generation = self.model_preloader.request(args)
+            if generation != self._model_preload_generation:
+                self._model_preload_generation = generation
+                self.model_status_var.set("Model: queued for loading…")
+            self._start_pending = True
+            self.status_var.set("Waiting for model…")
+            self.start_button.configure(state="disabled")
+            return
+
         try:
-            self.service = VisionService(args)
+            self.service = self._prepare_service(args, loaded_model)
             if not self.available_labels:
                 labels = self.service.get_model_labels()
                 self._populate_label_list(labels)
@@ -1442,6 +2098,38 @@ class VisionGUI:
         self.worker = threading.Thread(target=self._run_service, daemon=True)
         self.worker.start()
 
+    def _prepare_service(self, args: argparse.Namespace, loaded_model) -> VisionService:
+        """Reuse the resident service when possible instead of reloading everything.
+
+        ``loaded_model`` is already loaded and warmed unless the resident model
+        matches ``args``; any re-warm for a new frame shape happens in the worker.
+        """
+
+        service = self.service
+        if service is not None:
+            if loaded_model is not None:
+                service.swap_model(loaded_model)
+            if service.loaded_model.matches(args):
+                service.update_args(args)
+                return service
+            service.release()
+            self.service = None
+
+        service = _vision_module().VisionService(args, loaded_model)
+        service.on_idle_release = lambda svc=service: self._post_to_ui(self._on_service_idle_release, svc)
+        return service
+
+    def _on_service_idle_release(self, service: VisionService) -> None:
+        if self.running or self.service is not service:
+            return
+        self._drop_resident_service()
+        self.logger.info("Released resident vision service after idle timeout.")
+
+    def _drop_resident_service(self) -> None:
+        # Drop the resident model too; the next Start reloads it.
+        self.service = None
+        self.last_loaded_model = ""
+
     def stop_stream(self) -> None:
         if not self.running:
             return
@@ -1464,32 +2152,41 @@ class VisionGUI:
         finally:
             self.root.after(0, self._on_service_stopped)
 
-    def _on_frame(self, frame) -> None:
+    def _on_frame(self, frame, frame_info) -> None:
         if self.stop_event and self.stop_event.is_set():
             return
+        item = (frame.copy(), frame_info)
         try:
-            self.frame_queue.put_nowait(frame.copy())
+            self.frame_queue.put_nowait(item)
         except queue.Full:
             try:
                 _ = self.frame_queue.get_nowait()
             except queue.Empty:
                 pass
             try:
-                self.frame_queue.put_nowait(frame.copy())
+                self.frame_queue.put_nowait(item)
             except queue.Full:
                 pass
 
     def _on_service_stopped(self) -> None:
         self.running = False
+        service = self.service
+        if service is not None and float(getattr(service.args, "resident_timeout", 0.0) or 0.0) <= 0:
+            # The capture was already released by run(); its idle notification arrived while
+            # running was still set and was ignored, so the model is dropped here instead.
+            self._drop_resident_service()
+            self.logger.info("Released vision service after stop (--resident-timeout 0).")
         if not self.status_var.get().startswith("Error:"):
             self.status_var.set("Idle")
         self.start_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
-        self.service = None
         self.worker = None
         self.stop_event = None
 
     def _on_close(self) -> None:
+        self.model_preloader.cancel()
+        if self.service is not None and not self.running:
+            self.service.release()
         self._teardown_grbl()
         self._stop_background_workers()
         self._teardown_logging()
@@ -1504,47 +2201,10 @@ class VisionGUI:
         if any(thread and thread.is_alive() for thread in threads):
             self.root.after(100, self._wait_for_thread_and_close)
             return
+        if self.service is not None:
+            self.service.release()
         self.root.destroy()
 
-    def _load_labels_if_possible(self, *, require_feedback: bool = False) -> None:
-        model_path = self.arg_vars["model_path"].get().strip()
-        if not model_path:
-            if require_feedback:
-                messagebox.showwarning(
-                    "Model path required",
-                    "Please select a model path before loading labels.",
-                )
-            return
-
-        if model_path == self.last_loaded_model:
-            return
-
-        resolved = Path(model_path)
-        if not resolved.is_absolute():
-            resolved = (self._project_root / model_path).resolve()
-
-        if not resolved.exists():
-            if require_feedback:
-                messagebox.showerror(
-                    "Model not found",
-                    f"The selected model could not be located: {resolved}",
-                )
-            return
-
-        try:
-            labels = VisionService.discover_model_labels(model_path)
-        except Exception as exc:  # pragma: no cover - user feedback
-            if require_feedback:
-                messagebox.showerror("Failed to load labels", str(exc))
-            else:
-                self.logger.error("Failed to load labels: %s", exc)
-            return
-
-        self.last_loaded_model = model_path
-        self._populate_label_list(labels)
-        self._apply_label_selection()
-        self.logger.info("Loaded %d labels from %s", len(labels), resolved)
-
     def _populate_label_list(self, labels: list[str]) -> None:
         self.available_labels = labels
         self.labels_listbox.delete(0, tk.END)
@@ -1591,8 +2251,11 @@ class VisionGUI:
 
 def main() -> int:
     args = parse_arguments()
+    # Threads started from here on inherit the GUI pinning; capture and inference re-pin themselves.
+    ResourceGovernor.from_args(args).pin_current_thread("gui")
+    profiler = StartupProfiler(enabled=args.profile_startup)
     root = tk.Tk()
-    VisionGUI(root, args)
+    VisionGUI(root, args, profiler)
     root.mainloop()
     return 0
 
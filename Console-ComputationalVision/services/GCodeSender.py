@@ -5,14 +5,20 @@ import asyncio
 import serial
 
 from services.Utils import Utils
+from services.async_serial import GrblProtocol, SerialTransport, open_serial_connection
+from services.command_scheduler import REALTIME, CommandScheduler, classify
+from services.gcode_modal import SOFT_RESET, ModalSession
 
 
 class GCodeSender:
-    def __init__(self) -> None:
+    def __init__(self, modal_session: bool = False) -> None:
         self.logger = logging.getLogger(__name__)
         self.serial_port: Optional[str] = None
         self.baud_rate: Optional[int] = None
         self.nano: Optional[serial.Serial] = None
+        self.transport: Optional[SerialTransport] = None
+        self.protocol: Optional[GrblProtocol] = None
+        self.scheduler: Optional[CommandScheduler] = None
         self.command_in_execution: bool = False
         self.command_timeout: int = 60
         self.coordinate_trace: list[dict] = []
@@ -23,6 +29,8 @@ class GCodeSender:
         self.min_y_axis: float = -5.0
         self.max_z_axis: float = 4.0
         self.min_z_axis: float = 0.0
+        self.modal_session: bool = modal_session
+        self.modal = ModalSession()
 
     def sum_traces(self) -> tuple:
         sorted_coords = sorted(self.coordinate_trace, key=lambda coord: coord['time_stamp'])
@@ -37,6 +45,7 @@ class GCodeSender:
             self.nano = serial.Serial(self.serial_port, self.baud_rate, timeout=1)
             time.sleep(2)
             self.nano.reset_input_buffer()
+            self.modal.reset()
         except serial.SerialException as exc:
             self.logger.error(f"Error connecting to {self.serial_port}: {exc}")
             self.nano = None
@@ -46,6 +55,10 @@ class GCodeSender:
         return True
 
     def close_connection(self) -> bool:
+        if self.scheduler is not None:
+            self.scheduler.close()
+            self.scheduler = None
+        self._close_transport()
         if self.nano is not None:
             if self.nano.is_open:
                 self.nano.close()
@@ -54,44 +67,132 @@ class GCodeSender:
             return True
         return False
 
-    async def read_response_until_ok(self) -> list[str]:
+    async def _connection(self) -> GrblProtocol:
+        """The protocol reading the port, attached to the running loop on first use."""
+
         if not self._nano_connected():
             raise RuntimeError("Port not open. Call connect().")
-        responses: list[str] = []
-        deadline = time.monotonic() + self.command_timeout
-        while time.monotonic() < deadline:
-            raw = await asyncio.to_thread(self.nano.readline)
-            if not raw:
-                continue
-            line = raw.decode("utf-8", errors="replace").strip()
-            if line:
-                responses.append(line)
-                if line == "ok" or line.startswith("error:"):
-                    break
+        loop = asyncio.get_running_loop()
+        if self.transport is not None and (self.transport.is_closing() or self.transport.loop is not loop):
+            self._close_transport()
+        if self.transport is None:
+            self.transport, self.protocol = await open_serial_connection(
+                self.nano, lambda: GrblProtocol(on_line=self.modal.observe_response)
+            )
+        return self.protocol
+
+    def _close_transport(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+        self.transport = None
+        self.protocol = None
+
+    async def request(self, command: str) -> list[str]:
+        """Write one line and wait for its ``ok``/``error:``; ``[]`` after ``command_timeout``.
+
+        Responses are matched to commands in write order, so concurrent callers
+        may each await their own line.
+        """
+
+        protocol = await self._connection()
+        encoded_command = self._normalize_command(command).encode("utf-8")
+        await protocol.reserve(len(encoded_command))
+        response = protocol.expect(command, len(encoded_command))
+        self.transport.write(encoded_command)
+        self.modal.observe(command)
+        try:
+            responses = await asyncio.wait_for(response, self.command_timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Timeout waiting for response to '{command}'")
+            self.modal.reset()
+            if response.cancelled():
+                # This command's own wait expired: drop its slot (and any behind it) so later
+                # commands are not answered with the "ok" meant for the one before.
+                await protocol.resynchronise(TimeoutError(f"Timeout waiting for response to '{command}'"))
+            return []
+        except asyncio.CancelledError:
+            # The scheduler's deadline (or the caller) gave up while the line is on the wire;
+            # its slot must go too, but awaiting here would only be cancelled again.
+            self.modal.reset()
+            if response.cancelled():
+                protocol.resynchronise_soon(TimeoutError(f"'{command}' was cancelled before its response arrived"))
+            raise
         return responses
 
-    async def send_command(self, command: str) -> bool:
+    def _command_scheduler(self) -> CommandScheduler:
+        loop = asyncio.get_running_loop()
+        if self.scheduler is not None and self.scheduler.loop not in (None, loop):
+            self.scheduler.close()
+            self.scheduler = None
+        if self.scheduler is None:
+            self.scheduler = CommandScheduler(self._execute)
+        return self.scheduler
+
+    @property
+    def last_status(self) -> Optional[dict]:
+        """The latest parsed ``<...>`` status report, from ``?`` or any other source."""
+
+        return self.protocol.last_status if self.protocol is not None else None
+
+    async def _execute(self, command: str) -> list[str]:
+        """Run one scheduled command.
+
+        Realtime commands get no ``ok``: ``?`` returns the status report it
+        triggers, the others return ``[]`` once written.
+        """
+
+        if classify(command) == REALTIME:
+            protocol = await self._connection()
+            if command.strip() == "?":
+                status = protocol.next_status()
+                self.transport.write(b"?")
+                return [await asyncio.wait_for(status, self.command_timeout)]
+            self.transport.write(command.strip().encode("utf-8"))
+            if command.strip() == SOFT_RESET:
+                protocol.fail_pending(ConnectionResetError("GRBL soft reset."))
+                self.modal.reset()
+            return []
+        self.command_in_execution = True
+        try:
+            return await self.request(command)
+        finally:
+            self.command_in_execution = False
+
+    async def send_command(
+        self,
+        command: str,
+        *,
+        priority: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+    ) -> bool:
+        """Queue ``command`` behind earlier ones of its class and wait for the reply.
+
+        ``priority`` overrides :func:`services.command_scheduler.classify`;
+        ``timeout_s`` is a deadline covering both queueing and execution.
+        Cancelling the calling task drops a command that has not been sent.
+        """
+
         if not self._nano_connected():
             raise RuntimeError("Port not open. Call connect().")
         encoded_command = self._normalize_command(command).encode("utf-8")
-        start_waiting = time.monotonic()
-        while self.command_in_execution:
-            await asyncio.sleep(0.1)
-        end_waiting = time.monotonic()
+        scheduled = self._command_scheduler().submit(command, priority=priority, timeout_s=timeout_s)
+        try:
+            responses = await scheduled.future
+        except TimeoutError as exc:
+            self.logger.warning(str(exc))
+            responses = []
+        started_at = scheduled.started_at if scheduled.started_at is not None else time.monotonic()
         command_trace: Dict[str, Any] = {
             "command": command,
             "data": encoded_command,
-            "waited_for": end_waiting - start_waiting,
-            "start_request": time.time(),
+            "waited_for": scheduled.waited_s,
+            "start_request": time.time() - (time.monotonic() - started_at),
+            "end_request": time.monotonic(),
+            "responses": responses,
         }
-        self.command_in_execution = True
-        self.nano.write(encoded_command)
-        responses = await self.read_response_until_ok()
-        self.nano.flush()
-        self.command_in_execution = False
-        command_trace["end_request"] = time.monotonic()
-        command_trace["responses"] = responses
         self.command_trace.append(command_trace)
+        if scheduled.priority == REALTIME and command.strip() != "?":
+            return True
         if not any(command_trace["responses"]):
             self.logger.warning("No responses received.")
             return False
@@ -109,14 +210,17 @@ class GCodeSender:
         if current_z + z > self.max_z_axis or current_z + z < self.min_z_axis:
             self.logger.warning(f"Coordinates z:{current_z + z} out of range. Setting to max range instead")
             z = (self.max_z_axis - current_z) if current_z + z > self.max_z_axis else (self.min_z_axis - current_z)
-        commands: list[str] = [
-            "G21",
-            "G91",
-            f"F{feed_rate}",
-            f"G1 X{x:.3f} Y{y:.3f} Z{z:.3f}",
-            "G90",
-            "M2",
-        ]
+        if self.modal_session:
+            commands = [self.modal.relative_move(x, y, z, feed_rate)]
+        else:
+            commands = [
+                "G21",
+                "G91",
+                f"F{feed_rate}",
+                f"G1 X{x:.3f} Y{y:.3f} Z{z:.3f}",
+                "G90",
+                "M2",
+            ]
         self.logger.info(f"Sending coordinates X:{x:.3f} Y:{y:.3f} Z:{z:.3f}")
         self.coordinate_trace.append({
             "x": x,
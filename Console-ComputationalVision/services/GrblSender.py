@@ -1,23 +1,92 @@
 import logging
 import threading
 import time
-from typing import Callable, List, Optional
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
 
 import serial
 from serial.tools import list_ports
 
+from services.gcode_modal import SOFT_RESET, ModalSession
+from services.serial_reader import SerialReader, parse_status_report
+
 
 logger = logging.getLogger(__name__)
 
+# Size of GRBL's serial receive buffer (RX_BUFFER_SIZE in grbl/config.h).
+RX_BUFFER_SIZE = 128
+# Single-character commands GRBL executes on receipt, without an "ok".
+REALTIME_COMMANDS = {"?", "!", "~", SOFT_RESET}
+
+
+@dataclass
+class StreamedLine:
+    """One line of a streamed program with the response GRBL gave for it."""
+
+    command: str
+    response: str = ""
+    messages: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.response == "ok"
+
 
 class GrblSender:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        streaming: bool = False,
+        rx_buffer_size: int = RX_BUFFER_SIZE,
+        modal_session: bool = False,
+    ) -> None:
         self.port: Optional[str] = None
         self.ser: Optional[serial.Serial] = None
         self.coordinates: list[dict] = []
         self._baud_rate = 115200
         self._timeout = 1
         self._event_hook: Optional[Callable[[str, dict], None]] = None
+        # Stream multi-line programs with character counting instead of one round trip per line.
+        self.streaming = streaming
+        self.rx_buffer_size = rx_buffer_size
+        # Send moves as one line against the tracked modal state instead of the six-line preamble.
+        self.modal_session = modal_session
+        self.modal = ModalSession()
+        self.reader: Optional[SerialReader] = None
+        self.last_status: Optional[dict] = None
+        self._line_listeners: list[Callable[[str], None]] = []
+        self._status_listeners: list[Callable[[dict], None]] = []
+
+    def add_line_listener(self, listener: Callable[[str], None]) -> None:
+        """Receive every line the controller sends (on the reader thread)."""
+
+        self._line_listeners.append(listener)
+
+    def remove_line_listener(self, listener: Callable[[str], None]) -> None:
+        if listener in self._line_listeners:
+            self._line_listeners.remove(listener)
+
+    def add_status_listener(self, listener: Callable[[dict], None]) -> None:
+        """Receive parsed ``<...>`` status reports (on the reader thread)."""
+
+        self._status_listeners.append(listener)
+
+    def remove_status_listener(self, listener: Callable[[dict], None]) -> None:
+        if listener in self._status_listeners:
+            self._status_listeners.remove(listener)
+
+    def _dispatch_line(self, line: str) -> None:
+        # Unsolicited lines too: a banner or ALARM: after a controller reset invalidates the modal state.
+        self.modal.observe_response(line)
+        for listener in list(self._line_listeners):
+            listener(line)
+
+    def _dispatch_status(self, line: str) -> None:
+        self.last_status = parse_status_report(line)
+        for listener in list(self._status_listeners):
+            listener(self.last_status)
 
     def set_event_hook(self, hook: Optional[Callable[[str, dict], None]]) -> None:
         """Register a callback invoked for low-level serial instrumentation events."""
@@ -64,24 +133,51 @@ class GrblSender:
     def connect(self, port: str, baud_rate: int = 115200, timeout: float = 1) -> bool:
         self.close_connection()
         try:
-            self.ser = serial.Serial(port, baud_rate, timeout=timeout)
+            ser = serial.Serial(port, baud_rate, timeout=timeout)
         except serial.SerialException as exc:
             logger.error("Error connecting to %s: %s", port, exc)
             self.ser = None
             return False
 
-        self.port = port
         self._baud_rate = baud_rate
         self._timeout = timeout
+        self.attach(ser, port)
         logger.info("Connected to %s at %s baud.", port, baud_rate)
         return True
 
+    def attach(self, ser, port: str) -> None:
+        """Use an already open port (or a stand-in with the same interface) and start its reader."""
+
+        self.close_connection()
+        self.ser = ser
+        self.port = port
+        self.modal.reset()
+        self.reader = SerialReader(
+            ser,
+            name=port,
+            on_line=self._dispatch_line,
+            on_status=self._dispatch_status,
+            on_event=self._emit_event,
+        ).start()
+
     def close_connection(self) -> None:
+        reader, self.reader = self.reader, None
+        if reader is not None:
+            reader.request_stop()
         if self.ser and self.ser.is_open:
             self.ser.close()
             logger.info("Serial port closed.")
+        if reader is not None:
+            reader.stop()
         self.ser = None
         self.port = None
+        self.last_status = None
+        self.modal.reset()
+
+    def _require_reader(self) -> SerialReader:
+        if not self.ser or not self.ser.is_open or self.reader is None:
+            raise RuntimeError("Port not open. Call connect().")
+        return self.reader
 
     def send_coordinates(
         self,
@@ -106,18 +202,26 @@ class GrblSender:
             logger.warning("Movement exceeds range limit. Centering core instead.")
             self.center_core(feedrate=feedrate, timeout_s=timeout_s)
             return []
-        commands: list[str] = [
-            "G21",
-            "G91",
-            f"F{feedrate}",
-            f"G1 X{x:.3f} Y{y:.3f} Z{z:.3f}",
-            "G90",
-            "M2",
-        ]
+        if self.modal_session:
+            commands = [self.modal.relative_move(x, y, z, feedrate)]
+        else:
+            commands = [
+                "G21",
+                "G91",
+                f"F{feedrate}",
+                f"G1 X{x:.3f} Y{y:.3f} Z{z:.3f}",
+                "G90",
+                "M2",
+            ]
         logger.info("Sending coordinates X:%.3f Y:%.3f Z:%.3f", x, y, z)
         responses: List[str] = []
-        for command in commands:
-            responses.extend(self.send_command(command, timeout_s=timeout_s))
+        if self.streaming:
+            for line in self.stream_commands(commands, timeout_s=timeout_s):
+                responses.extend(line.messages)
+                responses.append(line.response)
+        else:
+            for command in commands:
+                responses.extend(self.send_command(command, timeout_s=timeout_s))
         self.trace_coordinates(x, y, z)
         return responses
 
@@ -129,22 +233,102 @@ class GrblSender:
         *,
         timeout_s: float = 5.0,
     ) -> List[str]:
-        if not self.ser or not self.ser.is_open:
-            raise RuntimeError("Port not open. Call connect().")
+        reader = self._require_reader()
+        if command.strip() in REALTIME_COMMANDS:
+            self.send_realtime(command.strip())
+            return []
         command = command.rstrip("\r\n") + "\r\n"
         encoded = command.encode("utf-8")
+        # Registered before the write so the reader can never see the "ok" first.
+        response = reader.expect(command)
         self._emit_event("write_start", command=command.strip(), byte_len=len(encoded))
         self.ser.write(encoded)
         self.ser.flush()
+        self.modal.observe(command)
         self._emit_event("write_end", command=command.strip(), byte_len=len(encoded))
         if wait_for_ok:
-            responses = self.read_until_ok(timeout_s=timeout_s)
-            if not any(line == "ok" or line.startswith("error:") for line in responses):
-                self._emit_event("timeout", command=command.strip(), responses=responses)
-                raise TimeoutError(f"Timeout waiting for response to '{command.strip()}'")
-            return responses
+            return self._await_response(response, command.strip(), timeout_s)
         return []
 
+    def send_realtime(self, command: str) -> None:
+        """Write a realtime command (``?``, ``!``, ``~`` or soft reset); GRBL acknowledges none of them."""
+
+        reader = self._require_reader()
+        self._emit_event("write_start", command=repr(command), byte_len=len(command))
+        self.ser.write(command.encode("utf-8"))
+        self.ser.flush()
+        if command == SOFT_RESET:
+            # GRBL drops its buffers: nothing written before the reset will be answered.
+            reader.fail_pending(ConnectionResetError("GRBL soft reset."))
+            self.modal.reset()
+
+    def _await_response(self, response: Future, command: str, timeout_s: float) -> List[str]:
+        try:
+            return response.result(timeout=timeout_s)
+        except FutureTimeoutError:
+            error = TimeoutError(f"Timeout waiting for response to '{command}'")
+            self._emit_event("timeout", command=command)
+            self.modal.reset()
+            if self.reader is not None:
+                # Without this a lost "ok" would shift every later response by one command.
+                self.reader.resynchronise(error)
+            raise error from None
+
+    def stream_commands(
+        self,
+        commands: Iterable[str],
+        *,
+        timeout_s: float = 5.0,
+        stop_on_error: bool = True,
+    ) -> List[StreamedLine]:
+        """Send a program with GRBL's character-counting flow control.
+
+        Lines are written as long as the bytes of all unacknowledged lines fit
+        in the controller's RX buffer; every ``ok``/``error:`` acknowledges the
+        oldest line in flight, so GRBL always has the next line queued and the
+        serial link never idles between lines. ``timeout_s`` bounds the wait for
+        each acknowledgement. After an ``error:`` no further lines are sent when
+        ``stop_on_error`` is set, but lines already in flight are still drained.
+        """
+
+        reader = self._require_reader()
+        pending = deque(command.strip() for command in commands if command.strip())
+        results: List[StreamedLine] = []
+        in_flight: deque[tuple[StreamedLine, int, Future]] = deque()
+        buffered = 0
+        stop = False
+
+        while pending or in_flight:
+            # Fill the RX buffer.
+            while pending and not stop:
+                encoded = (pending[0] + "\n").encode("utf-8")
+                if len(encoded) > self.rx_buffer_size:
+                    raise ValueError(f"Line '{pending[0]}' exceeds the {self.rx_buffer_size}-byte RX buffer.")
+                if buffered + len(encoded) > self.rx_buffer_size:
+                    break
+                line = StreamedLine(pending.popleft())
+                response = reader.expect(line.command)
+                self._emit_event("write_start", command=line.command, byte_len=len(encoded), buffered=buffered)
+                self.ser.write(encoded)
+                self.modal.observe(line.command)
+                in_flight.append((line, len(encoded), response))
+                results.append(line)
+                buffered += len(encoded)
+            self.ser.flush()
+            if not in_flight:
+                break
+
+            # Wait for the acknowledgement of the oldest line.
+            line, length, response = in_flight.popleft()
+            lines = self._await_response(response, line.command, timeout_s)
+            buffered -= length
+            line.response = lines[-1]
+            line.messages = lines[:-1]
+            if line.response.startswith("error:"):
+                logger.warning("GRBL rejected '%s': %s", line.command, line.response)
+                stop = stop or stop_on_error
+        return results
+
     def trace_coordinates(self, x: float, y: float, z: float = None):
         self.coordinates.append({
             "x": x,
@@ -184,28 +368,6 @@ class GrblSender:
         )
         self.clear_trace()
         return responses
-
-    def read_until_ok(self, timeout_s: float = 5.0) -> List[str]:
-        if not self.ser or not self.ser.is_open:
-            raise RuntimeError("Port not open. Call connect().")
-        lines: List[str] = []
-        saw_first_byte = False
-        deadline = time.monotonic() + timeout_s
-        #while time.monotonic() < deadline:
-        while True:
-            raw = self.ser.readline()
-            if not raw:
-                continue
-            s = raw.decode("utf-8", errors="replace").strip()
-            if s:
-                if not saw_first_byte:
-                    saw_first_byte = True
-                    self._emit_event("first_byte_in", line=s)
-                lines.append(s)
-                if s == "ok" or s.startswith("error:"):
-                    self._emit_event("ok_parsed", line=s, lines=len(lines))
-                    break
-        return lines
 #endregion
 
 if __name__ == "__main__":
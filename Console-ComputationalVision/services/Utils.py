@@ -1,12 +1,13 @@
 import os
-import platform
 os.environ["OPENCV_LOG_LEVEL"] = "SILENT"
 import sys
 from pathlib import Path
 import math
-import cv2
 from serial.tools import list_ports
 
+from services.camera_discovery import discover_cameras, resolve_camera_name
+from services.model_registry import load_registry
+
 
 class Utils:
     def list_ai_models(self, models_dir: str = "models") -> list[dict]:
@@ -19,7 +20,8 @@ class Utils:
         if not models_path.exists() or not models_path.is_dir():
             return []
 
-        exts = {".pt", ".pth", ".onnx"}
+        exts = {".pt", ".pth", ".onnx", ".torchscript"}
+        registry = load_registry(models_path)
         out: list[dict] = []
         for f in sorted(p for p in models_path.iterdir() if p.is_file() and p.suffix.lower() in exts):
             try:
@@ -38,6 +40,7 @@ class Utils:
                 "modified_ts": stat.st_mtime,
                 "created_ts": stat.st_ctime,
                 "ext": f.suffix.lower(),
+                "registry": registry.get(f.name),
             })
         return out
 
@@ -62,79 +65,12 @@ class Utils:
             result.append(info)
         return result
 
-    def list_cameras(self, max_devices: int = 10) -> list[dict]:
-        cameras: list[dict] = []
-        for index in range(max_devices):
-            try:
-                cap = None
-                if platform.system() == "Windows":
-                    # Prefer DSHOW, fall back to MSMF. Avoids obsensor spam.
-                    dshow = getattr(cv2, "CAP_DSHOW", None)
-                    msmf = getattr(cv2, "CAP_MSMF", None)
-                    if dshow is not None:
-                        cap = cv2.VideoCapture(index, dshow)
-                    elif msmf is not None:
-                        cap = cv2.VideoCapture(index, msmf)
-                    else:
-                        cap = cv2.VideoCapture(index)
-                else:
-                    cap = cv2.VideoCapture(index)
-                    if not cap.isOpened():
-                        cap.release()
-                        v4l2_backend = getattr(cv2, "CAP_V4L2", None)
-                        if v4l2_backend is not None:
-                            cap = cv2.VideoCapture(index, v4l2_backend)
-                if not cap.isOpened():
-                    cap.release()
-                    continue
-
-                width_f = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-                height_f = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-
-                if width_f is None or math.isnan(width_f):
-                    width_f = 0.0
-                if height_f is None or math.isnan(height_f):
-                    height_f = 0.0
-
-                width = int(width_f)
-                height = int(height_f)
-                backend_name = ""
-                get_backend = getattr(cap, "getBackendName", None)
-                if callable(get_backend):
-                    try:
-                        backend_name = str(get_backend())
-                    except Exception:
-                        backend_name = ""
-                cap.release()
-
-                name = self._resolve_camera_name(index)
-                descriptor_parts = [name]
-                if backend_name:
-                    descriptor_parts.append(backend_name)
-                descriptor = " - ".join(part for part in descriptor_parts if part)
-                resolution = f"{width}x{height}"
-                label = f"{index}: {descriptor} ({resolution})"
-                cameras.append(
-                    {
-                        "index": index,
-                        "name": name,
-                        "label": label,
-                        "default_resolution": (width, height),
-                    }
-                )
-            except Exception:
-                continue
-        return cameras
+    def list_cameras(self, max_devices: int = 10, *, force: bool = False) -> list[dict]:
+        return discover_cameras(max_devices, force=force)
 
     @staticmethod
     def _resolve_camera_name(index: int) -> str:
-        sysfs_name = Path(f"/sys/class/video4linux/video{index}/name")
-        if sysfs_name.exists():
-            try:
-                return sysfs_name.read_text(encoding="utf-8").strip()
-            except OSError:
-                pass
-        return f"Camera {index}"
+        return resolve_camera_name(index)
 
     @staticmethod
     def human_readable_size(size_bytes: int) -> str:
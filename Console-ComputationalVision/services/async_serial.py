@@ -0,0 +1,289 @@
+"""asyncio transport for an open pyserial port.
+
+:func:`open_serial_connection` wraps a ``serial.Serial`` in an
+:class:`asyncio.Transport`. On POSIX event loops the port's file descriptor
+is watched with ``loop.add_reader``, so received bytes are handled by a
+callback on the loop as soon as they arrive, with no thread and no read
+timeout in the path. Where the loop cannot watch the descriptor (Windows'
+proactor loop, objects without ``fileno``), one background thread blocks in
+``read`` and hands the bytes to the loop with ``call_soon_threadsafe``.
+Writes go straight to the port; G-code lines are far smaller than the OS
+serial buffer, so they do not block.
+
+:class:`GrblProtocol` splits the stream into lines and matches ``ok`` and
+``error:`` to commands in the order they were written, like
+:class:`services.serial_reader.SerialReader` does for the threaded sender.
+Several commands can be awaited at once; :meth:`GrblProtocol.reserve` keeps
+the unacknowledged bytes within GRBL's RX buffer. As with the threaded
+reader, the startup banner fails everything pending and a caller that timed
+out calls :meth:`GrblProtocol.resynchronise`, so one lost ``ok`` cannot
+shift every later response. A caller that is cancelled cannot await, so it
+calls :meth:`GrblProtocol.resynchronise_soon` instead and
+:meth:`GrblProtocol.reserve` holds new lines until the port has settled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from services.GrblSender import RX_BUFFER_SIZE
+from services.serial_reader import is_status_report, parse_status_report
+
+logger = logging.getLogger(__name__)
+
+_READ_SIZE = 4096
+
+
+class GrblProtocol(asyncio.Protocol):
+    """Line splitting and in-order response matching for a GRBL controller."""
+
+    def __init__(
+        self,
+        on_line: Optional[Callable[[str], None]] = None,
+        rx_buffer_size: int = RX_BUFFER_SIZE,
+    ) -> None:
+        self.transport: Optional[asyncio.Transport] = None
+        self.rx_buffer_size = rx_buffer_size
+        self._on_line = on_line
+        self._buffer = bytearray()
+        self._pending: deque[tuple[str, asyncio.Future, list[str], int]] = deque()
+        self._buffered = 0
+        self._room = asyncio.Event()
+        self._closed: Optional[Exception] = None
+        self._last_line_at = time.monotonic()
+        self._status_waiters: list[asyncio.Future] = []
+        self._resync: Optional[asyncio.Task] = None
+        self.last_status: Optional[dict] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        self._buffer.extend(data)
+        while True:
+            index = self._buffer.find(b"\n")
+            if index < 0:
+                return
+            line = bytes(self._buffer[:index]).decode("utf-8", errors="replace").strip()
+            del self._buffer[: index + 1]
+            if line:
+                self._dispatch(line)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._closed = exc or ConnectionError("Serial transport closed.")
+        self.fail_pending(self._closed)
+        waiters, self._status_waiters = self._status_waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_exception(self._closed)
+
+    async def reserve(self, size: int) -> None:
+        """Wait until ``size`` more bytes fit in GRBL's RX buffer.
+
+        Call :meth:`expect` right after, without awaiting in between, so the
+        space is still free when the line is written. Also waits for a
+        resynchronisation started by :meth:`resynchronise_soon`, which would
+        otherwise fail the new line along with the stale ones.
+        """
+
+        while self._resync is not None and not self._resync.done():
+            # wait() rather than await: a cancelled caller must not cancel the resync.
+            await asyncio.wait({self._resync})
+        while self._pending and self._buffered + size > self.rx_buffer_size:
+            await self._room.wait()
+
+    def expect(self, command: str, size: int = 0) -> asyncio.Future:
+        """Register ``command`` (``size`` bytes on the wire) before writing it.
+
+        The future resolves with its response lines.
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        if self._closed is not None:
+            future.set_exception(self._closed)
+            return future
+        self._pending.append((command.strip(), future, [], size))
+        self._buffered += size
+        return future
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def next_status(self) -> asyncio.Future:
+        """Future for the next ``<...>`` status report line; create it before writing ``?``."""
+
+        future = asyncio.get_running_loop().create_future()
+        if self._closed is not None:
+            future.set_exception(self._closed)
+        else:
+            self._status_waiters.append(future)
+        return future
+
+    def fail_pending(self, error: Exception) -> None:
+        pending, self._pending = self._pending, deque()
+        self._release(self._buffered)
+        for _, future, _, _ in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def resynchronise(self, error: Exception, *, quiet_s: float = 0.2, timeout_s: float = 2.0) -> None:
+        """Fail everything pending (releasing its bytes) once the port has been quiet for ``quiet_s``."""
+
+        deadline = time.monotonic() + timeout_s
+        while True:
+            idle = time.monotonic() - self._last_line_at
+            remaining = deadline - time.monotonic()
+            if idle >= quiet_s or remaining <= 0:
+                break
+            await asyncio.sleep(min(quiet_s - idle, remaining))
+        self.fail_pending(error)
+
+    def resynchronise_soon(self, error: Exception) -> None:
+        """:meth:`resynchronise` in a task, for a caller that is being cancelled and cannot await."""
+
+        if self._resync is None or self._resync.done():
+            self._resync = asyncio.get_running_loop().create_task(self.resynchronise(error))
+
+    def _release(self, size: int) -> None:
+        self._buffered -= size
+        # Wake every waiter; each re-checks the space against its own line.
+        self._room.set()
+        self._room = asyncio.Event()
+
+    def _dispatch(self, line: str) -> None:
+        self._last_line_at = time.monotonic()
+        if self._on_line is not None:
+            try:
+                self._on_line(line)
+            except Exception:  # pragma: no cover - a consumer must not break the stream
+                logger.exception("Serial line callback failed")
+        if line.startswith("Grbl "):
+            # Startup banner: the controller reset and will never answer what was pending.
+            self.fail_pending(ConnectionResetError(f"GRBL restarted: {line}"))
+            return
+        if is_status_report(line):
+            self.last_status = parse_status_report(line)
+            waiters, self._status_waiters = self._status_waiters, []
+            for future in waiters:
+                if not future.done():
+                    future.set_result(line)
+            return
+        if not self._pending:
+            return
+        _, future, lines, size = self._pending[0]
+        lines.append(line)
+        if line == "ok" or line.startswith("error:"):
+            self._pending.popleft()
+            self._release(size)
+            # A timed-out command keeps its slot until resynchronise(), so a late "ok" still lands on it.
+            if not future.done():
+                future.set_result(lines)
+
+
+class SerialTransport(asyncio.Transport):
+    """Event-loop transport over a pyserial port (or anything with ``read``/``write``)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, ser, protocol: asyncio.Protocol) -> None:
+        super().__init__()
+        self._loop = loop
+        self._ser = ser
+        self._protocol = protocol
+        self._fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def event_driven(self) -> bool:
+        """True when reads are loop callbacks, False on the reader-thread fallback."""
+
+        return self._fd is not None
+
+    def _start(self) -> None:
+        self._protocol.connection_made(self)
+        try:
+            fd = self._ser.fileno()
+            self._loop.add_reader(fd, self._on_readable)
+        except (AttributeError, NotImplementedError, io.UnsupportedOperation, ValueError) as exc:
+            logger.debug("Serial port not watchable by the event loop (%s); using a reader thread.", exc)
+            self._thread = threading.Thread(target=self._read_in_thread, name="SerialTransport", daemon=True)
+            self._thread.start()
+        else:
+            self._fd = fd
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            self._fatal(exc)
+            return
+        if not data:
+            self._fatal(ConnectionError("Serial port closed by the device."))
+            return
+        self._protocol.data_received(data)
+
+    def _read_in_thread(self) -> None:
+        while not self._closing:
+            try:
+                data = self._ser.read(max(1, self._ser.in_waiting))
+            except Exception as exc:
+                if not self._closing:
+                    self._loop.call_soon_threadsafe(self._fatal, exc)
+                return
+            if data:
+                self._loop.call_soon_threadsafe(self._protocol.data_received, data)
+
+    def _fatal(self, exc: Exception) -> None:
+        if not self._closing:
+            logger.error("Serial read failed: %s", exc)
+            self._close(exc)
+
+    def write(self, data: bytes) -> None:
+        if self._closing:
+            raise ConnectionError("Serial transport is closed.")
+        self._ser.write(data)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        self._close(None)
+
+    def _close(self, exc: Optional[Exception]) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        if self._loop.is_closed():
+            self._protocol.connection_lost(exc)
+            return
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        self._loop.call_soon(self._protocol.connection_lost, exc)
+
+    def get_extra_info(self, name: str, default=None):
+        return self._ser if name == "serial" else default
+
+
+async def open_serial_connection(
+    ser,
+    protocol_factory: Callable[[], asyncio.Protocol],
+) -> tuple[SerialTransport, asyncio.Protocol]:
+    """Attach ``ser`` to the running loop; the caller still owns (and closes) the port."""
+
+    loop = asyncio.get_running_loop()
+    protocol = protocol_factory()
+    transport = SerialTransport(loop, ser, protocol)
+    transport._start()
+    return transport, protocol
@@ -0,0 +1,306 @@
+"""Camera discovery that avoids opening capture devices whenever possible.
+
+On Linux the video4linux sysfs tree already tells us which capture nodes exist,
+their friendly names and whether a node is a real capture interface or a UVC
+metadata companion, so nothing has to be opened just to fill a dropdown. The
+resolution is the only detail that requires opening a device; it is probed in
+parallel with a timeout and only for devices that are not cached yet.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+os.environ.setdefault("OPENCV_LOG_LEVEL", "SILENT")
+
+SYSFS_VIDEO_ROOT = Path("/sys/class/video4linux")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SysfsCamera:
+    """Capture node described by sysfs, read without opening the device."""
+
+    index: int
+    name: str
+    node_index: int
+    dev: str
+    driver: str
+
+    @property
+    def device_path(self) -> str:
+        return f"/dev/video{self.index}"
+
+    @property
+    def signature(self) -> tuple:
+        return (self.index, self.name, self.node_index, self.dev)
+
+
+@dataclass
+class ProbeResult:
+    width: int = 0
+    height: int = 0
+    backend: str = ""
+
+
+def _read_sysfs_text(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def _read_driver(device_dir: Path) -> str:
+    for line in _read_sysfs_text(device_dir / "device" / "uevent").splitlines():
+        if line.startswith("DRIVER="):
+            return line.split("=", 1)[1]
+    return ""
+
+
+def sysfs_available() -> bool:
+    return platform.system() == "Linux" and SYSFS_VIDEO_ROOT.is_dir()
+
+
+def list_sysfs_cameras(max_devices: int = 10) -> list[SysfsCamera]:
+    """List video4linux capture nodes, skipping UVC metadata companions."""
+
+    if not sysfs_available():
+        return []
+
+    cameras: list[SysfsCamera] = []
+    for entry in SYSFS_VIDEO_ROOT.glob("video*"):
+        suffix = entry.name[len("video"):]
+        if not suffix.isdigit():
+            continue
+        index = int(suffix)
+        if index >= max_devices:
+            continue
+
+        node_index_raw = _read_sysfs_text(entry / "index")
+        node_index = int(node_index_raw) if node_index_raw.isdigit() else 0
+        # UVC cameras expose a second node (index 1) that only carries metadata.
+        if node_index != 0:
+            continue
+
+        cameras.append(
+            SysfsCamera(
+                index=index,
+                name=_read_sysfs_text(entry / "name") or f"Camera {index}",
+                node_index=node_index,
+                dev=_read_sysfs_text(entry / "dev"),
+                driver=_read_driver(entry),
+            )
+        )
+    cameras.sort(key=lambda camera: camera.index)
+    return cameras
+
+
+def resolve_camera_name(index: int) -> str:
+    name = _read_sysfs_text(SYSFS_VIDEO_ROOT / f"video{index}" / "name")
+    return name or f"Camera {index}"
+
+
+def _open_capture(index: int, prefer_v4l2: bool):
+    import cv2
+
+    if platform.system() == "Windows":
+        # Prefer DSHOW, fall back to MSMF. Avoids obsensor spam.
+        dshow = getattr(cv2, "CAP_DSHOW", None)
+        msmf = getattr(cv2, "CAP_MSMF", None)
+        if dshow is not None:
+            return cv2.VideoCapture(index, dshow)
+        if msmf is not None:
+            return cv2.VideoCapture(index, msmf)
+        return cv2.VideoCapture(index)
+
+    v4l2_backend = getattr(cv2, "CAP_V4L2", None)
+    if prefer_v4l2 and v4l2_backend is not None:
+        cap = cv2.VideoCapture(index, v4l2_backend)
+        if cap.isOpened():
+            return cap
+        cap.release()
+
+    cap = cv2.VideoCapture(index)
+    if not cap.isOpened() and not prefer_v4l2 and v4l2_backend is not None:
+        cap.release()
+        cap = cv2.VideoCapture(index, v4l2_backend)
+    return cap
+
+
+def probe_camera(index: int, prefer_v4l2: bool = False) -> Optional[ProbeResult]:
+    """Open a camera just long enough to read its default resolution and backend."""
+
+    import cv2
+
+    cap = _open_capture(index, prefer_v4l2)
+    try:
+        if not cap.isOpened():
+            return None
+
+        width_f = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height_f = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        if width_f is None or math.isnan(width_f):
+            width_f = 0.0
+        if height_f is None or math.isnan(height_f):
+            height_f = 0.0
+
+        backend_name = ""
+        get_backend = getattr(cap, "getBackendName", None)
+        if callable(get_backend):
+            try:
+                backend_name = str(get_backend())
+            except Exception:
+                backend_name = ""
+        return ProbeResult(width=int(width_f), height=int(height_f), backend=backend_name)
+    finally:
+        cap.release()
+
+
+def _build_camera_entry(index: int, name: str, probe: Optional[ProbeResult], **extra) -> dict:
+    probe = probe or ProbeResult()
+    descriptor_parts = [name]
+    if probe.backend:
+        descriptor_parts.append(probe.backend)
+    descriptor = " - ".join(part for part in descriptor_parts if part)
+    label = f"{index}: {descriptor}"
+    if probe.width > 0 and probe.height > 0:
+        label += f" ({probe.width}x{probe.height})"
+    entry = {
+        "index": index,
+        "name": name,
+        "label": label,
+        "default_resolution": (probe.width, probe.height),
+    }
+    entry.update(extra)
+    return entry
+
+
+class CameraDiscovery:
+    """Enumerate cameras once and serve later refreshes from a cache.
+
+    The cache is keyed on the set of sysfs capture nodes, so plugging or
+    unplugging a camera invalidates it automatically. Without sysfs (Windows,
+    macOS) there is no way to learn the device set without opening devices,
+    so the cached result is kept until ``force=True`` is requested.
+    """
+
+    def __init__(self, probe_timeout_s: float = 2.0, max_workers: int = 4) -> None:
+        self.probe_timeout_s = probe_timeout_s
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._cache_key: tuple | None = None
+        self._cache: list[dict] = []
+        self._probe_cache: dict[tuple, Optional[ProbeResult]] = {}
+
+    def discover(
+        self,
+        max_devices: int = 10,
+        *,
+        probe_resolution: bool = True,
+        force: bool = False,
+    ) -> list[dict]:
+        with self._lock:
+            if sysfs_available():
+                return self._discover_sysfs(max_devices, probe_resolution, force)
+            return self._discover_by_probing(max_devices, force)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache_key = None
+            self._cache = []
+            self._probe_cache.clear()
+
+    def _discover_sysfs(self, max_devices: int, probe_resolution: bool, force: bool) -> list[dict]:
+        devices = list_sysfs_cameras(max_devices)
+        key = ("sysfs", probe_resolution, tuple(device.signature for device in devices))
+        if not force and key == self._cache_key:
+            return [dict(entry) for entry in self._cache]
+
+        if force:
+            self._probe_cache.clear()
+
+        if probe_resolution:
+            pending = [device for device in devices if device.signature not in self._probe_cache]
+            probed = self._probe_parallel([device.index for device in pending], prefer_v4l2=True)
+            for device in pending:
+                self._probe_cache[device.signature] = probed.get(device.index)
+
+        cameras: list[dict] = []
+        for device in devices:
+            probe = self._probe_cache.get(device.signature) if probe_resolution else None
+            cameras.append(
+                _build_camera_entry(
+                    device.index,
+                    device.name,
+                    probe,
+                    device_path=device.device_path,
+                    driver=device.driver,
+                )
+            )
+
+        self._cache_key = key
+        self._cache = cameras
+        return [dict(entry) for entry in cameras]
+
+    def _discover_by_probing(self, max_devices: int, force: bool) -> list[dict]:
+        key = ("probe", max_devices)
+        if not force and key == self._cache_key:
+            return [dict(entry) for entry in self._cache]
+
+        probed = self._probe_parallel(list(range(max_devices)), prefer_v4l2=False)
+        cameras = [
+            _build_camera_entry(index, resolve_camera_name(index), probed[index])
+            for index in sorted(probed)
+            if probed[index] is not None
+        ]
+        self._cache_key = key
+        self._cache = cameras
+        return [dict(entry) for entry in cameras]
+
+    def _probe_parallel(self, indices: list[int], *, prefer_v4l2: bool) -> dict[int, Optional[ProbeResult]]:
+        if not indices:
+            return {}
+
+        results: dict[int, Optional[ProbeResult]] = {index: None for index in indices}
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(indices))),
+            thread_name_prefix="CameraProbe",
+        )
+        try:
+            futures = {executor.submit(probe_camera, index, prefer_v4l2): index for index in indices}
+            done, not_done = wait(futures, timeout=self.probe_timeout_s)
+            for future in done:
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as exc:
+                    logger.debug("Camera %s probe failed: %s", futures[future], exc)
+            for future in not_done:
+                logger.warning(
+                    "Camera %s did not answer within %.1f s; skipping resolution probe.",
+                    futures[future],
+                    self.probe_timeout_s,
+                )
+                if prefer_v4l2:
+                    # The node exists in sysfs, keep it listed without a resolution.
+                    results[futures[future]] = ProbeResult()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+
+_default_discovery = CameraDiscovery()
+
+
+def discover_cameras(max_devices: int = 10, *, probe_resolution: bool = True, force: bool = False) -> list[dict]:
+    """Return cameras using the process-wide cached :class:`CameraDiscovery`."""
+
+    return _default_discovery.discover(max_devices, probe_resolution=probe_resolution, force=force)
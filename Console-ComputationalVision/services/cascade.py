@@ -0,0 +1,226 @@
+"""Cheap first-stage gate that decides when the full detector has to run.
+
+The first stage works on a small copy of the frame and combines two signals:
+
+* a colour/size heuristic learnt from the dataset: a hue/saturation ratio
+  histogram (product pixels over background pixels) is back-projected onto
+  the frame, and blobs whose area falls in the range of labelled boxes are
+  counted as candidate objects;
+* a motion check against the frame of the last full inference.
+
+The full model runs when the scene moved, the number of candidates changed,
+the previous result had confidences close to the threshold, or the gate has
+skipped too many frames in a row. With no candidates at all the frame is
+treated as empty; otherwise the previous detections are reused.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+DEFAULT_PROFILE_PATH = Path(__file__).resolve().parent.parent / "models" / "cascade_profile.json"
+HIST_BINS = (30, 32)
+_HIST_RANGES = [0, 180, 0, 256]
+_BACKPROJECT_THRESHOLD = 64
+_MOTION_PIXEL_DELTA = 25
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CascadeProfile:
+    """Colour and size statistics of the labelled products."""
+
+    ratio_hist: np.ndarray
+    min_area_frac: float
+    max_area_frac: float
+    classes: list[str]
+
+    @classmethod
+    def build(cls, samples: Iterable, classes: list[str], background_pixels: int = 20000) -> "CascadeProfile":
+        """Build a profile from ``(image, boxes)`` pairs with ``boxes`` as ``(M, 5)`` xyxy+cls pixels."""
+
+        rng = np.random.default_rng(0)
+        object_hist = np.zeros(HIST_BINS, dtype=np.float64)
+        background_hist = np.zeros(HIST_BINS, dtype=np.float64)
+        area_fracs: list[float] = []
+        for image, boxes in samples:
+            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+            height, width = image.shape[:2]
+            mask = np.zeros((height, width), dtype=np.uint8)
+            for x1, y1, x2, y2, _ in boxes:
+                x1, y1 = max(0, int(x1)), max(0, int(y1))
+                x2, y2 = min(width, int(x2)), min(height, int(y2))
+                if x2 <= x1 or y2 <= y1:
+                    continue
+                mask[y1:y2, x1:x2] = 255
+                area_fracs.append((x2 - x1) * (y2 - y1) / float(width * height))
+            object_hist += cv2.calcHist([hsv], [0, 1], mask, list(HIST_BINS), _HIST_RANGES)
+
+            background = np.flatnonzero(mask.ravel() == 0)
+            if len(background):
+                picked = rng.choice(background, size=min(background_pixels, len(background)), replace=False)
+                pixels = hsv.reshape(-1, 3)[picked][None, :, :]
+                background_hist += cv2.calcHist([pixels], [0, 1], None, list(HIST_BINS), _HIST_RANGES)
+
+        object_hist /= max(object_hist.sum(), 1.0)
+        background_hist /= max(background_hist.sum(), 1.0)
+        ratio = object_hist / np.maximum(background_hist, 1e-6)
+        if (object_hist > 0).any():
+            # Scale so typical product colours back-project near 255 instead of a few outliers.
+            ratio = np.clip(ratio / max(float(np.percentile(ratio[object_hist > 0], 95)), 1e-6), 0.0, 1.0)
+        areas = np.asarray(area_fracs or [0.0, 1.0])
+        return cls(
+            ratio_hist=(ratio * 255.0).astype(np.float32),
+            min_area_frac=float(np.percentile(areas, 1)) * 0.5,
+            max_area_frac=min(1.0, float(np.percentile(areas, 99)) * 1.5),
+            classes=list(classes),
+        )
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "bins": list(HIST_BINS),
+            "ratio_hist": self.ratio_hist.round(2).tolist(),
+            "min_area_frac": self.min_area_frac,
+            "max_area_frac": self.max_area_frac,
+            "classes": self.classes,
+        }
+        Path(path).write_text(json.dumps(payload), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "CascadeProfile":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        if tuple(payload.get("bins", ())) != HIST_BINS:
+            raise ValueError(f"{path} was built with different histogram bins.")
+        return cls(
+            ratio_hist=np.asarray(payload["ratio_hist"], dtype=np.float32),
+            min_area_frac=float(payload["min_area_frac"]),
+            max_area_frac=float(payload["max_area_frac"]),
+            classes=list(payload.get("classes", [])),
+        )
+
+
+@dataclass
+class CascadeDecision:
+    run_full: bool
+    reason: str
+    candidates: Optional[int] = None
+    motion: float = 0.0
+
+
+class CascadeGate:
+    """Decide per frame whether the full detector must run."""
+
+    def __init__(
+        self,
+        profile: Optional[CascadeProfile],
+        *,
+        motion_threshold: float = 0.02,
+        ambiguity_margin: float = 0.1,
+        max_skipped: int = 30,
+        work_width: int = 320,
+    ) -> None:
+        self.profile = profile
+        self.motion_threshold = motion_threshold
+        self.ambiguity_margin = ambiguity_margin
+        self.max_skipped = max_skipped
+        self.work_width = work_width
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.reset()
+
+    def reset(self) -> None:
+        self._reference: Optional[np.ndarray] = None
+        self._reference_candidates: Optional[int] = None
+        self._ambiguous = False
+        self._skipped = 0
+
+    def _small(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        scale = self.work_width / float(width)
+        size = (self.work_width, max(1, int(round(height * scale))))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def count_candidates(self, small: np.ndarray) -> Optional[int]:
+        """Blobs of product-like colour with a product-like size, or ``None`` without a profile."""
+
+        if self.profile is None:
+            return None
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        back_projection = cv2.calcBackProject([hsv], [0, 1], self.profile.ratio_hist, _HIST_RANGES, 1)
+        _, mask = cv2.threshold(back_projection, _BACKPROJECT_THRESHOLD, 255, cv2.THRESH_BINARY)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._kernel, iterations=2)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        total = float(small.shape[0] * small.shape[1])
+        areas = stats[1:, cv2.CC_STAT_AREA] / total
+        return int(((areas >= self.profile.min_area_frac) & (areas <= self.profile.max_area_frac)).sum())
+
+    def _motion(self, gray: np.ndarray) -> float:
+        if self._reference is None or self._reference.shape != gray.shape:
+            return 1.0
+        delta = cv2.absdiff(gray, self._reference)
+        return float(np.count_nonzero(delta > _MOTION_PIXEL_DELTA)) / delta.size
+
+    def decide(self, frame: np.ndarray) -> CascadeDecision:
+        small = self._small(frame)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        motion = self._motion(gray)
+        candidates = self.count_candidates(small)
+
+        if self._reference is None:
+            decision = CascadeDecision(True, "first frame", candidates, motion)
+        elif self._skipped >= self.max_skipped:
+            # Bounds the damage of a colour model that misses an object entirely.
+            decision = CascadeDecision(True, "refresh", candidates, motion)
+        elif candidates == 0:
+            decision = CascadeDecision(False, "no candidates", candidates, motion)
+        elif self._ambiguous:
+            decision = CascadeDecision(True, "ambiguous", candidates, motion)
+        elif motion > self.motion_threshold:
+            decision = CascadeDecision(True, "motion", candidates, motion)
+        elif candidates != self._reference_candidates:
+            decision = CascadeDecision(True, "candidates changed", candidates, motion)
+        else:
+            decision = CascadeDecision(False, "static scene", candidates, motion)
+
+        if decision.run_full:
+            self._reference = gray
+            self._reference_candidates = candidates
+            self._skipped = 0
+        else:
+            self._skipped += 1
+        return decision
+
+    def observe(self, detections: np.ndarray, thresholds: np.ndarray) -> None:
+        """Record whether a full result had confidences close to their class threshold."""
+
+        if len(detections) == 0:
+            self._ambiguous = False
+            return
+        cls = np.clip(detections[:, 5].astype(np.int64), 0, len(thresholds) - 1)
+        self._ambiguous = bool((detections[:, 4] < thresholds[cls] + self.ambiguity_margin).any())
+
+
+def build_cascade_gate(args) -> Optional[CascadeGate]:
+    """Gate configured by ``--cascade*`` options; ``None`` when the cascade is off."""
+
+    if not getattr(args, "cascade", False):
+        return None
+    path = Path(getattr(args, "cascade_profile", None) or DEFAULT_PROFILE_PATH)
+    profile: Optional[CascadeProfile] = None
+    try:
+        profile = CascadeProfile.load(path)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Cascade profile %s unavailable (%s); gating on motion only.", path, exc)
+    return CascadeGate(
+        profile,
+        motion_threshold=float(getattr(args, "cascade_motion_threshold", 0.02)),
+        max_skipped=int(getattr(args, "cascade_max_skipped", 30)),
+    )
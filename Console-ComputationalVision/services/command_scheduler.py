@@ -0,0 +1,199 @@
+"""Async command scheduler for the GRBL senders.
+
+Coroutines submit commands with :meth:`CommandScheduler.submit` and await the
+returned future; one worker task executes them one at a time, waking on
+submission rather than polling. Ordering:
+
+* ``REALTIME`` commands (``?``, ``!``, ``~``, soft reset) are executed at
+  once, even while another command is in flight, since GRBL acts on them on
+  receipt and never acknowledges them;
+* otherwise ``MOTION`` runs before ``QUERY``, first in, first out within a
+  class, except that a command that has waited ``starvation_s`` goes next
+  whatever its class, so queries are not starved by a long run of moves.
+
+A command whose deadline passes while it is queued fails with
+:class:`TimeoutError` without being sent; one that is running when its
+deadline passes fails the same way; its execution is cancelled, and the
+sender resynchronises the transport because the line is already on the wire.
+Cancelling a queued command's future drops it from the queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from services.GrblSender import REALTIME_COMMANDS
+
+REALTIME = 0
+MOTION = 1
+QUERY = 2
+
+# "$" commands that only report state; $H (homing), $J (jog) and settings move or change the machine.
+_QUERY_COMMANDS = {"$", "$$", "$#", "$G", "$I", "$N"}
+
+
+def classify(command: str) -> int:
+    """Scheduling class of a command line."""
+
+    text = command.strip().upper()
+    if text in REALTIME_COMMANDS:
+        return REALTIME
+    if text in _QUERY_COMMANDS:
+        return QUERY
+    return MOTION
+
+
+@dataclass
+class ScheduledCommand:
+    command: str
+    priority: int
+    deadline: Optional[float]
+    sequence: int
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+    @property
+    def waited_s(self) -> float:
+        """Time spent queued (so far, if still queued)."""
+
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return end - self.submitted_at
+
+
+class CommandScheduler:
+    """Serialise commands to one executor with priorities, deadlines and cancellation."""
+
+    def __init__(
+        self,
+        execute: Callable[[str], Awaitable[list[str]]],
+        *,
+        starvation_s: float = 1.0,
+    ) -> None:
+        self._execute = execute
+        self.starvation_s = starvation_s
+        self._queues: dict[int, deque[ScheduledCommand]] = {MOTION: deque(), QUERY: deque()}
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._realtime_tasks: set[asyncio.Task] = set()
+        self.running: Optional[ScheduledCommand] = None
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def submit(
+        self,
+        command: str,
+        *,
+        priority: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+    ) -> ScheduledCommand:
+        """Queue ``command``; await ``.future`` for its response lines."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("CommandScheduler is bound to another event loop.")
+        priority = classify(command) if priority is None else priority
+        deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+        scheduled = ScheduledCommand(command, priority, deadline, next(self._sequence), loop.create_future())
+        if priority == REALTIME:
+            task = loop.create_task(self._run(scheduled))
+            self._realtime_tasks.add(task)
+            task.add_done_callback(self._realtime_tasks.discard)
+            return scheduled
+        self._queues[priority].append(scheduled)
+        if deadline is not None:
+            loop.call_at(loop.time() + timeout_s, self._expire, scheduled)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._work())
+        self._wakeup.set()
+        return scheduled
+
+    def queued(self) -> int:
+        return sum(
+            1 for queue in self._queues.values() for scheduled in queue if not scheduled.future.done()
+        )
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        """Stop the worker and fail everything still queued."""
+
+        error = error or ConnectionError("Command scheduler closed.")
+        if self._worker is not None and not self._worker.done() and not self._loop.is_closed():
+            self._worker.cancel()
+        self._worker = None
+        for queue in self._queues.values():
+            while queue:
+                scheduled = queue.popleft()
+                if not scheduled.future.done():
+                    scheduled.future.set_exception(error)
+
+    @staticmethod
+    def _expire(scheduled: ScheduledCommand) -> None:
+        # Fails the caller at its deadline even if the command is still queued; the worker skips it.
+        if scheduled.started_at is None and not scheduled.future.done():
+            scheduled.future.set_exception(
+                TimeoutError(f"'{scheduled.command.strip()}' expired after {scheduled.waited_s:.3f} s in the queue")
+            )
+
+    def _next(self) -> Optional[ScheduledCommand]:
+        now = time.monotonic()
+        for queue in self._queues.values():
+            while queue and queue[0].future.done():  # Cancelled or expired while queued.
+                queue.popleft()
+        heads = [queue[0] for queue in self._queues.values() if queue]
+        if not heads:
+            return None
+        starved = [head for head in heads if now - head.submitted_at >= self.starvation_s]
+        if starved:
+            chosen = min(starved, key=lambda head: head.sequence)
+        else:
+            chosen = min(heads, key=lambda head: head.priority)
+        return self._queues[chosen.priority].popleft()
+
+    async def _work(self) -> None:
+        while True:
+            scheduled = self._next()
+            if scheduled is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._run(scheduled)
+
+    async def _run(self, scheduled: ScheduledCommand) -> None:
+        if scheduled.deadline is not None and time.monotonic() >= scheduled.deadline:
+            self._expire(scheduled)
+            return
+        scheduled.started_at = time.monotonic()
+        if scheduled.priority != REALTIME:
+            self.running = scheduled
+        try:
+            execution = self._execute(scheduled.command)
+            if scheduled.deadline is not None:
+                execution = asyncio.wait_for(execution, scheduled.deadline - scheduled.started_at)
+            result = await execution
+        except asyncio.TimeoutError:
+            if not scheduled.future.done():
+                scheduled.future.set_exception(TimeoutError(f"Timeout waiting for '{scheduled.command.strip()}'"))
+        except asyncio.CancelledError:
+            if not scheduled.future.done():
+                scheduled.future.cancel()
+            raise
+        except Exception as exc:
+            if not scheduled.future.done():
+                scheduled.future.set_exception(exc)
+        else:
+            if not scheduled.future.done():
+                scheduled.future.set_result(result)
+        finally:
+            if self.running is scheduled:
+                self.running = None
@@ -0,0 +1,126 @@
+"""Modal G-code state shared by the GRBL senders.
+
+GRBL keeps units (``G20``/``G21``), distance mode (``G90``/``G91``), motion
+mode and feed rate from one line to the next. :class:`ModalSession` tracks
+what the controller was last told and renders a relative move as a single
+line that carries only the modal words that differ from that state, instead
+of the ``G21``/``G91``/``F``/``G1``/``G90``/``M2`` sequence with one round
+trip each. Every line sent to the controller should be passed to
+:meth:`ModalSession.observe` so commands typed by hand keep the state right;
+anything that leaves the state unknown (program end, reset, an ``error:``
+response, a reconnect) makes the next move re-establish all modal words.
+Every line received from the controller should go to
+:meth:`ModalSession.observe_response`, including unsolicited ones: the
+startup banner of a controller that reset itself and an ``ALARM:`` both
+mean GRBL is back at its power-on modes (``G90``, ``G0``). Responses arrive
+on the senders' reader thread while lines are sent from another, so every
+method holds the session's lock.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+_WORD = re.compile(r"([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))")
+_COMMENT = re.compile(r"\(.*?\)|;.*$")
+
+_UNITS = {"G20", "G21"}
+_DISTANCE = {"G90", "G91"}
+_MOTION = {"G0", "G1", "G2", "G3", "G38.2", "G38.3", "G38.4", "G38.5", "G80"}
+_PROGRAM_END = {"M2", "M30"}
+SOFT_RESET = "\x18"
+
+
+@dataclass
+class ModalState:
+    """Modal words as the controller last received them; ``None`` is unknown."""
+
+    units: Optional[str] = None
+    distance: Optional[str] = None
+    motion: Optional[str] = None
+    feed: Optional[float] = None
+
+
+def _format_code(letter: str, value: str) -> str:
+    number = float(value)
+    return f"{letter}{int(number)}" if number.is_integer() else f"{letter}{number:g}"
+
+
+class ModalSession:
+    """Track GRBL's modal state and emit moves with the minimum of modal words."""
+
+    def __init__(self) -> None:
+        self.state = ModalState()
+        # Reentrant: relative_move() records its line through observe().
+        self._lock = threading.RLock()
+
+    def reset(self) -> None:
+        """Forget the controller state; the next move re-sends units, distance mode and feed."""
+
+        with self._lock:
+            self.state = ModalState()
+
+    def relative_move(self, x: float, y: float, z: float, feedrate: float) -> str:
+        """The single line for a relative ``G1`` move, updating the tracked state."""
+
+        with self._lock:
+            return self._relative_move(x, y, z, feedrate)
+
+    def _relative_move(self, x: float, y: float, z: float, feedrate: float) -> str:
+        words: list[str] = []
+        if self.state.units != "G21":
+            words.append("G21")
+        if self.state.distance != "G91":
+            words.append("G91")
+        if self.state.motion != "G1":
+            words.append("G1")
+        words.append(f"X{x:.3f} Y{y:.3f} Z{z:.3f}")
+        if self.state.feed is None or abs(self.state.feed - float(feedrate)) > 1e-9:
+            words.append(f"F{float(feedrate):g}")
+        line = " ".join(words)
+        self.observe(line)
+        return line
+
+    def observe(self, line: str) -> None:
+        """Update the tracked state from a line sent to the controller."""
+
+        with self._lock:
+            self._observe(line)
+
+    def _observe(self, line: str) -> None:
+        if SOFT_RESET in line:
+            self.reset()
+            return
+        text = _COMMENT.sub("", line.strip().upper())
+        if not text or text.startswith("$"):
+            # System commands ($H, $X, settings) do not touch the modal groups tracked here.
+            return
+        for letter, value in _WORD.findall(text):
+            if letter == "F":
+                self.state.feed = float(value)
+                continue
+            if letter not in ("G", "M"):
+                continue
+            code = _format_code(letter, value)
+            if code in _UNITS:
+                self.state.units = code
+            elif code in _DISTANCE:
+                self.state.distance = code
+            elif code in _MOTION:
+                self.state.motion = code
+            elif code in _PROGRAM_END:
+                self.reset()
+                return
+
+    def observe_response(self, response: str) -> None:
+        """Forget the state on lines that mean the controller is not where it was told to be.
+
+        An ``error:`` means GRBL dropped the line, so the tracked state may be
+        ahead of it; ``ALARM:`` and the ``Grbl `` startup banner follow a reset.
+        """
+
+        if response.startswith(("error:", "ALARM:", "Grbl ")):
+            self.reset()
@@ -0,0 +1,97 @@
+"""Idle policy: drop capture resolution, frame rate and inference rate on a quiet scene.
+
+After ``quiet_seconds`` without a detection the controller switches to
+``idle``; the service then reconfigures the camera to the idle size and frame
+rate and infers less often. Any detection, or motion between consecutive idle
+frames, switches back to ``active`` immediately.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+ACTIVE = "active"
+IDLE = "idle"
+
+_MOTION_WIDTH = 160
+_MOTION_PIXEL_DELTA = 25
+
+
+@dataclass(frozen=True)
+class IdlePolicy:
+    quiet_seconds: float
+    width: int = 640
+    height: int = 360
+    fps: float = 10.0
+    inference_interval: int = 10
+    motion_threshold: float = 0.01
+
+    @classmethod
+    def from_args(cls, args) -> Optional["IdlePolicy"]:
+        """Policy configured by ``--idle-*`` options; ``None`` when ``--idle-after`` is off."""
+
+        quiet = float(getattr(args, "idle_after", 0.0) or 0.0)
+        if quiet <= 0:
+            return None
+        return cls(
+            quiet_seconds=quiet,
+            width=int(getattr(args, "idle_frame_width", 640)),
+            height=int(getattr(args, "idle_frame_height", 360)),
+            fps=float(getattr(args, "idle_fps", 10.0)),
+            inference_interval=max(1, int(getattr(args, "idle_inference_interval", 10))),
+            motion_threshold=float(getattr(args, "idle_motion_threshold", 0.01)),
+        )
+
+
+class IdleController:
+    """Track the last activity and report mode transitions."""
+
+    def __init__(self, policy: IdlePolicy, now: float) -> None:
+        self.policy = policy
+        self.mode = ACTIVE
+        self.reason = ""
+        self._last_activity = now
+        self._previous: Optional[np.ndarray] = None
+
+    def inference_interval(self, active_interval: int) -> int:
+        if self.mode == IDLE:
+            return max(active_interval, self.policy.inference_interval)
+        return active_interval
+
+    def _enter(self, mode: str, reason: str, now: float) -> str:
+        self.mode = mode
+        self.reason = reason
+        self._last_activity = now
+        self._previous = None
+        return mode
+
+    def _motion(self, frame: np.ndarray) -> float:
+        height, width = frame.shape[:2]
+        size = (_MOTION_WIDTH, max(1, round(height * _MOTION_WIDTH / width)))
+        gray = cv2.GaussianBlur(cv2.cvtColor(cv2.resize(frame, size), cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        previous, self._previous = self._previous, gray
+        if previous is None or previous.shape != gray.shape:
+            return 0.0
+        return float(np.count_nonzero(cv2.absdiff(gray, previous) > _MOTION_PIXEL_DELTA)) / gray.size
+
+    def observe_frame(self, frame: np.ndarray, now: float) -> Optional[str]:
+        """Check an idle frame for motion; returns the new mode on a transition."""
+
+        if self.mode == IDLE and self._motion(frame) > self.policy.motion_threshold:
+            return self._enter(ACTIVE, "motion", now)
+        return None
+
+    def observe_detections(self, count: int, now: float) -> Optional[str]:
+        """Record an inference result; returns the new mode on a transition."""
+
+        if count:
+            self._last_activity = now
+            if self.mode == IDLE:
+                return self._enter(ACTIVE, "detection", now)
+        elif self.mode == ACTIVE and now - self._last_activity >= self.policy.quiet_seconds:
+            return self._enter(IDLE, f"no detections for {self.policy.quiet_seconds:.0f} s", now)
+        return None
@@ -0,0 +1,219 @@
+"""Lean YOLO inference that skips the ultralytics predictor and ``Results`` objects.
+
+The network behind ``YOLO.model`` is called directly on a letterboxed input
+tensor that is allocated once per input shape, and the raw head output is
+turned into an ``(N, 6)`` array of ``x1, y1, x2, y2, conf, cls`` with one
+vectorised confidence filter and :func:`torchvision.ops.batched_nms`. Only
+detection heads that return ``(batch, 4 + classes, anchors)`` are supported;
+anything else is reported by :class:`LeanInferenceUnsupported` so callers can
+stay on ``model.predict``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import cv2
+import numpy as np
+import torch
+from torchvision.ops import batched_nms
+
+if TYPE_CHECKING:
+    from services.model_optimizer import OptimizedNetwork
+
+# Same defaults as the ultralytics predictor, so both paths agree.
+_DEFAULT_IOU = 0.7
+_MAX_DETECTIONS = 300
+_MAX_NMS_CANDIDATES = 30000
+_LETTERBOX_FILL = 114
+# Input shapes whose buffers are kept; single crops of varying aspect would otherwise each add one.
+_MAX_BUFFER_SHAPES = 4
+
+
+class LeanInferenceUnsupported(RuntimeError):
+    """Raised when a model's output layout is not the one the lean path decodes."""
+
+
+@dataclass
+class _Letterbox:
+    """Resize and padding that map one image into the input tensor and back."""
+
+    scale: float
+    left: int
+    top: int
+    width: int
+    height: int
+
+
+def model_imgsz(model) -> int:
+    overrides = getattr(model, "overrides", None) or {}
+    train_args = getattr(getattr(model, "model", None), "args", None)
+    imgsz = overrides.get("imgsz") or (train_args.get("imgsz") if isinstance(train_args, dict) else None) or 640
+    if isinstance(imgsz, (list, tuple)):
+        imgsz = max(imgsz)
+    return int(imgsz)
+
+
+def lean_input_shape(frame_shape: tuple[int, int], imgsz: int, stride: int = 32) -> tuple[int, int]:
+    """Smallest stride-aligned ``(height, width)`` that holds a frame scaled to ``imgsz``."""
+
+    height, width = frame_shape
+    scale = imgsz / max(height, width)
+    return (
+        int(np.ceil(round(height * scale) / stride) * stride),
+        int(np.ceil(round(width * scale) / stride) * stride),
+    )
+
+
+def network_stride(model) -> int:
+    return max(32, int(getattr(model.model, "stride", torch.tensor([32])).max()))
+
+
+class LeanDetector:
+    """Run a loaded ``YOLO`` model without the predictor machinery.
+
+    A single image is letterboxed to the smallest stride multiple that fits
+    ``imgsz`` (like the predictor's rectangular inference); a batch of crops
+    is letterboxed into ``imgsz`` squares so the crops can share one tensor.
+    """
+
+    def __init__(
+        self,
+        model,
+        device: str,
+        imgsz: Optional[int] = None,
+        iou: float = _DEFAULT_IOU,
+        optimized: Optional["OptimizedNetwork"] = None,
+        channels_last: bool = False,
+    ) -> None:
+        if not isinstance(model.model, torch.nn.Module):
+            raise LeanInferenceUnsupported("the model is not a PyTorch module")
+        self.network = model.model
+        self.optimized = optimized
+        if hasattr(self.network, "fuse") and not getattr(self.network, "is_fused", lambda: True)():
+            self.network.fuse(verbose=False)
+        self.network.eval()
+        self.memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        if channels_last:
+            self.network.to(memory_format=torch.channels_last)
+        self.device = torch.device(device)
+        self.imgsz = int(imgsz or model_imgsz(model))
+        self.stride = network_stride(model)
+        self.iou = iou
+        self.dtype = next(self.network.parameters()).dtype
+        self._buffer_cache: OrderedDict[tuple[int, int, int], tuple[np.ndarray, torch.Tensor]] = OrderedDict()
+
+    def _input_shape(self, images: Sequence[np.ndarray]) -> tuple[int, int]:
+        if len(images) > 1:
+            return self.imgsz, self.imgsz
+        return lean_input_shape(images[0].shape[:2], self.imgsz, self.stride)
+
+    def _buffers(self, batch: int, height: int, width: int) -> tuple[np.ndarray, torch.Tensor]:
+        key = (batch, height, width)
+        buffers = self._buffer_cache.get(key)
+        if buffers is not None:
+            self._buffer_cache.move_to_end(key)
+            return buffers
+        buffers = (
+            np.full((batch, height, width, 3), _LETTERBOX_FILL, dtype=np.uint8),
+            torch.empty(
+                (batch, 3, height, width),
+                dtype=self.dtype,
+                device=self.device,
+                memory_format=self.memory_format,
+            ),
+        )
+        self._buffer_cache[key] = buffers
+        if len(self._buffer_cache) > _MAX_BUFFER_SHAPES:
+            self._buffer_cache.popitem(last=False)
+        return buffers
+
+    def _letterbox(self, images: Sequence[np.ndarray]) -> tuple[torch.Tensor, list[_Letterbox]]:
+        input_height, input_width = self._input_shape(images)
+        host, tensor = self._buffers(len(images), input_height, input_width)
+        boxes: list[_Letterbox] = []
+        for index, image in enumerate(images):
+            height, width = image.shape[:2]
+            scale = min(input_height / height, input_width / width)
+            resized_width, resized_height = round(width * scale), round(height * scale)
+            left = (input_width - resized_width) // 2
+            top = (input_height - resized_height) // 2
+            canvas = host[index]
+            canvas[:] = _LETTERBOX_FILL
+            canvas[top : top + resized_height, left : left + resized_width] = cv2.resize(
+                image,
+                (resized_width, resized_height),
+                interpolation=cv2.INTER_LINEAR,
+            )
+            boxes.append(_Letterbox(scale, left, top, width, height))
+
+        # BGR HWC uint8 -> RGB CHW float in [0, 1], written into the preallocated tensor.
+        source = torch.from_numpy(host).to(self.device, non_blocking=True)
+        tensor.copy_(source.permute(0, 3, 1, 2).flip(1))
+        tensor.mul_(1.0 / 255.0)
+        return tensor, boxes
+
+    def detect(
+        self,
+        images: Sequence[np.ndarray],
+        conf: float,
+        thresholds: Optional[np.ndarray] = None,
+    ) -> list[np.ndarray]:
+        """Return one ``(N, 6)`` array per image in the image's own pixel coordinates.
+
+        ``thresholds`` holds a per-class minimum confidence (``inf`` disables a
+        class); it is applied before NMS so excluded classes never reach it.
+        """
+
+        with torch.inference_mode():
+            tensor, letterboxes = self._letterbox(images)
+            # The optimised module is only valid for the shape it was built for.
+            if self.optimized is not None and self.optimized.accepts(tensor):
+                output = self.optimized(tensor)
+            else:
+                output = self.network(tensor)
+            predictions = output[0] if isinstance(output, (list, tuple)) else output
+            if predictions.ndim != 3 or predictions.shape[1] <= 4:
+                raise LeanInferenceUnsupported(f"Unexpected detection output shape {tuple(predictions.shape)}.")
+
+            class_thresholds = None
+            if thresholds is not None:
+                class_thresholds = torch.as_tensor(thresholds, dtype=torch.float32, device=predictions.device)
+                if class_thresholds.numel() != predictions.shape[1] - 4:
+                    class_thresholds = None
+
+            results = []
+            for prediction, letterbox in zip(predictions, letterboxes):
+                results.append(self._decode(prediction.transpose(0, 1).float(), letterbox, conf, class_thresholds))
+            return results
+
+    def _decode(
+        self,
+        prediction: torch.Tensor,
+        letterbox: _Letterbox,
+        conf: float,
+        class_thresholds: Optional[torch.Tensor],
+    ) -> np.ndarray:
+        scores, classes = prediction[:, 4:].max(dim=1)
+        keep = scores >= conf
+        if class_thresholds is not None:
+            keep &= scores >= class_thresholds[classes]
+        if not bool(keep.any()):
+            return np.zeros((0, 6), dtype=np.float32)
+
+        prediction, scores, classes = prediction[keep], scores[keep], classes[keep]
+        if len(scores) > _MAX_NMS_CANDIDATES:
+            top = scores.topk(_MAX_NMS_CANDIDATES).indices
+            prediction, scores, classes = prediction[top], scores[top], classes[top]
+
+        centre, size = prediction[:, :2], prediction[:, 2:4] / 2
+        boxes = torch.cat((centre - size, centre + size), dim=1)
+        kept = batched_nms(boxes, scores, classes, self.iou)[:_MAX_DETECTIONS]
+
+        boxes = boxes[kept]
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - letterbox.left) / letterbox.scale).clamp_(0, letterbox.width)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - letterbox.top) / letterbox.scale).clamp_(0, letterbox.height)
+        detections = torch.cat((boxes, scores[kept, None], classes[kept, None].float()), dim=1)
+        return detections.cpu().numpy()
@@ -0,0 +1,185 @@
+"""Ahead-of-time optimisation of the detection network for CPU inference.
+
+``trace`` produces a frozen TorchScript module for one input shape and caches
+it under ``<models>/.cache``; the file name carries the weights hash, the
+torch version, the device, the input shape and the memory format, so any
+change produces a new artifact instead of loading a stale one. ``compile``
+uses ``torch.compile`` with inductor's cache pointed at the same directory.
+Every step is optional: when tracing, compiling or the output check fails the
+caller gets ``None`` and keeps running the eager network.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import torch
+from torch import nn
+
+OPTIMIZE_MODES = ("none", "trace", "compile")
+CACHE_DIR_NAME = ".cache"
+
+logger = logging.getLogger(__name__)
+
+
+class _HeadOutput(nn.Module):
+    """Expose only the decoded head output so the traced graph has a single tensor result."""
+
+    def __init__(self, network: nn.Module) -> None:
+        super().__init__()
+        self.network = network
+
+    def forward(self, images: torch.Tensor) -> torch.Tensor:
+        output = self.network(images)
+        return output[0] if isinstance(output, (list, tuple)) else output
+
+
+@dataclass
+class OptimizedNetwork:
+    """Optimised module valid for exactly one input shape."""
+
+    module: nn.Module
+    mode: str
+    input_shape: tuple[int, int, int, int]
+    channels_last: bool
+    source: str
+
+    def accepts(self, images: torch.Tensor) -> bool:
+        return tuple(images.shape) == self.input_shape
+
+    def __call__(self, images: torch.Tensor) -> torch.Tensor:
+        if self.channels_last:
+            images = images.contiguous(memory_format=torch.channels_last)
+        return self.module(images)
+
+    def describe(self) -> str:
+        layout = "channels-last" if self.channels_last else "contiguous"
+        shape = "x".join(str(value) for value in self.input_shape)
+        return f"{self.mode} ({self.source}, {shape}, {layout})"
+
+
+def weights_hash(model_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def cache_dir_for(model_path: str) -> Path:
+    return Path(model_path).resolve().parent / CACHE_DIR_NAME
+
+
+def artifact_path(
+    model_path: str,
+    device: str,
+    input_shape: tuple[int, int, int, int],
+    channels_last: bool,
+) -> Path:
+    torch_version = torch.__version__.split("+")[0]
+    shape = "x".join(str(value) for value in input_shape)
+    layout = "cl" if channels_last else "nchw"
+    name = f"{Path(model_path).stem}-{weights_hash(model_path)}-torch{torch_version}-{device}-{shape}-{layout}.ts"
+    return cache_dir_for(model_path) / name
+
+
+def _outputs_match(reference: torch.Tensor, candidate: torch.Tensor) -> bool:
+    if reference.shape != candidate.shape:
+        return False
+    return bool(torch.allclose(reference.float(), candidate.float(), rtol=1e-3, atol=1e-3))
+
+
+def _trace(
+    head: _HeadOutput,
+    example: torch.Tensor,
+    reference: torch.Tensor,
+    path: Path,
+    device: str,
+) -> tuple[nn.Module, str]:
+    if path.exists():
+        try:
+            module = torch.jit.load(str(path), map_location=device)
+            if _outputs_match(reference, module(example)):
+                return module, "cache"
+            logger.warning("Cached artifact %s disagrees with the eager model; rebuilding.", path.name)
+        except Exception as exc:
+            logger.warning("Could not load cached artifact %s (%s); rebuilding.", path.name, exc)
+
+    traced = torch.jit.trace(head, example, strict=False, check_trace=False)
+    module = torch.jit.freeze(traced.eval())
+    if not _outputs_match(reference, module(example)):
+        raise RuntimeError("traced module output differs from the eager model")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    torch.jit.save(module, str(temporary))
+    os.replace(temporary, path)
+    return module, "built"
+
+
+def _compile(head: _HeadOutput, example: torch.Tensor, reference: torch.Tensor, cache_dir: Path) -> nn.Module:
+    if not hasattr(torch, "compile"):
+        raise RuntimeError(f"torch {torch.__version__} has no torch.compile")
+    # Inductor keeps its compiled kernels on disk; keep them next to the traced artifacts.
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(cache_dir / "inductor"))
+    module = torch.compile(head, dynamic=False)
+    if not _outputs_match(reference, module(example)):
+        raise RuntimeError("compiled module output differs from the eager model")
+    return module
+
+
+def optimize_network(
+    network: nn.Module,
+    model_path: str,
+    device: str,
+    input_shape: tuple[int, int, int, int],
+    *,
+    mode: str = "trace",
+    channels_last: bool = False,
+) -> Optional[OptimizedNetwork]:
+    """Build or load the optimised form of ``network``; ``None`` means stay on eager."""
+
+    if mode not in OPTIMIZE_MODES:
+        raise ValueError(f"Unknown optimisation mode '{mode}'. Expected one of: {', '.join(OPTIMIZE_MODES)}.")
+    if mode == "none":
+        return None
+
+    try:
+        if hasattr(network, "fuse") and not getattr(network, "is_fused", lambda: True)():
+            network.fuse(verbose=False)
+        network.eval()
+        if channels_last:
+            network.to(memory_format=torch.channels_last)
+
+        dtype = next(network.parameters()).dtype
+        example = torch.rand(input_shape, dtype=dtype, device=device)
+        if channels_last:
+            example = example.contiguous(memory_format=torch.channels_last)
+        head = _HeadOutput(network).eval()
+        with torch.inference_mode():
+            reference = head(example)
+        # Tracing records autograd-free graphs but cannot run under inference mode.
+        with torch.no_grad():
+            if mode == "trace":
+                path = artifact_path(model_path, device, input_shape, channels_last)
+                module, source = _trace(head, example, reference, path, device)
+            else:
+                module, source = _compile(head, example, reference, cache_dir_for(model_path)), "built"
+    except Exception as exc:
+        logger.warning("Model optimisation '%s' unavailable, using the eager model: %s", mode, exc)
+        return None
+
+    optimized = OptimizedNetwork(
+        module=module,
+        mode=mode,
+        input_shape=tuple(input_shape),
+        channels_last=channels_last,
+        source=source,
+    )
+    logger.info("Optimised network ready: %s", optimized.describe())
+    return optimized
@@ -0,0 +1,153 @@
+"""Background model preloading driven by the model selection in the GUI.
+
+The vision stack (torch, ultralytics) is imported lazily on the loading thread
+so that this module stays cheap to import while the window is starting up.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from services.resource_governor import ResourceGovernor
+
+logger = logging.getLogger(__name__)
+
+
+def model_load_key(args) -> tuple:
+    """Identify the configuration a loaded model is valid for."""
+
+    imgsz = str(getattr(args, "imgsz", None) or "default").lower()
+    target = getattr(args, "target_latency_ms", None) if imgsz == "auto" else None
+    optimize = str(getattr(args, "optimize", None) or "none").lower()
+    channels_last = bool(getattr(args, "channels_last", False))
+    return (str(args.model_path), args.device or "auto", imgsz, target, optimize, channels_last)
+
+
+@dataclass
+class PreloadRequest:
+    generation: int
+    key: tuple
+    args: Any
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class ModelPreloader:
+    """Load and warm the most recently selected model on a worker thread.
+
+    Only the latest request is kept: a new request sets the cancel event of the
+    previous one, which aborts its warmup at the next iteration, and any result
+    it still produces is discarded. Callbacks run on the loading thread and
+    receive the request generation so callers can ignore stale notifications.
+    """
+
+    def __init__(
+        self,
+        on_progress: Optional[Callable[[int, str, float], None]] = None,
+        on_ready: Optional[Callable[[int, Any], None]] = None,
+        on_error: Optional[Callable[[int, BaseException], None]] = None,
+    ) -> None:
+        self.on_progress = on_progress
+        self.on_ready = on_ready
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._current: Optional[PreloadRequest] = None
+
+    def request(self, args) -> int:
+        """Start loading the model for ``args`` unless it is already loaded or loading."""
+
+        key = model_load_key(args)
+        with self._lock:
+            current = self._current
+            if current is not None and current.key == key and current.error is None:
+                return current.generation
+            if current is not None:
+                current.cancel_event.set()
+            self._generation += 1
+            request = PreloadRequest(generation=self._generation, key=key, args=args)
+            self._current = request
+
+        threading.Thread(
+            target=self._load,
+            args=(request,),
+            name=f"ModelPreload-{request.generation}",
+            daemon=True,
+        ).start()
+        return request.generation
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel_event.set()
+            self._current = None
+
+    def is_loading(self, args) -> bool:
+        with self._lock:
+            current = self._current
+        return current is not None and current.key == model_load_key(args) and not current.done.is_set()
+
+    def take(self, args) -> Any:
+        """Return the ready model for ``args`` and hand ownership to the caller."""
+
+        with self._lock:
+            current = self._current
+            if current is None or current.key != model_load_key(args) or not current.done.is_set():
+                return None
+            if current.result is None:
+                return None
+            self._current = None
+            return current.result
+
+    def claim(self, generation: int) -> Any:
+        """Return the ready model of ``generation`` and hand ownership to the caller."""
+
+        with self._lock:
+            current = self._current
+            if current is None or current.generation != generation or current.result is None:
+                return None
+            self._current = None
+            return current.result
+
+    def _load(self, request: PreloadRequest) -> None:
+        # Loading and warmup are inference work; keep them off the GUI's CPUs.
+        ResourceGovernor.from_args(request.args).pin_current_thread("inference")
+        vision_service = importlib.import_module("services.vision_service")
+
+        def _progress(stage: str, fraction: float) -> None:
+            if self._is_current(request) and self.on_progress is not None:
+                self.on_progress(request.generation, stage, fraction)
+
+        try:
+            request.result = vision_service.load_model(
+                request.args,
+                cancel_event=request.cancel_event,
+                progress=_progress,
+            )
+        except vision_service.ModelLoadCancelled:
+            logger.debug("Discarded stale preload of %s", request.key[0])
+            return
+        except Exception as exc:  # pragma: no cover - surfaced to the GUI
+            request.error = exc
+            if self._is_current(request) and self.on_error is not None:
+                self.on_error(request.generation, exc)
+            return
+        finally:
+            request.done.set()
+
+        if not self._is_current(request):
+            request.result = None
+            logger.debug("Discarded stale preload of %s", request.key[0])
+            return
+        if self.on_ready is not None:
+            self.on_ready(request.generation, request.result)
+
+    def _is_current(self, request: PreloadRequest) -> bool:
+        with self._lock:
+            return self._current is request and not request.cancel_event.is_set()
@@ -0,0 +1,91 @@
+"""Registry of derived models (e.g. INT8 builds) with their measured latency and accuracy.
+
+The registry is a JSON file next to the models, written by the build tools in
+``tools/`` and read by the GUI to annotate the model list. It only uses the
+standard library so reading it never pulls in the vision stack.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+REGISTRY_FILE = "model_registry.json"
+
+
+@dataclass
+class ModelRecord:
+    path: str
+    source: str
+    precision: str
+    imgsz: int
+    latency_ms: float
+    baseline_latency_ms: float
+    map50: float
+    baseline_map50: float
+    created: str = ""
+    calibration_images: int = 0
+    device: str = "cpu"
+
+    @property
+    def map50_delta(self) -> float:
+        return self.map50 - self.baseline_map50
+
+    def describe(self) -> str:
+        return (
+            f"{self.precision.upper()}, {self.latency_ms:.1f} ms "
+            f"(was {self.baseline_latency_ms:.1f}), mAP50 {self.map50:.3f} ({self.map50_delta:+.3f})"
+        )
+
+
+def registry_path(models_dir: Path) -> Path:
+    return Path(models_dir) / REGISTRY_FILE
+
+
+def load_registry(models_dir: Path) -> dict[str, ModelRecord]:
+    """Return records keyed on their path relative to ``models_dir``; missing or broken files give ``{}``."""
+
+    path = registry_path(models_dir)
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+    known = {field.name for field in fields(ModelRecord)}
+    records: dict[str, ModelRecord] = {}
+    for entry in raw.get("models", []):
+        try:
+            record = ModelRecord(**{key: value for key, value in entry.items() if key in known})
+        except TypeError:
+            continue
+        records[record.path] = record
+    return records
+
+
+def register_model(models_dir: Path, record: ModelRecord) -> Path:
+    """Add or replace ``record`` in the registry and return the registry path."""
+
+    records = load_registry(models_dir)
+    records[record.path] = record
+    path = registry_path(models_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    payload = {"models": [asdict(entry) for entry in sorted(records.values(), key=lambda entry: entry.path)]}
+    temporary.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(temporary, path)
+    return path
+
+
+def find_record(models_dir: Path, model_path: str) -> Optional[ModelRecord]:
+    """Look up ``model_path`` (absolute, or relative to the project or ``models_dir``)."""
+
+    models_dir = Path(models_dir).resolve()
+    candidate = Path(model_path)
+    try:
+        key = candidate.resolve().relative_to(models_dir).as_posix()
+    except ValueError:
+        key = candidate.name
+    return load_registry(models_dir).get(key)
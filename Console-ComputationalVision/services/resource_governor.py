@@ -0,0 +1,204 @@
+"""Thread-count and CPU-affinity policy for capture, inference and the GUI.
+
+PyTorch, OpenCV and Tk otherwise each size their thread pools for the whole
+machine and contend for the same cores. A :class:`ResourceLayout` fixes the
+library thread counts and assigns a CPU set to each role; the
+:class:`ResourceGovernor` applies the process-wide settings once and pins the
+calling thread of each role with :func:`os.sched_setaffinity` (Linux only;
+elsewhere pinning is a logged no-op). Threads inherit the affinity of the
+thread that creates them, so a role's worker pools follow its pinning when it
+is applied before the first parallel work on that thread.
+
+torch and OpenCV are imported only when the process-wide settings are applied,
+so the GUI can import this module at startup.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+ROLES = ("capture", "inference", "gui")
+
+logger = logging.getLogger(__name__)
+
+_process_lock = threading.Lock()
+_applied_process_settings: Optional[tuple] = None
+
+
+def parse_cpu_list(value) -> frozenset[int]:
+    """Parse ``"0-3,6"`` style CPU lists (as used by ``taskset -c``)."""
+
+    if value is None or value == "":
+        return frozenset()
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return frozenset(int(cpu) for cpu in value)
+
+    cpus: set[int] = set()
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, separator, end = part.partition("-")
+        try:
+            if separator:
+                first, last = int(start), int(end)
+                if last < first:
+                    raise ValueError
+                cpus.update(range(first, last + 1))
+            else:
+                cpus.add(int(part))
+        except ValueError:
+            raise ValueError(f"Invalid CPU list '{value}'; expected e.g. '0-3,6'.") from None
+    return frozenset(cpus)
+
+
+def format_cpu_list(cpus) -> str:
+    ordered = sorted(cpus)
+    ranges: list[str] = []
+    index = 0
+    while index < len(ordered):
+        end = index
+        while end + 1 < len(ordered) and ordered[end + 1] == ordered[end] + 1:
+            end += 1
+        ranges.append(str(ordered[index]) if end == index else f"{ordered[index]}-{ordered[end]}")
+        index = end + 1
+    return ",".join(ranges)
+
+
+def available_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def affinity_supported() -> bool:
+    return hasattr(os, "sched_setaffinity")
+
+
+# Captured at import, before any role is pinned: a pinned thread only sees its own
+# CPUs, and threads it starts inherit that narrower set.
+_PROCESS_CPUS = frozenset(available_cpus())
+
+
+@dataclass(frozen=True)
+class ResourceLayout:
+    """Library thread counts (``None`` keeps the library default) and a CPU set per role."""
+
+    torch_threads: Optional[int] = None
+    interop_threads: Optional[int] = None
+    cv2_threads: Optional[int] = None
+    cpus: dict[str, frozenset[int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_args(cls, args) -> "ResourceLayout":
+        cpus = {}
+        for role in ROLES:
+            role_cpus = parse_cpu_list(getattr(args, f"cpus_{role}", None))
+            if role_cpus:
+                cpus[role] = role_cpus
+        return cls(
+            torch_threads=getattr(args, "torch_threads", None),
+            interop_threads=getattr(args, "torch_interop_threads", None),
+            cv2_threads=getattr(args, "cv2_threads", None),
+            cpus=cpus,
+        )
+
+    @property
+    def is_default(self) -> bool:
+        return not self.cpus and self.torch_threads is None and self.interop_threads is None and self.cv2_threads is None
+
+    def describe(self) -> str:
+        parts = [
+            f"torch={self.torch_threads or 'default'}",
+            f"interop={self.interop_threads or 'default'}",
+            f"cv2={'default' if self.cv2_threads is None else self.cv2_threads}",
+        ]
+        parts.extend(f"{role}=cpus {format_cpu_list(self.cpus[role])}" for role in ROLES if role in self.cpus)
+        return ", ".join(parts)
+
+    def to_args(self) -> list[str]:
+        """Command-line flags that reproduce this layout."""
+
+        flags: list[str] = []
+        if self.torch_threads is not None:
+            flags += ["--torch-threads", str(self.torch_threads)]
+        if self.interop_threads is not None:
+            flags += ["--torch-interop-threads", str(self.interop_threads)]
+        if self.cv2_threads is not None:
+            flags += ["--cv2-threads", str(self.cv2_threads)]
+        for role in ROLES:
+            if role in self.cpus:
+                flags += [f"--cpus-{role}", format_cpu_list(self.cpus[role])]
+        return flags
+
+
+class ResourceGovernor:
+    """Apply a :class:`ResourceLayout` to the process and to role threads."""
+
+    def __init__(self, layout: ResourceLayout) -> None:
+        self.layout = layout
+
+    @classmethod
+    def from_args(cls, args) -> "ResourceGovernor":
+        return cls(ResourceLayout.from_args(args))
+
+    def has_role(self, role: str) -> bool:
+        return role in self.layout.cpus
+
+    def apply_process(self) -> None:
+        """Set torch and OpenCV thread counts; later calls with other values are ignored with a warning."""
+
+        global _applied_process_settings
+
+        layout = self.layout
+        settings = (layout.torch_threads, layout.interop_threads, layout.cv2_threads)
+        with _process_lock:
+            if _applied_process_settings is not None:
+                if settings != _applied_process_settings and settings != (None, None, None):
+                    logger.warning("Thread counts are process-wide and already set; restart to change them.")
+                return
+            _applied_process_settings = settings
+            if settings == (None, None, None):
+                return
+
+            import torch
+
+            if layout.torch_threads:
+                torch.set_num_threads(int(layout.torch_threads))
+            if layout.interop_threads:
+                try:
+                    torch.set_num_interop_threads(int(layout.interop_threads))
+                except RuntimeError as exc:
+                    # Only possible before any inter-op parallel work has started.
+                    logger.warning("Could not set torch inter-op threads: %s", exc)
+            if layout.cv2_threads is not None:
+                import cv2
+
+                cv2.setNumThreads(int(layout.cv2_threads))
+            logger.info("Thread counts: %s", layout.describe())
+
+    def pin_current_thread(self, role: str) -> bool:
+        """Restrict the calling thread to the CPUs of ``role``; returns whether pinning happened."""
+
+        cpus = self.layout.cpus.get(role)
+        if not cpus:
+            return False
+        if not affinity_supported():
+            logger.info("CPU pinning is not supported on this platform; %s thread left unpinned.", role)
+            return False
+        usable = cpus & _PROCESS_CPUS
+        if not usable:
+            logger.warning("None of CPUs %s are available for the %s thread.", format_cpu_list(cpus), role)
+            return False
+        # On Linux, pid 0 addresses the calling thread rather than the whole process.
+        try:
+            os.sched_setaffinity(0, usable)
+        except OSError as exc:
+            logger.warning("Could not pin the %s thread to CPUs %s: %s", role, format_cpu_list(usable), exc)
+            return False
+        logger.debug("Pinned %s thread %s to CPUs %s.", role, threading.current_thread().name, format_cpu_list(usable))
+        return True
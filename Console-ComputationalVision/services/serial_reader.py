@@ -0,0 +1,206 @@
+"""Single reader thread per GRBL serial port.
+
+GRBL answers every line it receives with ``ok`` or ``error:N``, in order,
+and interleaves unsolicited output: status reports (``<Idle|MPos:...>``)
+for the ``?`` realtime command, ``[MSG:...]`` feedback, ``ALARM:`` and the
+startup banner. :class:`SerialReader` is the only code that reads the port.
+It reads whatever is buffered (``in_waiting``) in one call, splits lines and
+dispatches them:
+
+* ``ok``/``error:`` resolve the oldest pending command's future with every
+  line received since that command was written;
+* status reports go to the status callback only;
+* every line goes to the line callback (the log).
+
+Writers register the expected response with :meth:`SerialReader.expect`
+before writing, so responses are matched to commands purely by order. That
+order is lost when a line goes unanswered: the ``Grbl`` startup banner
+(the controller reset and dropped its buffers) fails everything pending,
+and a writer that timed out calls :meth:`SerialReader.resynchronise`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingCommand:
+    command: str
+    future: Future = field(default_factory=Future)
+    lines: list[str] = field(default_factory=list)
+
+
+def is_status_report(line: str) -> bool:
+    return line.startswith("<") and line.endswith(">")
+
+
+def parse_status_report(line: str) -> dict:
+    """Split ``<Idle|MPos:0.000,0.000,0.000|FS:0,0>`` into the state and its fields."""
+
+    parts = line.strip("<>").split("|")
+    report: dict = {"state": parts[0]}
+    for part in parts[1:]:
+        key, _, value = part.partition(":")
+        try:
+            report[key] = tuple(float(number) for number in value.split(","))
+        except ValueError:
+            report[key] = value
+    return report
+
+
+class SerialReader:
+    """Read a serial port on one thread and route each line to its consumer."""
+
+    def __init__(
+        self,
+        ser,
+        *,
+        name: str = "",
+        on_line: Optional[Callable[[str], None]] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+        on_event: Optional[Callable[..., None]] = None,
+    ) -> None:
+        self.ser = ser
+        self._on_line = on_line
+        self._on_status = on_status
+        self._on_event = on_event
+        self._pending: deque[PendingCommand] = deque()
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._stop = threading.Event()
+        self._last_line_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"SerialReader-{name or id(ser)}", daemon=True)
+
+    def start(self) -> "SerialReader":
+        self._thread.start()
+        return self
+
+    def request_stop(self) -> None:
+        """Flag the thread to exit; set it before closing the port so the failing read is expected."""
+
+        self._stop.set()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self.fail_pending(ConnectionError("Serial reader stopped."))
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def expect(self, command: str) -> Future:
+        """Register that ``command`` is about to be written and will be answered by ``ok``/``error:``."""
+
+        pending = PendingCommand(command.strip())
+        with self._lock:
+            self._pending.append(pending)
+        return pending.future
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def fail_pending(self, error: Exception) -> None:
+        """Fail every command still waiting, e.g. after a soft reset flushed GRBL's buffers."""
+
+        with self._lock:
+            pending, self._pending = list(self._pending), deque()
+        for entry in pending:
+            if not entry.future.done():
+                entry.future.set_exception(error)
+
+    def resynchronise(self, error: Exception, *, quiet_s: float = 0.2, timeout_s: float = 2.0) -> None:
+        """Fail everything pending once the port has been quiet for ``quiet_s``.
+
+        Used after a command timed out: its ``ok`` may never come (GRBL reset),
+        and keeping its slot would hand every later command the previous
+        command's ``ok``. Waiting for a quiet port first lets replies that were
+        still on their way land on the commands they belong to.
+        """
+
+        deadline = time.monotonic() + timeout_s
+        while True:
+            idle = time.monotonic() - self._last_line_at
+            remaining = deadline - time.monotonic()
+            if idle >= quiet_s or remaining <= 0:
+                break
+            time.sleep(min(quiet_s - idle, remaining))
+        self.fail_pending(error)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                # Blocks up to the port timeout for the first byte, then takes everything buffered.
+                data = self.ser.read(max(1, self.ser.in_waiting))
+            except Exception as exc:
+                if not self._stop.is_set():
+                    logger.error("Serial read failed: %s", exc)
+                    self.fail_pending(ConnectionError(f"Serial read failed: {exc}"))
+                    self._emit("read_error", error=str(exc))
+                return
+            if not data:
+                continue
+            self._buffer.extend(data)
+            while True:
+                index = self._buffer.find(b"\n")
+                if index < 0:
+                    break
+                raw = bytes(self._buffer[:index])
+                del self._buffer[: index + 1]
+                line = raw.decode("utf-8", errors="replace").strip()
+                if line:
+                    self._dispatch(line)
+
+    def _dispatch(self, line: str) -> None:
+        self._last_line_at = time.monotonic()
+        if self._on_line is not None:
+            self._safe_call(self._on_line, line)
+        if line.startswith("Grbl "):
+            # Startup banner: the controller reset and will never answer what was pending.
+            self.fail_pending(ConnectionResetError(f"GRBL restarted: {line}"))
+            self._emit("controller_reset", line=line)
+            return
+        if is_status_report(line):
+            if self._on_status is not None:
+                self._safe_call(self._on_status, line)
+            return
+
+        with self._lock:
+            head = self._pending[0] if self._pending else None
+            first_line = False
+            if head is not None:
+                head.lines.append(line)
+                first_line = len(head.lines) == 1
+                if line == "ok" or line.startswith("error:"):
+                    self._pending.popleft()
+                else:
+                    head = None
+        if first_line:
+            self._emit("first_byte_in", line=line)
+        if head is None:
+            return
+        self._emit("ok_parsed", line=line, command=head.command, lines=len(head.lines))
+        if not head.future.done():
+            head.future.set_result(head.lines)
+
+    def _emit(self, name: str, **payload) -> None:
+        if self._on_event is not None:
+            self._safe_call(self._on_event, name, **payload)
+
+    @staticmethod
+    def _safe_call(callback: Callable, *args, **kwargs) -> None:
+        try:
+            callback(*args, **kwargs)
+        except Exception:  # pragma: no cover - a consumer must not kill the reader
+            logger.exception("Serial reader callback failed")
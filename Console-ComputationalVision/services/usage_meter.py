@@ -0,0 +1,177 @@
+"""CPU time and package energy bookkeeping per operating mode.
+
+CPU time comes from ``utime + stime`` in ``/proc/self/stat`` (falling back to
+:func:`time.process_time` where ``/proc`` is missing). Energy comes from the
+RAPL counters under ``/sys/class/powercap``; they cover the whole CPU package,
+not just this process, and are often readable by root only, in which case
+power is reported as unavailable. Only the standard library is used.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+POWERCAP_ROOT = Path("/sys/class/powercap")
+_PACKAGE_ZONE = re.compile(r"intel-rapl:\d+")
+
+logger = logging.getLogger(__name__)
+
+try:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = 100
+
+
+def process_cpu_seconds() -> float:
+    """User plus system CPU time of this process, in seconds."""
+
+    try:
+        stat = Path("/proc/self/stat").read_text()
+    except OSError:
+        return time.process_time()
+    # The command name may contain spaces; fields after it start at "state" (field 3).
+    fields = stat[stat.rfind(")") + 2 :].split()
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+class RaplMeter:
+    """Cumulative package energy from the RAPL powercap zones, handling counter wrap."""
+
+    def __init__(self, root: Path = POWERCAP_ROOT) -> None:
+        self._zones: list[tuple[Path, int]] = []
+        for zone in sorted(root.glob("intel-rapl:*")):
+            if not _PACKAGE_ZONE.fullmatch(zone.name):
+                continue  # Sub-zones (core, uncore, dram) are already part of the package.
+            try:
+                max_range = int((zone / "max_energy_range_uj").read_text())
+                int((zone / "energy_uj").read_text())
+            except (OSError, ValueError) as exc:
+                logger.debug("RAPL zone %s unreadable: %s", zone.name, exc)
+                continue
+            self._zones.append((zone / "energy_uj", max_range))
+        self._last: list[Optional[int]] = [None] * len(self._zones)
+        self._total_uj = 0
+
+    @property
+    def available(self) -> bool:
+        return bool(self._zones)
+
+    def joules(self) -> Optional[float]:
+        if not self._zones:
+            return None
+        for index, (path, max_range) in enumerate(self._zones):
+            try:
+                value = int(path.read_text())
+            except (OSError, ValueError):
+                continue
+            last = self._last[index]
+            if last is not None:
+                delta = value - last
+                self._total_uj += delta if delta >= 0 else delta + max_range
+            self._last[index] = value
+        return self._total_uj / 1e6
+
+
+@dataclass
+class ModeUsage:
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    energy_j: Optional[float] = None
+    frames: int = 0
+    inferences: int = 0
+
+    @property
+    def cpu_percent(self) -> float:
+        return 100.0 * self.cpu_seconds / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def watts(self) -> Optional[float]:
+        if self.energy_j is None or self.seconds <= 0:
+            return None
+        return self.energy_j / self.seconds
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    def describe(self) -> str:
+        watts = f"{self.watts:.1f} W" if self.watts is not None else "power n/a"
+        return (
+            f"{self.seconds:.0f} s, CPU {self.cpu_percent:.0f}%, {watts}, "
+            f"{self.fps:.1f} FPS, {self.inferences} inferences"
+        )
+
+
+class UsageLedger:
+    """Attribute wall time, CPU time and energy to the mode that was active.
+
+    Updated by the streaming thread and read by the GUI, hence the lock.
+    """
+
+    def __init__(self, meter: Optional[RaplMeter] = None) -> None:
+        self._meter = meter if meter is not None else RaplMeter()
+        self.modes: dict[str, ModeUsage] = {}
+        self.mode: Optional[str] = None
+        self._mark: tuple[float, float, Optional[float]] | None = None
+        self._lock = threading.Lock()
+
+    def _sample(self) -> tuple[float, float, Optional[float]]:
+        return time.monotonic(), process_cpu_seconds(), self._meter.joules()
+
+    def close(self) -> None:
+        """Attribute everything since the last sample to the current mode."""
+
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self.mode is None or self._mark is None:
+            return
+        now = self._sample()
+        usage = self.modes.setdefault(self.mode, ModeUsage())
+        usage.seconds += now[0] - self._mark[0]
+        usage.cpu_seconds += now[1] - self._mark[1]
+        if now[2] is not None and self._mark[2] is not None:
+            usage.energy_j = (usage.energy_j or 0.0) + now[2] - self._mark[2]
+        self._mark = now
+
+    def switch(self, mode: str) -> None:
+        with self._lock:
+            self._close_locked()
+            self.mode = mode
+            if self._mark is None:
+                self._mark = self._sample()
+            self.modes.setdefault(mode, ModeUsage())
+
+    def count_frame(self) -> None:
+        with self._lock:
+            if self.mode is not None:
+                self.modes[self.mode].frames += 1
+
+    def count_inference(self) -> None:
+        with self._lock:
+            if self.mode is not None:
+                self.modes[self.mode].inferences += 1
+
+    def report(self) -> dict[str, dict]:
+        """Per-mode totals up to now."""
+
+        with self._lock:
+            self._close_locked()
+            return {
+                mode: {
+                    "seconds": usage.seconds,
+                    "cpu_percent": usage.cpu_percent,
+                    "watts": usage.watts,
+                    "fps": usage.fps,
+                    "inferences": usage.inferences,
+                }
+                for mode, usage in self.modes.items()
+            }
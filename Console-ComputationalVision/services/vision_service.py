@@ -2,17 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import queue
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 import logging
-from typing import Callable, Iterable, Optional
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Optional, Union
 
 import cv2
 import cvzone
 import numpy as np
 import torch
+from torchvision.ops import batched_nms
 from ultralytics import YOLO
 
+from services.cascade import CascadeGate, build_cascade_gate
+from services.idle_mode import ACTIVE, IDLE, IdleController, IdlePolicy
+from services.lean_inference import (
+    LeanDetector,
+    LeanInferenceUnsupported,
+    lean_input_shape,
+    model_imgsz,
+    network_stride,
+)
+from services.model_optimizer import OptimizedNetwork, optimize_network
+from services.resource_governor import ResourceGovernor
+from services.usage_meter import UsageLedger
+
 
 @dataclass
 class InferenceMetadata:
@@ -21,6 +41,103 @@ class InferenceMetadata:
     fps: float = 0.0
     last_inference_ms: float = 0.0
     device: str = "cpu"
+    frame_age_ms: float = 0.0
+    dropped_frames: int = 0
+    full_inferences: int = 0
+    roi_inferences: int = 0
+    cascade_skipped: int = 0
+
+
+@dataclass(frozen=True)
+class FrameInfo:
+    """Identity and capture time of a frame as it travels through the pipeline."""
+
+    sequence: int
+    capture_ts: float
+
+    def age_ms(self, now: Optional[float] = None) -> float:
+        current = time.monotonic() if now is None else now
+        return max(0.0, (current - self.capture_ts) * 1000.0)
+
+
+@dataclass
+class VisionSnapshot:
+    """Annotated frame and the detections drawn on it, as published by the async API."""
+
+    frame: np.ndarray
+    detections: list[dict] = field(default_factory=list)
+    timestamp: float = 0.0
+    frame_info: Optional[FrameInfo] = None
+
+
+@dataclass
+class RefinedDetection:
+    """A streamed detection re-localised on a high-resolution frame.
+
+    Boxes and centres are float pixels in stream coordinates (the frames and
+    detections the service publishes); ``hires_*`` are the same box in the
+    high-resolution frame. ``refined`` is false when the crop inference did
+    not find the object again and the streamed box is returned unchanged.
+    """
+
+    label: str
+    conf: float
+    bbox_xyxy: tuple[float, float, float, float]
+    center_xy: tuple[float, float]
+    streamed_center_xy: tuple[float, float]
+    hires_bbox_xyxy: tuple[float, float, float, float]
+    hires_size: tuple[int, int]
+    refined: bool
+    switch_ms: float = 0.0
+    inference_ms: float = 0.0
+    restore_ms: float = 0.0
+    total_ms: float = 0.0
+
+    def describe(self) -> str:
+        dx = self.center_xy[0] - self.streamed_center_xy[0]
+        dy = self.center_xy[1] - self.streamed_center_xy[1]
+        status = "refined" if self.refined else "not found again"
+        return (
+            f"{self.label} {status} at ({self.center_xy[0]:.1f}, {self.center_xy[1]:.1f}), "
+            f"moved ({dx:+.1f}, {dy:+.1f}) px; switch {self.switch_ms:.0f} ms, "
+            f"inference {self.inference_ms:.0f} ms, restore {self.restore_ms:.0f} ms, total {self.total_ms:.0f} ms"
+        )
+
+
+@dataclass
+class _RefinementRequest:
+    label: Optional[str]
+    detection: Optional[dict]
+    future: Future
+    requested_at: float
+
+
+class FrameAgeTracker:
+    """Rolling window of frame ages used to report latency percentiles."""
+
+    def __init__(self, window: int = 300) -> None:
+        self._ages: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, age_ms: float) -> None:
+        with self._lock:
+            self._ages.append(age_ms)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ages.clear()
+
+    def percentiles(self, points: Iterable[int] = (50, 90, 99)) -> dict[str, float]:
+        with self._lock:
+            ages = list(self._ages)
+        points = tuple(points)
+        if not ages:
+            return {f"p{point}": 0.0 for point in points}
+        values = np.percentile(np.asarray(ages, dtype=np.float64), points)
+        return {f"p{point}": float(value) for point, value in zip(points, values)}
+
+
+_MAX_CONSECUTIVE_DROPS = 5
 
 
 def _resolve_device(device: Optional[str]) -> str:
@@ -31,25 +148,793 @@ def _resolve_device(device: Optional[str]) -> str:
     return "cuda" if torch.cuda.is_available() else "cpu"
 
 
+# Weights that load as a torch module; anything else (e.g. INT8 TorchScript builds) is run by
+# the ultralytics backend as exported and cannot be moved between devices.
+_PYTORCH_SUFFIXES = (".pt", ".pth")
+
+
+def _is_pytorch_weights(model_path: str) -> bool:
+    return Path(model_path).suffix.lower() in _PYTORCH_SUFFIXES
+
+
 def _load_model(model_path: str, device: str) -> YOLO:
+    if not _is_pytorch_weights(model_path):
+        return YOLO(model_path, task="detect")
     model = YOLO(model_path)
     model.to(device)
     return model
 
 
-def _warmup_model(model: YOLO, device: str) -> None:
-    """Run a quick warmup to stabilise inference time on the selected device."""
+@dataclass
+class WarmupReport:
+    """Outcome of the model warmup, reported once the service is ready."""
+
+    iterations: int = 0
+    total_ms: float = 0.0
+    first_ms: float = 0.0
+    steady_state_ms: float = 0.0
+    converged: bool = False
+
+    def describe(self) -> str:
+        state = "converged" if self.converged else "not converged"
+        return (
+            f"{self.iterations} iterations in {self.total_ms:.0f} ms "
+            f"(first {self.first_ms:.1f} ms, steady {self.steady_state_ms:.1f} ms, {state})"
+        )
+
+
+class ModelLoadCancelled(Exception):
+    """Raised when a background model load is superseded before it finishes."""
+
+
+def _inference_batch_size(args) -> int:
+    """Number of images handed to a single ``model.predict`` call."""
+
+    if getattr(args, "tiled", False):
+        regions = _compute_tiles(
+            int(args.frame_width),
+            int(args.frame_height),
+            int(getattr(args, "tile_size", 640)),
+            float(getattr(args, "tile_overlap", 0.2)),
+        )
+        return len(regions) + (1 if getattr(args, "tile_full_frame", True) else 0)
+    return 1
+
+
+def _tile_starts(length: int, tile: int, stride: int) -> list[int]:
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, stride))
+    starts.append(length - tile)
+    return starts
+
+
+def _compute_tiles(width: int, height: int, tile_size: int, overlap: float) -> list[tuple[int, int, int, int]]:
+    """Split a frame into overlapping ``(x1, y1, x2, y2)`` tiles that cover it fully."""
+
+    tile_size = max(32, int(tile_size))
+    overlap = min(max(float(overlap), 0.0), 0.9)
+    stride = max(1, int(tile_size * (1.0 - overlap)))
+    tiles: list[tuple[int, int, int, int]] = []
+    for y in _tile_starts(height, tile_size, stride):
+        for x in _tile_starts(width, tile_size, stride):
+            tiles.append((x, y, min(width, x + tile_size), min(height, y + tile_size)))
+    return tiles
+
+
+def _results_to_array(results) -> np.ndarray:
+    """Flatten ultralytics results into an ``(N, 6)`` array of ``x1, y1, x2, y2, conf, cls``."""
+
+    arrays = []
+    for result in results:
+        boxes = getattr(result, "boxes", None)
+        if boxes is None or len(boxes) == 0:
+            continue
+        data = boxes.data
+        arrays.append(data[:, :6].detach().cpu().numpy() if hasattr(data, "detach") else np.asarray(data)[:, :6])
+    if not arrays:
+        return np.zeros((0, 6), dtype=np.float32)
+    return np.concatenate(arrays, axis=0).astype(np.float32, copy=False)
+
+
+def _merge_detections(detections: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Class-aware NMS over detections gathered from overlapping regions."""
+
+    if len(detections) <= 1:
+        return detections
+    boxes = torch.from_numpy(np.ascontiguousarray(detections[:, :4]))
+    scores = torch.from_numpy(np.ascontiguousarray(detections[:, 4]))
+    classes = torch.from_numpy(detections[:, 5].astype(np.int64))
+    keep = batched_nms(boxes, scores, classes, iou_threshold).numpy()
+    return detections[keep]
+
+
+def _predict_regions(
+    model: YOLO,
+    frame: np.ndarray,
+    regions: list[tuple[int, int, int, int]],
+    *,
+    device: str,
+    conf: float,
+    iou_threshold: float,
+    include_full_frame: bool,
+    imgsz: Optional[int] = None,
+    detection_filter: Optional["DetectionFilter"] = None,
+    lean: Optional[LeanDetector] = None,
+) -> np.ndarray:
+    """Run one batched prediction over frame crops and map boxes back to frame pixels."""
+
+    crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in regions]
+    offsets = [(x1, y1) for x1, y1, _, _ in regions]
+    if include_full_frame:
+        crops.append(frame)
+        offsets.append((0, 0))
+
+    if lean is not None:
+        thresholds = detection_filter.thresholds if detection_filter is not None else None
+        per_crop = lean.detect(crops, conf, thresholds)
+    else:
+        classes = detection_filter.classes if detection_filter is not None else None
+        results = model.predict(crops, device=device, verbose=False, conf=conf, **_predict_options(imgsz, classes))
+        per_crop = [_results_to_array([result]) for result in results]
+    gathered = []
+    for detections, (x_offset, y_offset) in zip(per_crop, offsets):
+        if detection_filter is not None:
+            detections = detection_filter.apply(detections)
+        if len(detections) == 0:
+            continue
+        detections[:, [0, 2]] += x_offset
+        detections[:, [1, 3]] += y_offset
+        gathered.append(detections)
+    if not gathered:
+        return np.zeros((0, 6), dtype=np.float32)
+    return _merge_detections(np.concatenate(gathered, axis=0), iou_threshold)
+
+
+IMGSZ_CANDIDATES = (320, 416, 512, 640, 768, 960, 1280)
+_IMGSZ_STRIDE = 32
+_DATASETS_DIR = Path(__file__).resolve().parent.parent / "datasets"
+
+
+def normalise_imgsz(value) -> Union[int, str, None]:
+    """Parse an image size setting: ``None`` (model default), ``"auto"`` or a stride multiple."""
+
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if text in ("", "default", "none"):
+        return None
+    if text == "auto":
+        return "auto"
+    size = int(text)
+    if size <= 0:
+        raise ValueError("Image size must be a positive integer or 'auto'.")
+    return int(np.ceil(size / _IMGSZ_STRIDE) * _IMGSZ_STRIDE)
+
+
+# Crops around tracks never get smaller than this, so the model still sees some context.
+_ROI_MIN_SIZE = 160
+# Above this share of the frame, cropping saves nothing over a full-frame pass.
+_ROI_MAX_COVERAGE = 0.6
+
+NormalisedRect = tuple[float, float, float, float]
+
+
+def parse_rois(value) -> list[NormalisedRect]:
+    """Parse ROIs given as ``"x1,y1,x2,y2"`` fractions of the frame, ``;``-separated or as a list."""
+
+    if not value:
+        return []
+    chunks: list = []
+    for item in [value] if isinstance(value, str) else value:
+        if isinstance(item, str):
+            chunks.extend(chunk for chunk in item.split(";") if chunk.strip())
+        else:
+            chunks.append(item)
+
+    rois: list[NormalisedRect] = []
+    for chunk in chunks:
+        parts = chunk.split(",") if isinstance(chunk, str) else chunk
+        numbers = [float(part) for part in parts]
+        if len(numbers) != 4:
+            raise ValueError(f"Invalid ROI '{chunk}'; expected x1,y1,x2,y2 as fractions of the frame.")
+        x1, x2 = sorted(min(max(number, 0.0), 1.0) for number in numbers[0::2])
+        y1, y2 = sorted(min(max(number, 0.0), 1.0) for number in numbers[1::2])
+        if x2 - x1 <= 0 or y2 - y1 <= 0:
+            raise ValueError(f"ROI '{chunk}' has no area.")
+        rois.append((x1, y1, x2, y2))
+    return rois
+
+
+def format_rois(rois: Iterable[NormalisedRect]) -> str:
+    return ";".join(",".join(f"{value:.4f}" for value in roi) for roi in rois)
+
+
+def display_to_frame(x: float, y: float, zoom_factor: float) -> tuple[float, float]:
+    """Map a point given as fractions of the displayed (zoomed) frame back to the captured frame."""
+
+    zoom = zoom_factor if zoom_factor > 0 else 1.0
+    return 0.5 + (x - 0.5) / zoom, 0.5 + (y - 0.5) / zoom
+
+
+def _roi_pixels(rois: Iterable[NormalisedRect], width: int, height: int) -> list[tuple[int, int, int, int]]:
+    regions = []
+    for x1, y1, x2, y2 in rois:
+        left, top = int(x1 * width), int(y1 * height)
+        regions.append((left, top, max(left + 1, round(x2 * width)), max(top + 1, round(y2 * height))))
+    return regions
+
+
+def _track_regions(
+    detections: np.ndarray,
+    width: int,
+    height: int,
+    margin: float,
+) -> list[tuple[int, int, int, int]]:
+    """Crops around the previous detections, grown by ``margin`` of their size on each side."""
+
+    regions = []
+    for x1, y1, x2, y2 in detections[:, :4]:
+        pad = max(x2 - x1, y2 - y1) * margin
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        half_w = max((x2 - x1) / 2 + pad, _ROI_MIN_SIZE / 2)
+        half_h = max((y2 - y1) / 2 + pad, _ROI_MIN_SIZE / 2)
+        regions.append(
+            (
+                int(max(0, cx - half_w)),
+                int(max(0, cy - half_h)),
+                int(min(width, cx + half_w)),
+                int(min(height, cy + half_h)),
+            )
+        )
+    return regions
+
+
+def _merge_regions(regions: list[tuple[int, int, int, int]]) -> list[tuple[int, int, int, int]]:
+    """Replace overlapping regions by their bounding box until none overlap."""
+
+    merged = list(regions)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    merged[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def _inside_regions(detections: np.ndarray, regions: list[tuple[int, int, int, int]]) -> np.ndarray:
+    """Keep detections whose centre falls inside any of ``regions``."""
+
+    if len(detections) == 0 or not regions:
+        return detections
+    cx = (detections[:, 0] + detections[:, 2]) / 2
+    cy = (detections[:, 1] + detections[:, 3]) / 2
+    keep = np.zeros(len(detections), dtype=bool)
+    for x1, y1, x2, y2 in regions:
+        keep |= (cx >= x1) & (cx < x2) & (cy >= y1) & (cy < y2)
+    return detections[keep]
+
+
+def _predict_options(imgsz: Optional[int], classes: Optional[list[int]] = None) -> dict:
+    options: dict = {"imgsz": imgsz} if imgsz else {}
+    if classes is not None:
+        options["classes"] = classes
+    return options
+
+
+def _sample_benchmark_images(frame_shape: tuple[int, int], limit: int = 3) -> list[np.ndarray]:
+    """Return a few validation images from the bundled dataset, resized to the frame shape.
+
+    Falls back to a noise frame when no dataset is available.
+    """
+
+    height, width = frame_shape
+    images: list[np.ndarray] = []
+    for path in sorted(_DATASETS_DIR.glob("*/valid/images/*.jpg"))[:limit]:
+        image = cv2.imread(str(path))
+        if image is not None:
+            images.append(cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR))
+    if not images:
+        rng = np.random.default_rng(0)
+        images.append(rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+    return images
+
 
-    model_args = getattr(model.model, "args", {})
-    imgsz = 640
-    if isinstance(model_args, dict):
-        imgsz = int(model_args.get("imgsz", imgsz))
+def _select_imgsz(
+    model: YOLO,
+    device: str,
+    frame_shape: tuple[int, int],
+    target_latency_ms: float,
+    *,
+    candidates: Iterable[int] = IMGSZ_CANDIDATES,
+    samples: Optional[list[np.ndarray]] = None,
+    logger: Optional[logging.Logger] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> int:
+    """Pick the largest inference size whose median latency meets the target.
 
-    dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
-    _ = model.predict(dummy, device=device, verbose=False)
+    Sizes above the frame's long side are skipped since upscaling adds cost
+    without detail. When no candidate meets the target the smallest is used.
+    """
 
+    long_side = max(frame_shape)
+    sizes = sorted({size for size in candidates if size <= max(long_side, min(candidates))})
+    samples = samples or _sample_benchmark_images(frame_shape)
+    measured: dict[int, float] = {}
+    with torch.inference_mode():
+        for size in sizes:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ModelLoadCancelled("Image size selection cancelled.")
+            # First call at a new size pays for allocations; keep it out of the median.
+            model.predict(samples[0], device=device, verbose=False, imgsz=size)
+            latencies = []
+            for sample in samples:
+                start = time.perf_counter()
+                model.predict(sample, device=device, verbose=False, imgsz=size)
+                latencies.append((time.perf_counter() - start) * 1000)
+            measured[size] = float(np.median(latencies))
+            if logger is not None:
+                logger.info("imgsz %d: %.1f ms", size, measured[size])
+            if measured[size] > target_latency_ms:
+                # Larger sizes will only be slower.
+                break
 
-def _configure_camera(args) -> cv2.VideoCapture:
+    meeting = [size for size, latency in measured.items() if latency <= target_latency_ms]
+    return max(meeting) if meeting else min(measured)
+
+
+def _warmup_model(
+    model: YOLO,
+    device: str,
+    frame_shape: Optional[tuple[int, int]] = None,
+    batch_size: int = 1,
+    *,
+    max_iterations: int = 10,
+    tolerance: float = 0.1,
+    stable_runs: int = 3,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    imgsz: Optional[int] = None,
+    lean: Optional[LeanDetector] = None,
+) -> WarmupReport:
+    """Run predictions shaped like real frames until the latency stops moving.
+
+    The input matches the capture resolution and batch size so letterboxing,
+    allocator growth and lazily initialised kernels all happen here rather
+    than on the first real frames. Warmup stops once the last ``stable_runs``
+    latencies are within ``tolerance`` of their median, or after
+    ``max_iterations``. Setting ``cancel_event`` aborts between iterations
+    with :class:`ModelLoadCancelled`. With ``lean`` the lean detector is
+    warmed instead of ``model.predict``.
+    """
+
+    if frame_shape is None or min(frame_shape) <= 0:
+        # Without a frame shape, warm on a square of the requested or trained input size.
+        side = imgsz
+        if side is None:
+            model_args = getattr(model.model, "args", {})
+            side = int(model_args.get("imgsz", 640)) if isinstance(model_args, dict) else 640
+        frame_shape = (side, side)
+
+    height, width = frame_shape
+    rng = np.random.default_rng(0)
+    # Noise rather than zeros so that post-processing sees candidate boxes too.
+    dummy = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    batch = [dummy] * max(1, batch_size)
+    source = batch if len(batch) > 1 else dummy
+
+    report = WarmupReport()
+    latencies: list[float] = []
+    warmup_start = time.perf_counter()
+    with torch.inference_mode():
+        total_iterations = max(1, max_iterations)
+        for iteration in range(total_iterations):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ModelLoadCancelled("Model warmup cancelled.")
+            if progress is not None:
+                progress(iteration + 1, total_iterations)
+            start = time.perf_counter()
+            if lean is not None:
+                _ = lean.detect(batch, 0.25)
+            else:
+                _ = model.predict(source, device=device, verbose=False, **_predict_options(imgsz))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if len(latencies) > stable_runs:
+                recent = np.asarray(latencies[-stable_runs:])
+                median = float(np.median(recent))
+                if median > 0 and float(np.max(np.abs(recent - median))) <= tolerance * median:
+                    report.converged = True
+                    break
+
+    report.iterations = len(latencies)
+    report.total_ms = (time.perf_counter() - warmup_start) * 1000
+    report.first_ms = latencies[0]
+    report.steady_state_ms = float(np.median(latencies[-stable_runs:]))
+    return report
+
+
+@dataclass
+class LoadedModel:
+    """YOLO model loaded on a device and warmed for a frame shape."""
+
+    model: YOLO
+    model_path: str
+    device: str
+    frame_shape: tuple[int, int]
+    warmup_report: WarmupReport
+    imgsz_setting: Union[int, str, None] = None
+    imgsz: Optional[int] = None
+    target_latency_ms: Optional[float] = None
+    optimize_setting: str = "none"
+    channels_last: bool = False
+    optimized: Optional[OptimizedNetwork] = None
+    _lean: Optional[LeanDetector] = field(default=None, repr=False)
+
+    @property
+    def names(self):
+        return self.model.names
+
+    def lean_detector(self) -> LeanDetector:
+        """Lean detector bound to this model and its optimised network, created on first use."""
+
+        if self._lean is None or self._lean.optimized is not self.optimized:
+            self._lean = LeanDetector(
+                self.model,
+                self.device,
+                self.imgsz,
+                optimized=self.optimized,
+                channels_last=self.channels_last,
+            )
+        return self._lean
+
+    def labels(self) -> list[str]:
+        return _normalise_label_names(self.model.names)
+
+    def matches(self, args) -> bool:
+        """Whether the model can serve ``args`` without being reloaded."""
+
+        try:
+            device = _resolve_device(args.device)
+        except RuntimeError:
+            return False
+        return (
+            self.model_path == args.model_path
+            and self.device == device
+            and self.imgsz_setting == normalise_imgsz(getattr(args, "imgsz", None))
+            and self.optimize_setting == _optimize_setting(args)
+            and self.channels_last == bool(getattr(args, "channels_last", False))
+            and (
+                self.imgsz_setting != "auto"
+                or self.target_latency_ms == float(getattr(args, "target_latency_ms", 50.0))
+            )
+        )
+
+
+def _optimize_setting(args) -> str:
+    return str(getattr(args, "optimize", None) or "none").lower()
+
+
+def _uses_lean_path(args) -> bool:
+    """The optimised network is only reachable through the lean detector."""
+
+    return bool(getattr(args, "lean_inference", False)) or _optimize_setting(args) != "none"
+
+
+def _apply_channels_last(loaded: LoadedModel) -> None:
+    """Convert the eager network, independently of ``--optimize``; inputs follow in the lean path."""
+
+    if not loaded.channels_last:
+        return
+    if not _is_pytorch_weights(loaded.model_path):
+        logging.getLogger(__name__).warning(
+            "%s is an exported model; ignoring --channels-last.", loaded.model_path
+        )
+        return
+    loaded.model.model.to(memory_format=torch.channels_last)
+
+
+def _prepare_optimized(loaded: LoadedModel, frame_shape: tuple[int, int]) -> None:
+    """Build or load the optimised network for the single-frame input shape of ``frame_shape``."""
+
+    if loaded.optimize_setting == "none":
+        return
+    if not _is_pytorch_weights(loaded.model_path):
+        logging.getLogger(__name__).info("%s is already an exported model; skipping optimisation.", loaded.model_path)
+        return
+    imgsz = loaded.imgsz or model_imgsz(loaded.model)
+    height, width = lean_input_shape(frame_shape, imgsz, network_stride(loaded.model))
+    input_shape = (1, 3, height, width)
+    if loaded.optimized is not None and loaded.optimized.input_shape == input_shape:
+        return
+    loaded.optimized = optimize_network(
+        loaded.model.model,
+        loaded.model_path,
+        loaded.device,
+        input_shape,
+        mode=loaded.optimize_setting,
+        channels_last=loaded.channels_last,
+    )
+
+
+def load_model(
+    args,
+    *,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+) -> LoadedModel:
+    """Load and warm the model described by ``args``.
+
+    ``progress`` receives a stage name and a completion fraction; it is called
+    from the loading thread.
+    """
+
+    def _report(stage: str, fraction: float) -> None:
+        if progress is not None:
+            progress(stage, fraction)
+
+    def _check_cancelled() -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise ModelLoadCancelled(f"Loading {args.model_path} was cancelled.")
+
+    device = _resolve_device(args.device)
+    # Thread counts must be in place before the first torch operation of the process.
+    ResourceGovernor.from_args(args).apply_process()
+    _report("loading", 0.0)
+    model = _load_model(args.model_path, device)
+    _check_cancelled()
+    imgsz_setting = normalise_imgsz(getattr(args, "imgsz", None))
+    loaded = LoadedModel(
+        model=model,
+        model_path=args.model_path,
+        device=device,
+        frame_shape=(0, 0),
+        warmup_report=WarmupReport(),
+        imgsz_setting=imgsz_setting,
+        imgsz=imgsz_setting if isinstance(imgsz_setting, int) else None,
+        optimize_setting=_optimize_setting(args),
+        channels_last=bool(getattr(args, "channels_last", False)),
+    )
+    _apply_channels_last(loaded)
+    _report("loaded", 0.2)
+    if imgsz_setting is not None and not _is_pytorch_weights(args.model_path):
+        # Exported models are built for one input size, recorded in their metadata.
+        logging.getLogger(__name__).warning(
+            "%s has a fixed input size; ignoring imgsz=%s.", args.model_path, imgsz_setting
+        )
+        loaded.imgsz = None
+    elif imgsz_setting == "auto":
+        _report("selecting image size", 0.2)
+        target_ms = float(getattr(args, "target_latency_ms", 50.0))
+        loaded.target_latency_ms = target_ms
+        loaded.imgsz = _select_imgsz(
+            model,
+            device,
+            (int(args.frame_height), int(args.frame_width)),
+            target_ms,
+            logger=logging.getLogger(__name__),
+            cancel_event=cancel_event,
+        )
+        logging.getLogger(__name__).info(
+            "Selected imgsz %d for a %.0f ms latency target.", loaded.imgsz, target_ms
+        )
+    warm_model(loaded, args, cancel_event=cancel_event, progress=progress)
+    _report("ready", 1.0)
+    return loaded
+
+
+def warm_model(
+    loaded: LoadedModel,
+    args,
+    *,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[str, float], None]] = None,
+) -> WarmupReport:
+    """Warm ``loaded`` for the frame shape in ``args`` and record the report."""
+
+    frame_shape = (int(args.frame_height), int(args.frame_width))
+    if loaded.optimize_setting != "none":
+        if progress is not None:
+            progress("optimising", 0.2)
+        _prepare_optimized(loaded, frame_shape)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ModelLoadCancelled(f"Loading {loaded.model_path} was cancelled.")
+
+    def _on_iteration(iteration: int, total: int) -> None:
+        if progress is not None:
+            progress(f"warming {iteration}/{total}", 0.2 + 0.8 * (iteration - 1) / total)
+
+    def _warm(lean: Optional[LeanDetector]) -> WarmupReport:
+        return _warmup_model(
+            loaded.model,
+            loaded.device,
+            frame_shape,
+            _inference_batch_size(args),
+            max_iterations=int(getattr(args, "warmup_iterations", 10)),
+            cancel_event=cancel_event,
+            progress=_on_iteration,
+            imgsz=loaded.imgsz,
+            lean=lean,
+        )
+
+    try:
+        loaded.warmup_report = _warm(loaded.lean_detector() if _uses_lean_path(args) else None)
+    except LeanInferenceUnsupported:
+        # The service falls back to model.predict on the first frame; warm that path instead.
+        loaded.warmup_report = _warm(None)
+    loaded.frame_shape = frame_shape
+    return loaded.warmup_report
+
+
+@dataclass
+class CaptureMode:
+    """Capture mode negotiated with the camera backend."""
+
+    fourcc: str = ""
+    width: int = 0
+    height: int = 0
+    requested_fps: float = 0.0
+    reported_fps: float = 0.0
+    measured_fps: float = 0.0
+    buffer_size: int = 0
+    latency_ms: Optional[float] = None
+
+    def describe(self) -> str:
+        latency = f"{self.latency_ms:.1f} ms" if self.latency_ms is not None else "n/a"
+        return (
+            f"{self.fourcc or '????'} {self.width}x{self.height} "
+            f"@ {self.measured_fps:.1f}/{self.requested_fps:.0f} FPS "
+            f"(buffer={self.buffer_size}, glass-to-frame={latency})"
+        )
+
+
+_CAPTURE_FOURCC_CANDIDATES = ("MJPG", "YUYV")
+_CAPTURE_PROBE_FRAMES = 8
+_CAPTURE_PROBE_WARMUP_FRAMES = 2
+_CAPTURE_PROBE_MAX_SECONDS = 1.5
+
+
+def _decode_fourcc(value: float) -> str:
+    code = int(value or 0)
+    if code <= 0:
+        return ""
+    return "".join(chr((code >> (8 * shift)) & 0xFF) for shift in range(4)).strip("\x00 ")
+
+
+def _frame_latency_ms(cap: cv2.VideoCapture) -> Optional[float]:
+    """Estimate glass-to-frame latency from the driver buffer timestamp.
+
+    The V4L2 backend reports the kernel buffer timestamp (CLOCK_MONOTONIC) as
+    ``CAP_PROP_POS_MSEC``, which is the same clock as :func:`time.monotonic` on
+    Linux. Other backends report a stream position instead, which is filtered
+    out by the sanity bounds.
+    """
+
+    position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+    if not position_ms or position_ms <= 0:
+        return None
+    latency = time.monotonic() * 1000.0 - position_ms
+    if 0.0 <= latency < 2000.0:
+        return latency
+    return None
+
+
+def _capture_timestamp(cap: cv2.VideoCapture) -> float:
+    """Return the monotonic capture time of the last read frame.
+
+    Uses the driver timestamp when the backend provides one, otherwise the
+    moment the read returned, which is the best the application can observe.
+    """
+
+    now = time.monotonic()
+    latency_ms = _frame_latency_ms(cap)
+    if latency_ms is None:
+        return now
+    return now - latency_ms / 1000.0
+
+
+def _apply_capture_mode(cap: cv2.VideoCapture, fourcc: str, width: int, height: int, fps: float) -> None:
+    # V4L2 only honours the pixel format when it is set before the frame size.
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+def _measure_capture_mode(cap: cv2.VideoCapture, requested_fps: float) -> CaptureMode:
+    mode = CaptureMode(
+        fourcc=_decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+        width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+        height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+        requested_fps=requested_fps,
+        reported_fps=float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+        buffer_size=int(cap.get(cv2.CAP_PROP_BUFFERSIZE) or 0),
+    )
+
+    for _ in range(_CAPTURE_PROBE_WARMUP_FRAMES):
+        if not cap.grab():
+            return mode
+
+    latencies: list[float] = []
+    frames = 0
+    start = time.perf_counter()
+    deadline = start + _CAPTURE_PROBE_MAX_SECONDS
+    while frames < _CAPTURE_PROBE_FRAMES and time.perf_counter() < deadline:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames += 1
+        latency = _frame_latency_ms(cap)
+        if latency is not None:
+            latencies.append(latency)
+        if frame is not None:
+            mode.height, mode.width = frame.shape[:2]
+
+    elapsed = time.perf_counter() - start
+    if frames > 1 and elapsed > 0:
+        mode.measured_fps = frames / elapsed
+    if latencies:
+        mode.latency_ms = float(np.median(latencies))
+    return mode
+
+
+def _capture_mode_score(mode: CaptureMode, width: int, height: int) -> tuple:
+    matches_size = mode.width == width and mode.height == height
+    latency = mode.latency_ms if mode.latency_ms is not None else float("inf")
+    return (matches_size, round(mode.measured_fps), -latency, mode.fourcc == "MJPG")
+
+
+def _negotiate_capture_mode(cap: cv2.VideoCapture, args, logger: logging.Logger) -> CaptureMode:
+    """Probe fourcc/fps combinations and keep the fastest one at the requested size.
+
+    MJPG at the requested size is tried first; when it reaches the requested
+    frame rate the probe stops there unless ``capture_probe_all`` asks for a
+    full report of every candidate.
+    """
+
+    requested = str(getattr(args, "capture_fourcc", "auto") or "auto").upper()
+    width = int(args.frame_width)
+    height = int(args.frame_height)
+    target_fps = float(args.target_fps)
+
+    if requested == "NONE":
+        _apply_capture_mode(cap, "", width, height, target_fps)
+        return _measure_capture_mode(cap, target_fps)
+
+    fourccs = _CAPTURE_FOURCC_CANDIDATES if requested == "AUTO" else (requested,)
+    fps_candidates = [target_fps]
+    if target_fps > 30.0:
+        fps_candidates.append(30.0)
+    probe_all = bool(getattr(args, "capture_probe_all", False))
+
+    tested: list[tuple[str, float, CaptureMode]] = []
+    for fourcc, fps in [(fourcc, fps) for fourcc in fourccs for fps in fps_candidates]:
+        _apply_capture_mode(cap, fourcc, width, height, fps)
+        mode = _measure_capture_mode(cap, fps)
+        tested.append((fourcc, fps, mode))
+        logger.info("Capture probe %s -> %s", fourcc, mode.describe())
+        reached_target = mode.measured_fps >= 0.9 * fps
+        if not probe_all and reached_target and mode.width == width and mode.height == height:
+            break
+
+    fourcc, fps, best = max(tested, key=lambda item: _capture_mode_score(item[2], width, height))
+    if (fourcc, fps) != tested[-1][:2]:
+        _apply_capture_mode(cap, fourcc, width, height, fps)
+        best = _measure_capture_mode(cap, fps)
+    logger.info("Selected capture mode: %s", best.describe())
+    return best
+
+
+def _open_camera(args) -> cv2.VideoCapture:
     cap = cv2.VideoCapture(args.camera_index)
     if not cap.isOpened():
         cap = cv2.VideoCapture(args.camera_index, cv2.CAP_V4L2)
@@ -57,13 +942,31 @@ def _configure_camera(args) -> cv2.VideoCapture:
         raise RuntimeError(
             f"Unable to open camera index {args.camera_index}. Verify that the device exists."
         )
-
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, args.frame_width)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, args.frame_height)
-    cap.set(cv2.CAP_PROP_FPS, args.target_fps)
     return cap
 
 
+def _capture_key(args) -> tuple:
+    """Camera settings that require re-opening or re-negotiating the capture."""
+
+    return (
+        args.camera_index,
+        int(args.frame_width),
+        int(args.frame_height),
+        float(args.target_fps),
+        str(getattr(args, "capture_fourcc", "auto")),
+    )
+
+
+def _configure_camera(args, logger: logging.Logger) -> tuple[cv2.VideoCapture, CaptureMode]:
+    cap = _open_camera(args)
+    try:
+        mode = _negotiate_capture_mode(cap, args, logger)
+    except Exception:
+        cap.release()
+        raise
+    return cap, mode
+
+
 def _apply_digital_zoom(frame: np.ndarray, zoom_factor: float) -> np.ndarray:
     if np.isclose(zoom_factor, 1.0):
         return frame
@@ -101,89 +1004,317 @@ def _normalise_label_names(names) -> list[str]:
         return [str(names)]
 
 
+# Boxes below this confidence are not drawn unless a per-class threshold says otherwise.
+_DRAW_CONFIDENCE_FLOOR = 0.75
+
+
+def parse_class_conf(value) -> dict[str, float]:
+    """Parse ``"soap=0.5,coke=0.8"`` (or a mapping) into lower-cased label thresholds."""
+
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        items = value.items()
+    else:
+        items = []
+        for part in str(value).split(","):
+            if not part.strip():
+                continue
+            label, separator, threshold = part.partition("=")
+            if not separator:
+                raise ValueError(f"Invalid class confidence '{part.strip()}'; expected label=value.")
+            items.append((label, threshold))
+    thresholds: dict[str, float] = {}
+    for label, threshold in items:
+        number = float(threshold)
+        if not 0.0 <= number <= 1.0:
+            raise ValueError(f"Confidence for '{label.strip()}' must be between 0 and 1.")
+        thresholds[str(label).strip().lower()] = number
+    return thresholds
+
+
+@dataclass(frozen=True)
+class DetectionFilter:
+    """Class selection and per-class confidence thresholds applied during prediction.
+
+    ``classes`` is handed to the predictor so NMS never sees unselected
+    classes, ``predict_conf`` is the lowest threshold in use (the predictor's
+    own pre-NMS cut) and :meth:`apply` enforces each class's threshold on the
+    NMS output.
+    """
+
+    classes: Optional[list[int]]
+    predict_conf: float
+    thresholds: np.ndarray
+
+    def apply(self, detections: np.ndarray) -> np.ndarray:
+        if len(detections) == 0:
+            return detections
+        cls = detections[:, 5].astype(np.int64)
+        known = (cls >= 0) & (cls < len(self.thresholds))
+        keep = known & (detections[:, 4] >= self.thresholds[np.clip(cls, 0, len(self.thresholds) - 1)])
+        return detections[keep]
+
+
+def build_detection_filter(
+    names,
+    selected_labels: Optional[Iterable[str]],
+    confidence_threshold: float,
+    class_conf: Optional[dict[str, float]] = None,
+) -> DetectionFilter:
+    """Translate label names into class indices and a per-class threshold table."""
+
+    labels = names if isinstance(names, dict) else dict(enumerate(_normalise_label_names(names)))
+    size = max(labels, default=-1) + 1
+    default = max(float(confidence_threshold), _DRAW_CONFIDENCE_FLOOR)
+    overrides = class_conf or {}
+    selected = {label.lower() for label in selected_labels if label} if selected_labels else None
+
+    # Unselected classes keep an impossible threshold in case a predictor ignores ``classes``.
+    thresholds = np.full(size, np.inf, dtype=np.float32)
+    classes: list[int] = []
+    for index, label in labels.items():
+        key = str(label).lower()
+        if selected is not None and key not in selected:
+            continue
+        thresholds[index] = overrides.get(key, default)
+        classes.append(index)
+
+    active = thresholds[np.isfinite(thresholds)]
+    return DetectionFilter(
+        classes=sorted(classes) if selected is not None else None,
+        predict_conf=float(active.min()) if len(active) else default,
+        thresholds=thresholds,
+    )
+
+
 def _draw_bounding_boxes(
     frame: np.ndarray,
-    detections: Iterable,
+    detections: np.ndarray,
     names: dict[int, str],
-    confidence_threshold: float,
-    selected_labels: Optional[Iterable[str]] = None,
 ) -> tuple[np.ndarray, list[dict]]:
-    """Draw only boxes with conf >= max(confidence_threshold, 0.75) and return their coordinates."""
+    """Draw already filtered boxes and return their coordinates.
+
+    ``detections`` is an ``(N, 6)`` array of ``x1, y1, x2, y2, conf, cls`` in frame pixels.
+    """
 
     drawn: list[dict] = []
-    min_conf = max(confidence_threshold, 0.75)
-    allowed = None
-    if selected_labels:
-        allowed = {label.lower() for label in selected_labels if label}
-
-    for detection in detections:
-        boxes = getattr(detection, "boxes", None)
-        if boxes is None:
-            continue
+    for row in detections:
+        conf = float(row[4])
+        x1, y1, x2, y2 = map(int, row[:4])
+        cx = (x1 + x2) // 2
+        cy = (y1 + y2) // 2
+        cls = int(row[5])
+        label = names.get(cls, str(cls))
 
-        for box in boxes:
-            conf = float(box.conf[0])
-            if conf < min_conf:
-                continue
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cvzone.putTextRect(
+            frame,
+            f"{label} {conf:.2f}",
+            (x1, max(0, y1 - 10)),
+            scale=1,
+            thickness=1,
+            offset=5,
+        )
+        cv2.circle(frame, (cx, cy), 4, (0, 0, 255), -1)
+        cvzone.putTextRect(
+            frame,
+            f"({cx}, {cy})",
+            (cx + 8, cy - 8),
+            scale=0.8,
+            thickness=1,
+            offset=4,
+        )
 
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            cx = (x1 + x2) // 2
-            cy = (y1 + y2) // 2
-            cls = int(box.cls[0])
-            label = names.get(cls, str(cls))
-            if allowed is not None and label.lower() not in allowed:
-                continue
+        drawn.append(
+            {
+                "label": label,
+                "conf": conf,
+                "bbox_xyxy": (x1, y1, x2, y2),
+                "center_xy": (cx, cy),
+            }
+        )
+    return frame, drawn
 
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            cvzone.putTextRect(
-                frame,
-                f"{label} {conf:.2f}",
-                (x1, max(0, y1 - 10)),
-                scale=1,
-                thickness=1,
-                offset=5,
-            )
-            cv2.circle(frame, (cx, cy), 4, (0, 0, 255), -1)
-            cvzone.putTextRect(
-                frame,
-                f"({cx}, {cy})",
-                (cx + 8, cy - 8),
-                scale=0.8,
-                thickness=1,
-                offset=4,
-            )
 
-            drawn.append(
-                {
-                    "label": label,
-                    "conf": conf,
-                    "bbox_xyxy": (x1, y1, x2, y2),
-                    "center_xy": (cx, cy),
-                }
-            )
-    return frame, drawn
+def _draw_rois(frame: np.ndarray, regions: Iterable[tuple[int, int, int, int]]) -> np.ndarray:
+    for x1, y1, x2, y2 in regions:
+        cv2.rectangle(frame, (x1, y1), (x2 - 1, y2 - 1), (255, 128, 0), 1)
+    return frame
+
+
+_REFINE_MARGIN = 0.5
+_REFINE_MIN_IOU = 0.3
+_REFINE_MAX_FRAMES = 15
+
+
+def _best_match(detections: np.ndarray, box: np.ndarray, cls: int) -> Optional[np.ndarray]:
+    """The detection of class ``cls`` overlapping ``box`` the most, if it overlaps enough."""
+
+    candidates = detections[detections[:, 5] == cls] if len(detections) else detections
+    if len(candidates) == 0:
+        return None
+    top_left = np.maximum(candidates[:, :2], box[:2])
+    bottom_right = np.minimum(candidates[:, 2:4], box[2:4])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=1)
+    areas = (candidates[:, 2] - candidates[:, 0]) * (candidates[:, 3] - candidates[:, 1])
+    union = areas + (box[2] - box[0]) * (box[3] - box[1]) - intersection
+    ious = intersection / np.maximum(union, 1e-9)
+    best = int(np.argmax(ious))
+    return candidates[best] if ious[best] >= _REFINE_MIN_IOU else None
+
+
+def _scale_detections(detections: np.ndarray, scale_x: float, scale_y: float) -> np.ndarray:
+    if len(detections) == 0 or (scale_x == 1.0 and scale_y == 1.0):
+        return detections
+    scaled = detections.copy()
+    scaled[:, [0, 2]] *= scale_x
+    scaled[:, [1, 3]] *= scale_y
+    return scaled
 
 
 def _annotate_metadata(frame: np.ndarray, metadata: InferenceMetadata) -> np.ndarray:
     text = (
-        f"FPS: {metadata.fps:.1f} | Inference: {metadata.last_inference_ms:.1f} ms | Device: {metadata.device}"
+        f"FPS: {metadata.fps:.1f} | Inference: {metadata.last_inference_ms:.1f} ms | "
+        f"Age: {metadata.frame_age_ms:.0f} ms | Device: {metadata.device}"
     )
     cvzone.putTextRect(frame, text, (10, 30), scale=1, thickness=1, offset=5)
     return frame
 
 
+class _FrameGrabber:
+    """Read frames on a dedicated (pinnable) thread and hand over only the newest one.
+
+    Used when the capture role has its own CPUs, so decoding and driver waits
+    do not run on the inference cores. Frames replaced before the consumer
+    took them are counted in ``skipped``.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, governor: ResourceGovernor) -> None:
+        self._cap = cap
+        self._governor = governor
+        self._condition = threading.Condition()
+        self._latest: tuple[bool, Optional[np.ndarray], float] | None = None
+        self._stop = threading.Event()
+        self._reconfigure: Optional[Callable[[], None]] = None
+        self.skipped = 0
+        self._thread = threading.Thread(target=self._loop, name="VisionCapture", daemon=True)
+
+    def start(self) -> "_FrameGrabber":
+        self._thread.start()
+        return self
+
+    def _loop(self) -> None:
+        self._governor.pin_current_thread("capture")
+        while not self._stop.is_set():
+            with self._condition:
+                configure, self._reconfigure = self._reconfigure, None
+            if configure is not None:
+                configure()
+            ret, frame = self._cap.read()
+            entry = (ret, frame, _capture_timestamp(self._cap))
+            with self._condition:
+                if self._latest is not None:
+                    self.skipped += 1
+                self._latest = entry
+                self._condition.notify()
+            if not ret:
+                break
+
+    def read(self, poll_s: float = 2.0) -> tuple[bool, Optional[np.ndarray], float]:
+        """Next frame; fails only when the camera did (``ret=False``) or the grabber has exited.
+
+        A slow or briefly stalled camera is waited out, as a direct
+        ``cap.read()`` would be; ``poll_s`` only bounds each wait so a dead
+        grabber thread is noticed.
+        """
+
+        with self._condition:
+            while self._latest is None:
+                if not self._thread.is_alive():
+                    return False, None, time.monotonic()
+                self._condition.wait(poll_s)
+            entry, self._latest = self._latest, None
+        return entry
+
+    def reconfigure(self, configure: Callable[[], None]) -> None:
+        """Run ``configure`` on the capture thread before its next read."""
+
+        with self._condition:
+            self._reconfigure = configure
+
+    def stop(self) -> None:
+        """Stop the thread and wait until it has exited, however long its last read takes.
+
+        The capture is parked or released right after; it must never be touched
+        from two threads, so there is no timeout here.
+        """
+
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        if self._thread.is_alive():
+            logging.getLogger(__name__).warning("Capture thread is still in read(); waiting before releasing the camera.")
+            self._thread.join()
+
+
 class VisionService:
     """Service that encapsulates YOLO-based inference and rendering logic."""
 
-    def __init__(self, args) -> None:
+    def __init__(self, args, loaded_model: Optional[LoadedModel] = None) -> None:
         self.args = args
         self.device = _resolve_device(args.device)
-        self.model = _load_model(args.model_path, self.device)
-        _warmup_model(self.model, self.device)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Fail before the model load rather than on the first frame.
+        parse_class_conf(getattr(args, "class_conf", None))
+        self.governor = ResourceGovernor.from_args(args)
+        if loaded_model is None or not loaded_model.matches(args):
+            loaded_model = load_model(args)
+        # A model warmed for another frame shape is re-warmed by run(), on the streaming thread.
+        self.loaded_model = loaded_model
+        self.model = loaded_model.model
+        self.warmup_report = loaded_model.warmup_report
+        self.logger.info("Model warmup: %s", self.warmup_report.describe())
         self.names = self.model.names
         self._selected_labels: set[str] | None = None
+        self._rois = parse_rois(getattr(args, "roi", None))
+        self._track_detections = np.zeros((0, 6), dtype=np.float32)
+        self._inferences_since_full = 0
+        self._cascade: CascadeGate | None = build_cascade_gate(args)
+        self._idle_policy = IdlePolicy.from_args(args)
+        self._idle: IdleController | None = None
+        self.usage: UsageLedger | None = None
+        self._lean_unsupported = False
+        self._filter_key: tuple | None = None
+        self._filter: DetectionFilter | None = None
         self._last_detections: list[dict] = []
-        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._swap_lock = threading.Lock()
+        self._pending_swap: tuple[LoadedModel, Optional[list[str]]] | None = None
+        self._refinements: queue.SimpleQueue[_RefinementRequest] = queue.SimpleQueue()
+        # Orders request_refinement against the end of run(), so no request is queued unanswered.
+        self._refinement_lock = threading.Lock()
+        self._applied_capture_size: tuple[int, int] | None = None
+        self.last_refinement: RefinedDetection | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._snapshots: asyncio.Queue[VisionSnapshot | None] | None = None
+        self._async_stop: threading.Event | None = None
+        self._async_executor: ThreadPoolExecutor | None = None
+        self._run_future: asyncio.Future | None = None
+        self.capture_mode: CaptureMode | None = None
+        self._capture: cv2.VideoCapture | None = None
+        self._capture_key: tuple | None = None
+        self._resource_lock = threading.Lock()
+        self._idle_timer: threading.Timer | None = None
+        self.on_idle_release: Optional[Callable[[], None]] = None
+        self._run_active = False
+        self.metadata = InferenceMetadata(device=self.device)
+        self.frame_ages = FrameAgeTracker()
+        self.display_ages = FrameAgeTracker()
+
+    @classmethod
+    async def create(cls, args, loaded_model: Optional[LoadedModel] = None) -> "VisionService":
+        """Build the service without blocking the event loop on model load and warmup."""
+
+        return await asyncio.to_thread(cls, args, loaded_model)
 
     def get_model_labels(self) -> list[str]:
         """Return the human readable class labels available in the loaded model."""
@@ -194,9 +1325,61 @@ class VisionService:
     def discover_model_labels(model_path: str) -> list[str]:
         """Load a YOLO model and return the labels it exposes."""
 
-        model = YOLO(model_path)
+        model = YOLO(model_path) if _is_pytorch_weights(model_path) else YOLO(model_path, task="detect")
         return _normalise_label_names(getattr(model, "names", {}))
 
+    def swap_model(self, loaded_model: LoadedModel, labels: Optional[Iterable[str]] = None) -> None:
+        """Switch to an already loaded and warmed model at the next frame boundary.
+
+        The streaming loop keeps running; the swap itself is a reference change
+        applied between two frames. ``labels`` is the selection to apply to the
+        new model; when omitted, the current selection is kept for the labels
+        the new model also knows.
+        """
+
+        with self._swap_lock:
+            self._pending_swap = (loaded_model, list(labels) if labels is not None else None)
+        if not self.is_streaming and not self._run_active:
+            self._apply_pending_swap()
+
+    def _apply_pending_swap(self) -> bool:
+        with self._swap_lock:
+            pending = self._pending_swap
+            self._pending_swap = None
+        if pending is None:
+            return False
+
+        loaded_model, labels = pending
+        previous = self.loaded_model.model_path
+        if labels is None and self._selected_labels is not None:
+            labels = list(self._selected_labels)
+
+        self.loaded_model = loaded_model
+        self.model = loaded_model.model
+        self.names = loaded_model.names
+        self.device = loaded_model.device
+        self.metadata.device = loaded_model.device
+        self.warmup_report = loaded_model.warmup_report
+        self.args.model_path = loaded_model.model_path
+        self._last_detections = []
+        self._track_detections = np.zeros((0, 6), dtype=np.float32)
+        self._lean_unsupported = False
+        if self._cascade is not None:
+            self._cascade.reset()
+        try:
+            self.select_labels(labels)
+        except ValueError:
+            self._selected_labels = None
+        self.logger.info("Swapped model %s -> %s", previous, loaded_model.model_path)
+        return True
+
+    def _label_source(self) -> list[str]:
+        with self._swap_lock:
+            pending = self._pending_swap
+        if pending is not None:
+            return pending[0].labels()
+        return self.get_model_labels()
+
     def select_labels(self, labels: Optional[Iterable[str]]) -> None:
         """Select labels that should be drawn and tracked during inference."""
 
@@ -204,7 +1387,7 @@ class VisionService:
             self._selected_labels = None
             return
 
-        available = self.get_model_labels()
+        available = self._label_source()
         lookup = {label.lower(): label for label in available}
         selected: set[str] = set()
         for label in labels:
@@ -222,6 +1405,33 @@ class VisionService:
 
         self._selected_labels = selected
 
+    def record_displayed_frame(self, frame_info: FrameInfo) -> float:
+        """Record the age of a frame at the moment a consumer displayed it."""
+
+        age = frame_info.age_ms()
+        self.display_ages.record(age)
+        return age
+
+    def get_metrics(self) -> dict:
+        """Return throughput and frame-age statistics for the current stream."""
+
+        return {
+            "fps": self.metadata.fps,
+            "last_inference_ms": self.metadata.last_inference_ms,
+            "device": self.metadata.device,
+            "imgsz": self.loaded_model.imgsz,
+            "dropped_frames": self.metadata.dropped_frames,
+            "full_inferences": self.metadata.full_inferences,
+            "roi_inferences": self.metadata.roi_inferences,
+            "cascade_skipped": self.metadata.cascade_skipped,
+            "power_mode": self._idle.mode if self._idle is not None else ACTIVE,
+            "last_refinement_ms": self.last_refinement.total_ms if self.last_refinement is not None else None,
+            "usage": self.usage.report() if self.usage is not None else {},
+            "max_frame_age_ms": float(getattr(self.args, "max_frame_age_ms", 0.0) or 0.0),
+            "frame_age_ms": self.frame_ages.percentiles(),
+            "display_age_ms": self.display_ages.percentiles(),
+        }
+
     def get_last_detections(self, labels: Optional[Iterable[str]] = None) -> list[dict]:
         """Return coordinates of the most recent detections optionally filtered by label."""
 
@@ -241,46 +1451,698 @@ class VisionService:
             if detection["label"].lower() in requested
         ]
 
+    def update_args(self, args) -> None:
+        """Apply new stream parameters while keeping the resident model and camera.
+
+        The capture device is only re-opened on the next :meth:`run` when one of
+        the camera settings changed, and the model is only re-warmed, also by
+        :meth:`run`, when the frame shape changed. Nothing here loads or warms a
+        model, so it is safe to call from the GUI thread.
+        """
+
+        if not self.loaded_model.matches(args):
+            raise ValueError("The resident model does not match the requested model or device.")
+        parse_class_conf(getattr(args, "class_conf", None))
+        rois = parse_rois(getattr(args, "roi", None))
+        self.args = args
+        self._rois = rois
+        self.governor = ResourceGovernor.from_args(args)
+        self._cascade = build_cascade_gate(args)
+        self._idle_policy = IdlePolicy.from_args(args)
+
+    def _rewarm_for_frame_shape(self) -> None:
+        if self.loaded_model.frame_shape == (int(self.args.frame_height), int(self.args.frame_width)):
+            return
+        self.warmup_report = warm_model(self.loaded_model, self.args)
+        self.logger.info("Model re-warmed: %s", self.warmup_report.describe())
+
+    def set_rois(self, rois) -> None:
+        """Replace the static ROIs (anything :func:`parse_rois` accepts); empty means the whole frame."""
+
+        self._rois = parse_rois(rois)
+        self.args.roi = format_rois(self._rois) or None
+        self._inferences_since_full = 0
+
+    def get_rois(self) -> list[NormalisedRect]:
+        return list(self._rois)
+
+    def release(self) -> None:
+        """Release the capture device kept open between runs."""
+
+        with self._resource_lock:
+            self._cancel_idle_timer()
+            self._release_capture_locked()
+
+    def _release_capture_locked(self) -> None:
+        if self._capture is not None:
+            self._capture.release()
+            self.logger.info("Released camera %s.", self._capture_key[0] if self._capture_key else "")
+        self._capture = None
+        self._capture_key = None
+
+    def _acquire_capture(self) -> cv2.VideoCapture:
+        with self._resource_lock:
+            self._cancel_idle_timer()
+            key = _capture_key(self.args)
+            if self._capture is not None and self._capture_key == key and self._capture.isOpened():
+                # Discard the frame that sat in the driver buffer while stopped.
+                self._capture.grab()
+                return self._capture
+            if self._capture is not None:
+                self._capture.release()
+                self._capture = None
+            self._capture, self.capture_mode = _configure_camera(self.args, self.logger)
+            self._capture_key = key
+            return self._capture
+
+    def _park_capture(self, capture_failed: bool = False) -> None:
+        """Keep the capture open after a run and schedule its release when idle."""
+
+        timeout = float(getattr(self.args, "resident_timeout", 0.0) or 0.0)
+        if capture_failed:
+            self.release()
+            return
+        if timeout <= 0:
+            self.release()
+            self._notify_idle_release()
+            return
+        with self._resource_lock:
+            self._cancel_idle_timer()
+            self._idle_timer = threading.Timer(timeout, self._on_idle_timeout)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle_timeout(self) -> None:
+        with self._resource_lock:
+            # A run that started meanwhile cancels the timer before using the capture.
+            if self._run_active or self._idle_timer is None:
+                return
+            self._idle_timer = None
+            self.logger.info("Vision service idle; releasing resident camera.")
+            self._release_capture_locked()
+        self._notify_idle_release()
+
+    def _notify_idle_release(self) -> None:
+        if self.on_idle_release is not None:
+            self.on_idle_release()
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether the async streaming worker started by :meth:`start` is still running."""
+
+        return self._run_future is not None and not self._run_future.done()
+
+    async def start(self, *, max_pending: int = 2) -> None:
+        """Start streaming on a dedicated worker thread owned by the running event loop.
+
+        Snapshots are consumed with ``async for snapshot in service``. When the consumer
+        falls behind, the oldest pending snapshot is dropped so that the newest frame is
+        always delivered first.
+        """
+
+        if self.is_streaming:
+            raise RuntimeError("Vision service is already streaming.")
+
+        self._loop = asyncio.get_running_loop()
+        self._snapshots = asyncio.Queue(maxsize=max(1, max_pending))
+        self._async_stop = threading.Event()
+        self._async_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VisionService")
+        self._run_future = self._loop.run_in_executor(self._async_executor, self._run_async_worker)
+
+    async def stop(self) -> None:
+        """Stop the streaming worker and wait until the camera has been released."""
+
+        if self._run_future is None:
+            return
+
+        if self._async_stop is not None:
+            self._async_stop.set()
+        try:
+            await self._run_future
+        finally:
+            if self._async_executor is not None:
+                self._async_executor.shutdown(wait=False)
+            self._run_future = None
+            self._async_executor = None
+            self._async_stop = None
+
+    async def snapshots(self) -> AsyncIterator[VisionSnapshot]:
+        """Yield annotated frames with their detections until the stream stops."""
+
+        if self._snapshots is None:
+            raise RuntimeError("Vision service is not streaming. Call start() first.")
+
+        queue = self._snapshots
+        while True:
+            snapshot = await queue.get()
+            if snapshot is None:
+                return
+            yield snapshot
+
+    def __aiter__(self) -> AsyncIterator[VisionSnapshot]:
+        return self.snapshots()
+
+    def _run_async_worker(self) -> None:
+        try:
+            self.run(frame_callback=self._publish_snapshot, stop_event=self._async_stop)
+        finally:
+            self._post_to_loop(None)
+
+    def _publish_snapshot(self, frame: np.ndarray, frame_info: FrameInfo) -> None:
+        snapshot = VisionSnapshot(
+            frame=frame,
+            detections=list(self._last_detections),
+            timestamp=time.monotonic(),
+            frame_info=frame_info,
+        )
+        self._post_to_loop(snapshot)
+
+    def _post_to_loop(self, snapshot: VisionSnapshot | None) -> None:
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue_snapshot, snapshot)
+        except RuntimeError:
+            # The event loop was closed while the worker was still running.
+            pass
+
+    def _enqueue_snapshot(self, snapshot: VisionSnapshot | None) -> None:
+        queue = self._snapshots
+        if queue is None:
+            return
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(snapshot)
+
+    def detection_filter(self) -> DetectionFilter:
+        """Return the class/confidence filter for the current model, selection and thresholds."""
+
+        class_conf = parse_class_conf(getattr(self.args, "class_conf", None))
+        key = (
+            id(self.names),
+            frozenset(self._selected_labels) if self._selected_labels is not None else None,
+            float(self.args.confidence_threshold),
+            tuple(sorted(class_conf.items())),
+        )
+        if key != self._filter_key or self._filter is None:
+            self._filter = build_detection_filter(
+                self.names,
+                self._selected_labels,
+                self.args.confidence_threshold,
+                class_conf,
+            )
+            self._filter_key = key
+            unknown = set(class_conf) - {label.lower() for label in self.get_model_labels()}
+            if unknown:
+                self.logger.warning("Ignoring confidence for unknown labels: %s", ", ".join(sorted(unknown)))
+        return self._filter
+
+    def _inference_regions(self, width: int, height: int) -> Optional[list[tuple[int, int, int, int]]]:
+        """Return the crops to infer on, or ``None`` when this inference must cover the full frame."""
+
+        regions = _roi_pixels(self._rois, width, height)
+        if getattr(self.args, "roi_tracks", False):
+            regions += _track_regions(
+                self._track_detections,
+                width,
+                height,
+                float(getattr(self.args, "roi_track_margin", 0.5)),
+            )
+        if not regions:
+            return None
+
+        full_every = int(getattr(self.args, "roi_full_frame_every", 10) or 0)
+        if full_every > 0 and self._inferences_since_full >= full_every - 1:
+            return None
+        regions = _merge_regions(regions)
+        area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        if area > _ROI_MAX_COVERAGE * width * height:
+            return None
+        return regions
+
+    def _lean_detector(self) -> Optional[LeanDetector]:
+        """Return the lean detector when ``--lean-inference`` or ``--optimize`` is on."""
+
+        if not _uses_lean_path(self.args) or self._lean_unsupported:
+            return None
+        return self.loaded_model.lean_detector()
+
+    def _infer(self, frame: np.ndarray) -> np.ndarray:
+        try:
+            return self._infer_once(frame, self._lean_detector())
+        except LeanInferenceUnsupported as exc:
+            self.logger.warning("Lean inference unavailable for this model (%s); using model.predict.", exc)
+            self._lean_unsupported = True
+            return self._infer_once(frame, None)
+
+    def _infer_once(self, frame: np.ndarray, lean: Optional[LeanDetector]) -> np.ndarray:
+        """Run the configured inference path and return ``(N, 6)`` detections in frame pixels.
+
+        Static ROIs act as a workspace mask: detections outside them are dropped
+        even on the periodic full-frame pass that picks up new objects.
+        """
+
+        height, width = frame.shape[:2]
+        imgsz = self.loaded_model.imgsz
+        detection_filter = self.detection_filter()
+        regions = self._inference_regions(width, height)
+        with torch.inference_mode():
+            if regions is not None:
+                detections = _predict_regions(
+                    self.model,
+                    frame,
+                    regions,
+                    device=self.device,
+                    conf=detection_filter.predict_conf,
+                    iou_threshold=float(getattr(self.args, "tile_nms_iou", 0.5)),
+                    include_full_frame=False,
+                    imgsz=imgsz,
+                    detection_filter=detection_filter,
+                    lean=lean,
+                )
+                self._inferences_since_full += 1
+                self.metadata.roi_inferences += 1
+            elif getattr(self.args, "tiled", False):
+                detections = _predict_regions(
+                    self.model,
+                    frame,
+                    _compute_tiles(
+                        width,
+                        height,
+                        int(getattr(self.args, "tile_size", 640)),
+                        float(getattr(self.args, "tile_overlap", 0.2)),
+                    ),
+                    device=self.device,
+                    conf=detection_filter.predict_conf,
+                    iou_threshold=float(getattr(self.args, "tile_nms_iou", 0.5)),
+                    include_full_frame=bool(getattr(self.args, "tile_full_frame", True)),
+                    imgsz=imgsz,
+                    detection_filter=detection_filter,
+                    lean=lean,
+                )
+            elif lean is not None:
+                (detections,) = lean.detect([frame], detection_filter.predict_conf, detection_filter.thresholds)
+                detections = detection_filter.apply(detections)
+            else:
+                # Boxes come back scaled to the original frame, whatever imgsz is.
+                results = self.model.predict(
+                    frame,
+                    device=self.device,
+                    verbose=False,
+                    conf=detection_filter.predict_conf,
+                    **_predict_options(imgsz, detection_filter.classes),
+                )
+                detections = detection_filter.apply(_results_to_array(results))
+        if regions is None:
+            self._inferences_since_full = 0
+            self.metadata.full_inferences += 1
+
+        detections = _inside_regions(detections, _roi_pixels(self._rois, width, height))
+        self._track_detections = detections
+        return detections
+
+    def _full_capture_size(self) -> tuple[int, int]:
+        mode = self.capture_mode
+        if mode is not None and mode.width > 0 and mode.height > 0:
+            return mode.width, mode.height
+        return int(self.args.frame_width), int(self.args.frame_height)
+
+    def _reconfigure_capture(
+        self,
+        cap: cv2.VideoCapture,
+        grabber: Optional["_FrameGrabber"],
+        width: int,
+        height: int,
+        fps: float,
+    ) -> None:
+        fourcc = self.capture_mode.fourcc if self.capture_mode is not None else ""
+        self._applied_capture_size = None
+
+        def configure() -> None:
+            _apply_capture_mode(cap, fourcc, width, height, fps)
+            # Cameras round to their nearest supported mode; remember what was actually set.
+            self._applied_capture_size = (
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            )
+
+        if grabber is not None:
+            grabber.reconfigure(configure)
+        else:
+            configure()
+
+    @staticmethod
+    def _read_frame(
+        cap: cv2.VideoCapture,
+        grabber: Optional["_FrameGrabber"],
+    ) -> tuple[bool, Optional[np.ndarray], float]:
+        if grabber is not None:
+            return grabber.read()
+        ret, frame = cap.read()
+        return ret, frame, _capture_timestamp(cap) if ret else 0.0
+
+    def _read_frame_of_size(
+        self,
+        cap: cv2.VideoCapture,
+        grabber: Optional["_FrameGrabber"],
+        size: tuple[int, int],
+    ) -> Optional[np.ndarray]:
+        """Read until a frame of the new mode arrives; buffers queued before a switch are skipped.
+
+        The new mode is ``(width, height)`` as requested or, once the switch has
+        run, the size the driver reports it applied instead.
+        """
+
+        for _ in range(_REFINE_MAX_FRAMES):
+            ret, frame, _ = self._read_frame(cap, grabber)
+            if not ret:
+                return None
+            frame_size = (frame.shape[1], frame.shape[0])
+            if frame_size == size or frame_size == self._applied_capture_size:
+                return frame
+        return None
+
+    def request_refinement(self, label: Optional[str] = None, detection: Optional[dict] = None) -> Future:
+        """Queue a high-resolution refinement of one streamed detection.
+
+        ``detection`` is one of :meth:`get_last_detections`; with only ``label``
+        the most confident current detection of that label is used. The stream
+        serves the request at the next frame boundary and resolves the future
+        with a :class:`RefinedDetection`.
+        """
+
+        if label is None and detection is None:
+            raise ValueError("Give the label or the detection to refine.")
+        future: Future = Future()
+        with self._refinement_lock:
+            if not self._run_active:
+                raise RuntimeError("Refinement needs a running stream.")
+            self._refinements.put(_RefinementRequest(label, detection, future, time.perf_counter()))
+        return future
+
+    def refine_target(
+        self,
+        label: Optional[str] = None,
+        detection: Optional[dict] = None,
+        timeout: float = 5.0,
+    ) -> RefinedDetection:
+        """Blocking form of :meth:`request_refinement`."""
+
+        return self.request_refinement(label, detection).result(timeout=timeout)
+
+    async def refine_target_async(
+        self,
+        label: Optional[str] = None,
+        detection: Optional[dict] = None,
+    ) -> RefinedDetection:
+        return await asyncio.wrap_future(self.request_refinement(label, detection))
+
+    def _fail_refinements(self, error: Exception) -> None:
+        while True:
+            try:
+                request = self._refinements.get_nowait()
+            except queue.Empty:
+                return
+            if request.future.set_running_or_notify_cancel():
+                request.future.set_exception(error)
+
+    def _refinement_target(self, request: _RefinementRequest) -> dict:
+        if request.detection is not None:
+            return request.detection
+        wanted = request.label.lower()
+        matches = [detection for detection in self._last_detections if detection["label"].lower() == wanted]
+        if not matches:
+            raise LookupError(f"No current detection labelled '{request.label}'.")
+        return max(matches, key=lambda detection: detection["conf"])
+
+    def _serve_refinements(
+        self,
+        cap: cv2.VideoCapture,
+        grabber: Optional["_FrameGrabber"],
+        stream_size: tuple[int, int],
+        display_size: tuple[int, int],
+    ) -> None:
+        """Answer every queued refinement from one high-resolution frame, then resume streaming."""
+
+        requests: list[_RefinementRequest] = []
+        while True:
+            try:
+                request = self._refinements.get_nowait()
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                requests.append(request)
+        if not requests:
+            return
+
+        hires_size = (
+            int(getattr(self.args, "refine_frame_width", 0) or stream_size[0]),
+            int(getattr(self.args, "refine_frame_height", 0) or stream_size[1]),
+        )
+        switched = hires_size != stream_size
+        fps = self.capture_mode.requested_fps if self.capture_mode is not None else float(self.args.target_fps)
+        stream_fps = self._idle_policy.fps if self._idle is not None and self._idle.mode == IDLE else fps
+        start = time.perf_counter()
+        try:
+            if switched:
+                self._reconfigure_capture(cap, grabber, hires_size[0], hires_size[1], fps)
+            frame = self._read_frame_of_size(cap, grabber, hires_size)
+            switch_ms = (time.perf_counter() - start) * 1000.0
+            if frame is None:
+                raise RuntimeError(f"The camera did not switch to {hires_size[0]}x{hires_size[1]} or its nearest mode.")
+            results: list = []
+            for request in requests:
+                try:
+                    results.append(self._refine_one(frame, request, display_size, switch_ms))
+                except Exception as exc:
+                    results.append(exc)
+        except Exception as exc:
+            results = [exc] * len(requests)
+        finally:
+            restore_ms = 0.0
+            if switched:
+                restore_start = time.perf_counter()
+                self._reconfigure_capture(cap, grabber, stream_size[0], stream_size[1], stream_fps)
+                self._read_frame_of_size(cap, grabber, stream_size)
+                restore_ms = (time.perf_counter() - restore_start) * 1000.0
+
+        for request, result in zip(requests, results):
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+                continue
+            result.restore_ms = restore_ms
+            result.total_ms = (time.perf_counter() - request.requested_at) * 1000.0
+            self.last_refinement = result
+            self.logger.info("Refinement: %s", result.describe())
+            request.future.set_result(result)
+
+    def _refine_one(
+        self,
+        frame: np.ndarray,
+        request: _RefinementRequest,
+        display_size: tuple[int, int],
+        switch_ms: float,
+    ) -> RefinedDetection:
+        target = self._refinement_target(request)
+        class_ids = {name.lower(): index for index, name in dict(self.names).items()}
+        cls = class_ids.get(target["label"].lower())
+        if cls is None:
+            raise LookupError(f"Label '{target['label']}' is not known to the current model.")
+
+        height, width = frame.shape[:2]
+        scale_x, scale_y = width / display_size[0], height / display_size[1]
+        x1, y1, x2, y2 = target["bbox_xyxy"]
+        prior = np.array([x1 * scale_x, y1 * scale_y, x2 * scale_x, y2 * scale_y], dtype=np.float32)
+        region = _track_regions(prior[None, :], width, height, _REFINE_MARGIN)
+
+        detection_filter = self.detection_filter()
+        start = time.perf_counter()
+        with torch.inference_mode():
+            detections = _predict_regions(
+                self.model,
+                frame,
+                region,
+                device=self.device,
+                conf=detection_filter.predict_conf,
+                iou_threshold=float(getattr(self.args, "tile_nms_iou", 0.5)),
+                include_full_frame=False,
+                imgsz=self.loaded_model.imgsz,
+                detection_filter=detection_filter,
+            )
+        inference_ms = (time.perf_counter() - start) * 1000.0
+
+        match = _best_match(detections, prior, cls)
+        hires_box = match[:4] if match is not None else prior
+        conf = float(match[4]) if match is not None else float(target["conf"])
+        box = (
+            float(hires_box[0] / scale_x),
+            float(hires_box[1] / scale_y),
+            float(hires_box[2] / scale_x),
+            float(hires_box[3] / scale_y),
+        )
+        return RefinedDetection(
+            label=target["label"],
+            conf=conf,
+            bbox_xyxy=box,
+            center_xy=((box[0] + box[2]) / 2, (box[1] + box[3]) / 2),
+            streamed_center_xy=tuple(float(value) for value in target["center_xy"]),
+            hires_bbox_xyxy=tuple(float(value) for value in hires_box),
+            hires_size=(width, height),
+            refined=match is not None,
+            switch_ms=switch_ms,
+            inference_ms=inference_ms,
+        )
+
+    def _switch_capture_mode(
+        self,
+        cap: cv2.VideoCapture,
+        grabber: Optional["_FrameGrabber"],
+        mode: str,
+    ) -> None:
+        """Reconfigure the open capture for ``mode`` without re-running the format probe."""
+
+        if mode == IDLE and self._idle_policy is not None:
+            width, height, fps = self._idle_policy.width, self._idle_policy.height, self._idle_policy.fps
+        else:
+            width, height = self._full_capture_size()
+            fps = self.capture_mode.requested_fps if self.capture_mode is not None else float(self.args.target_fps)
+        self._reconfigure_capture(cap, grabber, width, height, fps)
+        # Tracked boxes belong to the previous resolution.
+        self._track_detections = np.zeros((0, 6), dtype=np.float32)
+        if self.usage is not None:
+            self.usage.switch(mode)
+
     def run(
         self,
-        frame_callback: Optional[Callable[[np.ndarray], None]] = None,
-        stop_event: Optional["threading.Event"] = None,
+        frame_callback: Optional[Callable[[np.ndarray, FrameInfo], None]] = None,
+        stop_event: Optional[threading.Event] = None,
     ) -> None:
-        cap = _configure_camera(self.args)
+        self._run_active = True
+        self.governor.pin_current_thread("inference")
+        try:
+            self._rewarm_for_frame_shape()
+            cap = self._acquire_capture()
+        except Exception:
+            with self._refinement_lock:
+                self._run_active = False
+            self._fail_refinements(RuntimeError("The stream could not be started for the refinement."))
+            raise
+        capture_failed = False
+        grabber = _FrameGrabber(cap, self.governor).start() if self.governor.has_role("capture") else None
         frame_count = 0
+        sequence = 0
+        consecutive_drops = 0
         last_inference = None
-        metadata = InferenceMetadata(device=self.device)
+        applied_filter: DetectionFilter | None = None
+        inference_info: FrameInfo | None = None
+        metadata = self.metadata = InferenceMetadata(device=self.device)
+        if self._cascade is not None:
+            self._cascade.reset()
+        idle = self._idle = IdleController(self._idle_policy, time.monotonic()) if self._idle_policy else None
+        usage = self.usage = UsageLedger()
+        usage.switch(ACTIVE)
+        full_size = self._full_capture_size()
+        stream_size = full_size
+        self.frame_ages.clear()
+        self.display_ages.clear()
+        max_age_ms = float(getattr(self.args, "max_frame_age_ms", 0.0) or 0.0)
+        skipped_by_grabber = 0
 
         try:
             while True:
                 if stop_event and stop_event.is_set():
                     break
+                if self._apply_pending_swap():
+                    # Detections of the previous model must not be drawn on new frames.
+                    last_inference = None
+                if not self._refinements.empty():
+                    self._serve_refinements(cap, grabber, stream_size, full_size)
                 loop_start = time.perf_counter()
-                ret, frame = cap.read()
+                ret, frame, capture_ts = self._read_frame(cap, grabber)
+                if grabber is not None:
+                    metadata.dropped_frames += grabber.skipped - skipped_by_grabber
+                    skipped_by_grabber = grabber.skipped
                 if not ret:
                     self.logger.warning("Unable to read frame from camera. Stopping stream.")
+                    capture_failed = True
                     break
 
+                sequence += 1
+                stream_size = (frame.shape[1], frame.shape[0])
+                frame_info = FrameInfo(sequence=sequence, capture_ts=capture_ts)
+                if max_age_ms > 0 and frame_info.age_ms() > max_age_ms:
+                    # Never starve the stream: a camera whose own latency exceeds
+                    # the SLO would otherwise have every frame dropped.
+                    if consecutive_drops < _MAX_CONSECUTIVE_DROPS:
+                        consecutive_drops += 1
+                        metadata.dropped_frames += 1
+                        continue
+                    self.logger.warning(
+                        "Frame %d is %.0f ms old, above the %.0f ms SLO; processing anyway.",
+                        frame_info.sequence,
+                        frame_info.age_ms(),
+                        max_age_ms,
+                    )
+                consecutive_drops = 0
+
                 frame_count += 1
-                if frame_count % max(1, self.args.inference_interval) == 0 or last_inference is None:
+                usage.count_frame()
+                if idle is not None and idle.observe_frame(frame, time.monotonic()):
+                    self.logger.info("Leaving idle mode (%s).", idle.reason)
+                    self._switch_capture_mode(cap, grabber, idle.mode)
+                interval = self.args.inference_interval
+                if idle is not None:
+                    interval = idle.inference_interval(interval)
+                if frame_count % max(1, interval) == 0 or last_inference is None:
                     inference_start = time.perf_counter()
-                    with torch.inference_mode():
-                        last_inference = self.model.predict(
-                            frame,
-                            device=self.device,
-                            verbose=False,
-                            conf=self.args.confidence_threshold,
-                        )
+                    decision = self._cascade.decide(frame) if self._cascade is not None else None
+                    if decision is None or decision.run_full or last_inference is None:
+                        last_inference = self._infer(frame)
+                        applied_filter = self._filter
+                        height, width = frame.shape[:2]
+                        if (width, height) != full_size:
+                            last_inference = _scale_detections(
+                                last_inference, full_size[0] / width, full_size[1] / height
+                            )
+                        if self._cascade is not None:
+                            self._cascade.observe(last_inference, applied_filter.thresholds)
+                        usage.count_inference()
+                    else:
+                        metadata.cascade_skipped += 1
+                        if decision.candidates == 0:
+                            last_inference = np.zeros((0, 6), dtype=np.float32)
                     metadata.last_inference_ms = (time.perf_counter() - inference_start) * 1000
+                    inference_info = frame_info
+                    if idle is not None and idle.observe_detections(len(last_inference), time.monotonic()):
+                        self.logger.info("Entering %s mode (%s).", idle.mode, idle.reason)
+                        self._switch_capture_mode(cap, grabber, idle.mode)
 
-                if last_inference:
-                    frame, detections_info = _draw_bounding_boxes(
-                        frame,
-                        last_inference,
-                        self.names,
-                        self.args.confidence_threshold,
-                        self._selected_labels,
-                    )
+                height, width = frame.shape[:2]
+                if (width, height) != full_size:
+                    # Idle frames (and those still in flight after a switch) are shown at the
+                    # full size, so consumers never see two coordinate systems.
+                    frame = cv2.resize(frame, full_size, interpolation=cv2.INTER_LINEAR)
+
+                if last_inference is not None:
+                    detection_filter = self.detection_filter()
+                    if detection_filter is not applied_filter:
+                        # A narrower selection takes effect before the next inference.
+                        last_inference = detection_filter.apply(last_inference)
+                        applied_filter = detection_filter
+                    frame, detections_info = _draw_bounding_boxes(frame, last_inference, self.names)
+                    if inference_info is not None:
+                        inference_age = inference_info.age_ms()
+                        for detection in detections_info:
+                            detection["frame_seq"] = inference_info.sequence
+                            detection["frame_age_ms"] = inference_age
                     self._last_detections = detections_info
                     for detection in detections_info:
                         self.logger.info(
@@ -291,19 +2153,42 @@ class VisionService:
                             detection["center_xy"],
                         )
 
+                if self._rois:
+                    height, width = frame.shape[:2]
+                    frame = _draw_rois(frame, _roi_pixels(self._rois, width, height))
+
                 loop_duration = time.perf_counter() - loop_start
                 metadata.fps = 1.0 / max(loop_duration, 1e-6)
+                metadata.frame_age_ms = frame_info.age_ms()
+                self.frame_ages.record(metadata.frame_age_ms)
                 frame = _annotate_metadata(frame, metadata)
                 frame = _apply_digital_zoom(frame, self.args.digital_zoom)
 
                 if frame_callback is not None:
-                    frame_callback(frame)
+                    frame_callback(frame, frame_info)
                 else:
                     cv2.imshow(self.args.window_name, frame)
+                    self.record_displayed_frame(frame_info)
                     if cv2.waitKey(1) & 0xFF == ord("q"):
                         break
         finally:
-            cap.release()
+            if grabber is not None:
+                grabber.stop()
+            if idle is not None and idle.mode == IDLE and not capture_failed:
+                # The parked capture is reused as-is by the next run.
+                self._switch_capture_mode(cap, None, ACTIVE)
+                idle.mode = ACTIVE
+            usage.close()
+            for mode, summary in usage.modes.items():
+                self.logger.info("%s mode: %s", mode.capitalize(), summary.describe())
+            with self._refinement_lock:
+                self._run_active = False
+            self._fail_refinements(RuntimeError("The stream stopped before the refinement was served."))
+            self._park_capture(capture_failed)
             self._last_detections = []
             if frame_callback is None:
                 cv2.destroyAllWindows()
+            if metadata.dropped_frames:
+                self.logger.info(
+                    "Dropped %d frames older than %.0f ms.", metadata.dropped_frames, max_age_ms
+                )
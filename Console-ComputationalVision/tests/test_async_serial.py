@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from services.GCodeSender import GCodeSender
+from services.async_serial import GrblProtocol
+from services.gcode_modal import ModalState
+
+
+class SilentSerial:
+    """A port that records writes and never answers; tests feed responses to the protocol."""
+
+    in_waiting = 0
+
+    def __init__(self) -> None:
+        self.is_open = True
+        self.written: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.written.append(data)
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        time.sleep(0.005)
+        return b""
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+def _sender() -> tuple[GCodeSender, SilentSerial]:
+    sender = GCodeSender()
+    sender.logger.disabled = True
+    port = SilentSerial()
+    sender.nano = port
+    return sender, port
+
+
+async def _written(port: SilentSerial, data: bytes) -> None:
+    while data not in port.written:
+        await asyncio.sleep(0.005)
+
+
+def test_deadline_cancellation_resynchronises_lost_ok():
+    async def scenario():
+        sender, port = _sender()
+        try:
+            sender.modal.relative_move(1, 0, 0, 200)
+            # The deadline cancels the running request; its "ok" never comes.
+            assert not await sender.send_command("G1 X1", timeout_s=0.05)
+            assert sender.modal.state == ModalState()
+
+            follow_up = asyncio.create_task(sender.send_command("G1 X2"))
+            await asyncio.wait_for(_written(port, b"G1 X2\n"), 2.0)
+            sender.protocol.data_received(b"ok\r\n")
+            assert await asyncio.wait_for(follow_up, 1.0)
+            assert sender.command_trace[-1]["responses"] == ["ok"]
+            assert sender.protocol.pending_count() == 0
+        finally:
+            sender.close_connection()
+
+    asyncio.run(scenario())
+
+
+def test_protocol_matches_responses_in_write_order():
+    async def scenario():
+        protocol = GrblProtocol()
+        first = protocol.expect("$I", 3)
+        second = protocol.expect("G1 X1", 6)
+        protocol.data_received(b"[VER:1.1h]\r\no")
+        protocol.data_received(b"k\r\n<Idle|MPos:0.000,0.000,0.000|FS:0,0>\r\nerror:2\r\n")
+        return await first, await second, protocol.last_status["state"]
+
+    assert asyncio.run(scenario()) == (["[VER:1.1h]", "ok"], ["error:2"], "Idle")
+
+
+def test_reserve_keeps_unacknowledged_bytes_within_the_rx_buffer():
+    async def scenario():
+        protocol = GrblProtocol(rx_buffer_size=20)
+        protocol.expect("G1 X1", 12)
+        assert protocol._buffered == 12
+        await asyncio.wait_for(protocol.reserve(8), 0.1)
+        blocked = asyncio.create_task(protocol.reserve(9))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        protocol.data_received(b"ok\r\n")
+        await asyncio.wait_for(blocked, 0.1)
+        assert protocol._buffered == 0
+        # A line longer than the buffer still goes out once nothing is pending.
+        await asyncio.wait_for(protocol.reserve(30), 0.1)
+
+    asyncio.run(scenario())
+
+
+def test_startup_banner_fails_pending_and_frees_the_buffer():
+    async def scenario():
+        protocol = GrblProtocol()
+        response = protocol.expect("G1 X1", 6)
+        protocol.data_received(b"Grbl 1.1h ['$' for help]\r\n")
+        with pytest.raises(ConnectionResetError):
+            await response
+        assert protocol._buffered == 0
+
+    asyncio.run(scenario())
+
+
+def test_reserve_waits_for_a_pending_resynchronisation():
+    async def scenario():
+        protocol = GrblProtocol()
+        lost = protocol.expect("G1 X1", 6)
+        protocol.resynchronise_soon(TimeoutError("lost"))
+        await protocol.reserve(6)
+        following = protocol.expect("G1 X2", 6)
+        with pytest.raises(TimeoutError):
+            await lost
+        protocol.data_received(b"ok\r\n")
+        return await following
+
+    assert asyncio.run(scenario()) == ["ok"]
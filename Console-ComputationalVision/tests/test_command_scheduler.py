@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from services.command_scheduler import MOTION, QUERY, REALTIME, CommandScheduler, classify
+
+
+class Executor:
+    """Records the commands it runs; ``hold`` keeps the first one in flight until released."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.delay_s = delay_s
+        self.executed: list[str] = []
+        self.cancelled: list[str] = []
+        self.hold = asyncio.Event()
+        self.hold.set()
+
+    async def __call__(self, command: str) -> list[str]:
+        self.executed.append(command)
+        try:
+            await self.hold.wait()
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled.append(command)
+            raise
+        return ["ok"]
+
+
+async def _hold_worker(scheduler: CommandScheduler, executor: Executor):
+    executor.hold.clear()
+    blocker = scheduler.submit("G4 P0")
+    await asyncio.sleep(0)
+    return blocker
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [("?", REALTIME), ("!", REALTIME), ("\x18", REALTIME), ("$G", QUERY), ("$$", QUERY), ("$H", MOTION), ("G1 X1", MOTION)],
+)
+def test_classify(command, expected):
+    assert classify(command) == expected
+
+
+def test_motion_runs_before_queries_and_each_class_is_fifo():
+    async def scenario():
+        executor = Executor()
+        scheduler = CommandScheduler(executor, starvation_s=10.0)
+        blocker = await _hold_worker(scheduler, executor)
+        queued = [scheduler.submit(command) for command in ("$G", "G1 X1", "$#", "G1 X2")]
+        executor.hold.set()
+        await asyncio.gather(blocker.future, *(scheduled.future for scheduled in queued))
+        return executor.executed
+
+    assert asyncio.run(scenario()) == ["G4 P0", "G1 X1", "G1 X2", "$G", "$#"]
+
+
+def test_starved_query_goes_next_in_submission_order():
+    async def scenario():
+        executor = Executor()
+        scheduler = CommandScheduler(executor, starvation_s=0.02)
+        blocker = await _hold_worker(scheduler, executor)
+        query = scheduler.submit("$G")
+        motion = scheduler.submit("G1 X1")
+        await asyncio.sleep(0.05)
+        executor.hold.set()
+        await asyncio.gather(blocker.future, query.future, motion.future)
+        return executor.executed, query.waited_s
+
+    executed, waited_s = asyncio.run(scenario())
+    assert executed == ["G4 P0", "$G", "G1 X1"]
+    assert waited_s >= 0.02
+
+
+def test_realtime_runs_while_another_command_is_in_flight():
+    async def scenario():
+        executor = Executor()
+        scheduler = CommandScheduler(executor)
+        blocker = await _hold_worker(scheduler, executor)
+        status = scheduler.submit("?")
+        await asyncio.sleep(0.01)
+        executed_while_held = list(executor.executed)
+        executor.hold.set()
+        await asyncio.gather(blocker.future, status.future)
+        return executed_while_held
+
+    assert asyncio.run(scenario()) == ["G4 P0", "?"]
+
+
+def test_queued_command_expires_without_being_sent():
+    async def scenario():
+        executor = Executor()
+        scheduler = CommandScheduler(executor)
+        blocker = await _hold_worker(scheduler, executor)
+        expiring = scheduler.submit("G1 X1", timeout_s=0.02)
+        with pytest.raises(TimeoutError):
+            await expiring.future
+        executor.hold.set()
+        await blocker.future
+        await asyncio.sleep(0.01)
+        return executor.executed, expiring.started_at
+
+    executed, started_at = asyncio.run(scenario())
+    assert executed == ["G4 P0"]
+    assert started_at is None
+
+
+def test_running_command_past_its_deadline_is_cancelled():
+    async def scenario():
+        executor = Executor(delay_s=1.0)
+        scheduler = CommandScheduler(executor)
+        running = scheduler.submit("G1 X1", timeout_s=0.02)
+        with pytest.raises(TimeoutError):
+            await running.future
+        await asyncio.sleep(0)
+        return executor.cancelled, scheduler.running
+
+    cancelled, running = asyncio.run(scenario())
+    assert cancelled == ["G1 X1"]
+    assert running is None
+
+
+def test_cancelled_queued_command_is_dropped():
+    async def scenario():
+        executor = Executor()
+        scheduler = CommandScheduler(executor)
+        blocker = await _hold_worker(scheduler, executor)
+        dropped = scheduler.submit("G1 X1")
+        kept = scheduler.submit("G1 X2")
+        dropped.future.cancel()
+        assert scheduler.queued() == 1
+        executor.hold.set()
+        await asyncio.gather(blocker.future, kept.future)
+        return executor.executed
+
+    assert asyncio.run(scenario()) == ["G4 P0", "G1 X2"]
+
+
+def test_close_fails_queued_commands():
+    async def scenario():
+        executor = Executor()
+        scheduler = CommandScheduler(executor)
+        await _hold_worker(scheduler, executor)
+        queued = scheduler.submit("G1 X1")
+        scheduler.close()
+        with pytest.raises(ConnectionError):
+            await queued.future
+
+    asyncio.run(scenario())
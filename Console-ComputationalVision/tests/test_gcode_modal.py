@@ -0,0 +1,51 @@
+import pytest
+
+from services.gcode_modal import SOFT_RESET, ModalSession
+
+
+def _established() -> ModalSession:
+    session = ModalSession()
+    session.relative_move(1, 0, 0, 200)
+    return session
+
+
+def test_first_move_sends_all_modal_words():
+    assert ModalSession().relative_move(1, 0, 0, 200) == "G21 G91 G1 X1.000 Y0.000 Z0.000 F200"
+
+
+def test_following_move_sends_only_coordinates():
+    assert _established().relative_move(0, 1, 0, 200) == "X0.000 Y1.000 Z0.000"
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "Grbl 1.1h ['$' for help]",
+        "ALARM:1",
+        "error:20",
+    ],
+)
+def test_controller_lines_reset_state(line):
+    session = _established()
+    session.observe_response(line)
+    assert session.relative_move(1, 0, 0, 200) == "G21 G91 G1 X1.000 Y0.000 Z0.000 F200"
+
+
+@pytest.mark.parametrize("line", ["M2", "M30", SOFT_RESET])
+def test_sent_lines_reset_state(line):
+    session = _established()
+    session.observe(line)
+    assert session.relative_move(1, 0, 0, 200) == "G21 G91 G1 X1.000 Y0.000 Z0.000 F200"
+
+
+@pytest.mark.parametrize("line", ["ok", "[MSG:Caution: Unlocked]", "<Idle|MPos:0.000,0.000,0.000|FS:0,0>"])
+def test_other_lines_keep_state(line):
+    session = _established()
+    session.observe_response(line)
+    assert session.relative_move(1, 0, 0, 200) == "X1.000 Y0.000 Z0.000"
+
+
+def test_hand_typed_absolute_mode_is_tracked():
+    session = _established()
+    session.observe("G90")
+    assert session.relative_move(1, 0, 0, 200) == "G91 X1.000 Y0.000 Z0.000"
@@ -0,0 +1,89 @@
+import queue
+
+import pytest
+
+from services.serial_reader import SerialReader, parse_status_report
+
+
+class FeedPort:
+    """A port whose incoming bytes are fed by the test."""
+
+    in_waiting = 0
+
+    def __init__(self) -> None:
+        self._chunks: queue.Queue[bytes] = queue.Queue()
+
+    def feed(self, data: bytes) -> None:
+        self._chunks.put(data)
+
+    def read(self, size: int = 1) -> bytes:
+        try:
+            return self._chunks.get(timeout=0.01)
+        except queue.Empty:
+            return b""
+
+
+@pytest.fixture
+def port():
+    return FeedPort()
+
+
+@pytest.fixture
+def reader(port):
+    lines: list[str] = []
+    statuses: list[str] = []
+    reader = SerialReader(port, on_line=lines.append, on_status=statuses.append).start()
+    reader.lines, reader.statuses = lines, statuses
+    yield reader
+    reader.stop()
+
+
+def test_responses_are_matched_in_write_order(port, reader):
+    first = reader.expect("$I")
+    second = reader.expect("G1 X1")
+    # Lines may arrive split across reads.
+    port.feed(b"[VER:1.1h]\r\no")
+    port.feed(b"k\r\nerror:2\r\n")
+    assert first.result(timeout=1.0) == ["[VER:1.1h]", "ok"]
+    assert second.result(timeout=1.0) == ["error:2"]
+    assert reader.pending_count() == 0
+
+
+def test_status_reports_bypass_pending_commands(port, reader):
+    response = reader.expect("G1 X1")
+    port.feed(b"<Idle|MPos:1.000,2.000,0.000|FS:0,0>\r\nok\r\n")
+    assert response.result(timeout=1.0) == ["ok"]
+    assert reader.statuses == ["<Idle|MPos:1.000,2.000,0.000|FS:0,0>"]
+    assert reader.lines == ["<Idle|MPos:1.000,2.000,0.000|FS:0,0>", "ok"]
+
+
+def test_startup_banner_fails_pending(port, reader):
+    response = reader.expect("G1 X1")
+    port.feed(b"Grbl 1.1h ['$' for help]\r\n")
+    with pytest.raises(ConnectionResetError):
+        response.result(timeout=1.0)
+
+
+def test_resynchronise_drops_the_slot_of_a_lost_ok(port, reader):
+    lost = reader.expect("G1 X1")
+    reader.resynchronise(TimeoutError("lost"), quiet_s=0.02)
+    with pytest.raises(TimeoutError):
+        lost.result(timeout=0)
+    following = reader.expect("G1 X2")
+    port.feed(b"ok\r\n")
+    assert following.result(timeout=1.0) == ["ok"]
+
+
+def test_stop_fails_pending(reader):
+    response = reader.expect("G1 X1")
+    reader.stop()
+    with pytest.raises(ConnectionError):
+        response.result(timeout=0)
+
+
+def test_parse_status_report():
+    assert parse_status_report("<Run|MPos:1.000,-2.500,0.000|FS:500,0>") == {
+        "state": "Run",
+        "MPos": (1.0, -2.5, 0.0),
+        "FS": (500.0, 0.0),
+    }
@@ -0,0 +1,119 @@
+"""Measure how many full inferences the cascade avoids and what it costs in accuracy.
+
+Run from the ``Console-ComputationalVision`` directory, after building the
+profile with ``python -m tools.build_cascade_profile``::
+
+    python -m tools.benchmark_cascade --model-path models/coke_water_vision.pt
+
+The test split is made of consecutive video frames, so it is replayed in file
+order as a stream. ``--repeat`` shows every image several times in a row to
+mimic a camera dwelling on the same scene at a higher frame rate than the
+dataset was sampled at. Each frame is scored against its own labels, both
+with the full model on every frame and with the cascade, where gated frames
+reuse the previous detections (or none, when the first stage sees no
+candidates).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from services.cascade import DEFAULT_PROFILE_PATH, CascadeGate, CascadeProfile
+from services.vision_service import _load_model, _results_to_array
+from tools.dataset_eval import DetectionEvaluator, iter_split
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/coke_water_vision.pt")
+    parser.add_argument("--profile", default=str(DEFAULT_PROFILE_PATH))
+    parser.add_argument("--device", choices=("cpu", "cuda"), default=None)
+    parser.add_argument("--split", default="test")
+    parser.add_argument("--frame-width", type=int, default=1280)
+    parser.add_argument("--frame-height", type=int, default=720)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=1, help="Show each image this many times in a row.")
+    parser.add_argument("--motion-threshold", type=float, default=0.02)
+    parser.add_argument("--max-skipped", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_arguments()
+    device = args.device or ("cuda" if torch.cuda.is_available() else "cpu")
+    model = _load_model(args.model_path, device)
+    profile = CascadeProfile.load(Path(args.profile)) if Path(args.profile).exists() else None
+    if profile is None:
+        print(f"No profile at {args.profile}; the first stage gates on motion only.")
+    gate = CascadeGate(profile, motion_threshold=args.motion_threshold, max_skipped=args.max_skipped)
+    thresholds = np.full(len(model.names), args.conf, dtype=np.float32)
+
+    samples = list(
+        iter_split(args.split, frame_size=(args.frame_width, args.frame_height), limit=args.limit)
+    )
+    if not samples:
+        raise SystemExit(f"No images found for split '{args.split}'.")
+
+    baseline = DetectionEvaluator()
+    cascaded = DetectionEvaluator()
+    reasons: Counter[str] = Counter()
+    full_ms: list[float] = []
+    gate_ms: list[float] = []
+    missed_frames = 0
+    full_runs = 0
+    previous = np.zeros((0, 6), dtype=np.float32)
+    frames = 0
+
+    with torch.inference_mode():
+        model.predict(samples[0].image, device=device, verbose=False, conf=args.conf)
+        for sample in samples:
+            start = time.perf_counter()
+            detections = _results_to_array(
+                model.predict(sample.image, device=device, verbose=False, conf=args.conf)
+            )
+            full_ms.append((time.perf_counter() - start) * 1000.0)
+            for _ in range(max(1, args.repeat)):
+                frames += 1
+                baseline.add(detections, sample.boxes)
+
+                start = time.perf_counter()
+                decision = gate.decide(sample.image)
+                gate_ms.append((time.perf_counter() - start) * 1000.0)
+                reasons[decision.reason] += 1
+                if decision.run_full:
+                    full_runs += 1
+                    # The model is deterministic, so the frame's full result stands in for a rerun.
+                    previous = detections
+                    gate.observe(detections, thresholds)
+                elif decision.candidates == 0:
+                    previous = np.zeros((0, 6), dtype=np.float32)
+                    if len(sample.boxes):
+                        missed_frames += 1
+                cascaded.add(previous, sample.boxes)
+
+    avoided = frames - full_runs
+    print(
+        f"{frames} frames ({len(samples)} '{args.split}' images x{max(1, args.repeat)}) at "
+        f"{args.frame_width}x{args.frame_height} on {device}"
+    )
+    print(f"full inferences: {full_runs}, avoided: {avoided} ({100.0 * avoided / frames:.1f}%)")
+    print("decisions: " + ", ".join(f"{reason}={count}" for reason, count in reasons.most_common()))
+    print(
+        f"first stage p50 {statistics.median(gate_ms):.2f} ms, full model p50 {statistics.median(full_ms):.1f} ms; "
+        f"labelled frames gated as empty: {missed_frames}"
+    )
+    baseline_map = baseline.mean_average_precision()
+    cascade_map = cascaded.mean_average_precision()
+    print(f"mAP@0.5 every frame {baseline_map:.3f}, cascade {cascade_map:.3f} ({cascade_map - baseline_map:+.3f})")
+
+
+if __name__ == "__main__":
+    main()
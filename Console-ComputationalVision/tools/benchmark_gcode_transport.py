@@ -0,0 +1,142 @@
+"""Compare GCodeSender's asyncio transport and scheduler with the polling sender.
+
+Run from the ``Console-ComputationalVision`` directory (POSIX only)::
+
+    python -m tools.benchmark_gcode_transport --commands 200
+
+Both senders talk to :class:`tools.grbl_simulator.PtyGrbl` through a real
+pseudo-terminal opened with pyserial. The baseline is the previous
+implementation, which awaited ``asyncio.to_thread(nano.readline)`` for every
+response line and serialised callers by polling ``command_in_execution``
+every 100 ms. The report gives the mean and p95 latency of sequential
+``send_command`` calls, then the wall time for several coroutines calling
+``send_command`` concurrently, the mean time a command waited for its turn,
+and whether the wire order kept each coroutine's commands in order and
+interleaved the coroutines first come, first served.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict
+
+import serial
+
+from services.GCodeSender import GCodeSender
+from tools.grbl_simulator import PtyGrbl
+
+
+class ThreadReadGCodeSender(GCodeSender):
+    """The sender as it was before the asyncio transport and scheduler, kept for comparison."""
+
+    async def read_response_until_ok(self) -> list[str]:
+        responses: list[str] = []
+        deadline = time.monotonic() + self.command_timeout
+        while time.monotonic() < deadline:
+            raw = await asyncio.to_thread(self.nano.readline)
+            if not raw:
+                continue
+            line = raw.decode("utf-8", errors="replace").strip()
+            if line:
+                responses.append(line)
+                if line == "ok" or line.startswith("error:"):
+                    break
+        return responses
+
+    async def send_command(self, command: str) -> bool:
+        encoded_command = self._normalize_command(command).encode("utf-8")
+        start_waiting = time.monotonic()
+        while self.command_in_execution:
+            await asyncio.sleep(0.1)
+        command_trace: Dict[str, Any] = {"command": command, "waited_for": time.monotonic() - start_waiting}
+        self.command_in_execution = True
+        self.nano.write(encoded_command)
+        responses = await self.read_response_until_ok()
+        self.nano.flush()
+        self.command_in_execution = False
+        command_trace["responses"] = responses
+        self.command_trace.append(command_trace)
+        return any(responses)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=200, help="Sequential send_command calls.")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent coroutines.")
+    parser.add_argument("--per-client", type=int, default=25, help="Commands sent by each coroutine.")
+    parser.add_argument("--line-ms", type=float, default=0.5, help="Controller time per line.")
+    return parser.parse_args()
+
+
+def _open(sender: GCodeSender, controller: PtyGrbl) -> None:
+    # connect_nano() waits 2 s for an Arduino to reboot; a pty needs no wait.
+    sender.serial_port = controller.port
+    sender.baud_rate = 115200
+    sender.nano = serial.Serial(controller.port, sender.baud_rate, timeout=1)
+
+
+async def _sequential(sender: GCodeSender, count: int) -> list[float]:
+    latencies = []
+    for index in range(count):
+        start = time.perf_counter()
+        if not await sender.send_command(f"G1 X{0.1 if index % 2 else -0.1:.3f}"):
+            raise SystemExit(f"No response to command {index}.")
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return latencies
+
+
+async def _concurrent(sender: GCodeSender, clients: int, per_client: int) -> tuple[float, float, bool]:
+    async def client(number: int) -> None:
+        for index in range(per_client):
+            command = f"G1 X{number}.{index:03d}"
+            if not await sender.send_command(command):
+                raise SystemExit(f"No response to {command}.")
+
+    sender.command_trace.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    elapsed = time.perf_counter() - start
+    order = [trace["command"] for trace in sender.command_trace]
+    waits = [trace["waited_for"] for trace in sender.command_trace]
+    # Each client queues its next command as soon as the previous one is
+    # answered, so first come, first served means strict round robin.
+    round_robin = order == [f"G1 X{number}.{index:03d}" for index in range(per_client) for number in range(clients)]
+    return elapsed, statistics.mean(waits) * 1000.0, round_robin
+
+
+async def _run(args: argparse.Namespace, sender_class: type[GCodeSender]) -> tuple[list[float], tuple[float, float, bool]]:
+    controller = PtyGrbl(line_time_s=args.line_ms / 1000.0)
+    sender = sender_class()
+    sender.logger.disabled = True
+    try:
+        _open(sender, controller)
+        latencies = await _sequential(sender, args.commands)
+        concurrent = await _concurrent(sender, args.clients, args.per_client)
+    finally:
+        sender.close_connection()
+        controller.close()
+    return latencies, concurrent
+
+
+def main() -> None:
+    args = parse_arguments()
+    total = args.clients * args.per_client
+    print(f"pty GRBL stand-in, {args.line_ms:.2f} ms per line")
+    print(
+        f"{'sender':<20} {'mean ms':>8} {'p95 ms':>8} {f'{args.clients}x{args.per_client} concurrent s':>22} "
+        f"{'cmd/s':>7} {'wait ms':>8} {'FCFS':>5}"
+    )
+    for name, sender_class in (("polling, readline", ThreadReadGCodeSender), ("transport+scheduler", GCodeSender)):
+        latencies, (concurrent_s, wait_ms, round_robin) = asyncio.run(_run(args, sender_class))
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(
+            f"{name:<20} {statistics.mean(latencies):>8.2f} {p95:>8.2f} {concurrent_s:>22.3f} "
+            f"{total / concurrent_s:>7.0f} {wait_ms:>8.2f} {'yes' if round_robin else 'no':>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare line-by-line GRBL sending with character-counting streaming.
+
+Run from the ``Console-ComputationalVision`` directory::
+
+    python -m tools.benchmark_grbl_streaming --lines 500
+
+Both modes drive :class:`services.GrblSender.GrblSender` against the simulated
+controller in :mod:`tools.grbl_simulator`, first with a program of ``G1``
+moves and then with repeated ``send_coordinates`` calls, with the six-line
+preamble and with a modal session (one line per move). The report gives the
+wall time, the line rate, how busy the controller was (idle time is serial
+round-trip overhead) and the number of RX buffer overflows, which must be 0.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from services.GrblSender import GrblSender
+from tools.grbl_simulator import SimulatedGrbl
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=500, help="G1 lines in the streamed program.")
+    parser.add_argument("--moves", type=int, default=50, help="send_coordinates calls.")
+    parser.add_argument("--baud-rate", type=int, default=115200)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="One-way USB/driver latency.")
+    parser.add_argument("--line-ms", type=float, default=0.5, help="Controller time to parse and plan a line.")
+    return parser.parse_args()
+
+
+def _program(lines: int) -> list[str]:
+    program = ["G21", "G91", "F500"]
+    for index in range(lines):
+        step = 0.1 if index % 2 == 0 else -0.1
+        program.append(f"G1 X{step:.3f} Y{-step:.3f} Z0.000")
+    program.append("G90")
+    return program
+
+
+def _sender(
+    args: argparse.Namespace,
+    streaming: bool,
+    modal_session: bool = False,
+) -> tuple[GrblSender, SimulatedGrbl]:
+    controller = SimulatedGrbl(
+        baud_rate=args.baud_rate,
+        link_latency_s=args.latency_ms / 1000.0,
+        line_time_s=args.line_ms / 1000.0,
+    )
+    sender = GrblSender(streaming=streaming, modal_session=modal_session)
+    sender.attach(controller, "simulated")
+    return sender, controller
+
+
+def _run_program(args: argparse.Namespace, streaming: bool) -> tuple[float, int, SimulatedGrbl]:
+    sender, controller = _sender(args, streaming)
+    program = _program(args.lines)
+    start = time.perf_counter()
+    if streaming:
+        results = sender.stream_commands(program)
+        acknowledged = sum(1 for line in results if line.ok)
+    else:
+        acknowledged = sum(1 for command in program if "ok" in sender.send_command(command))
+    elapsed = time.perf_counter() - start
+    sender.close_connection()
+    if acknowledged != len(program):
+        raise SystemExit(f"Only {acknowledged}/{len(program)} lines were acknowledged.")
+    return elapsed, len(program), controller
+
+
+def _run_moves(args: argparse.Namespace, streaming: bool, modal_session: bool) -> tuple[float, SimulatedGrbl]:
+    sender, controller = _sender(args, streaming, modal_session)
+    start = time.perf_counter()
+    for index in range(args.moves):
+        step = 1.0 if index % 2 == 0 else -1.0
+        sender.send_coordinates(step, step, 0.0, feedrate=500)
+    elapsed = time.perf_counter() - start
+    sender.close_connection()
+    return elapsed, controller
+
+
+def main() -> None:
+    args = parse_arguments()
+    print(
+        f"Simulated GRBL: {args.baud_rate} baud, {args.latency_ms:.1f} ms latency each way, "
+        f"{args.line_ms:.2f} ms per line"
+    )
+    print(f"{'workload':<22} {'mode':<12} {'wall s':>8} {'lines/s':>9} {'busy %':>7} {'overflow':>9}")
+    for streaming in (False, True):
+        mode = "streaming" if streaming else "line-by-line"
+        elapsed, lines, controller = _run_program(args, streaming)
+        print(
+            f"{f'{lines}-line program':<22} {mode:<12} {elapsed:>8.3f} {lines / elapsed:>9.0f} "
+            f"{100.0 * controller.busy_s / elapsed:>7.1f} {controller.overflows:>9}"
+        )
+    for modal_session, streaming in ((False, False), (False, True), (True, False)):
+        mode = "streaming" if streaming else "line-by-line"
+        workload = f"{args.moves}x move{' (session)' if modal_session else ''}"
+        elapsed, controller = _run_moves(args, streaming, modal_session)
+        print(
+            f"{workload:<22} {mode:<12} {elapsed:>8.3f} "
+            f"{controller.lines_processed / elapsed:>9.0f} {100.0 * controller.busy_s / elapsed:>7.1f} "
+            f"{controller.overflows:>9}   ({1000.0 * elapsed / args.moves:.1f} ms per move)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure per-frame overhead of ``model.predict`` against the lean inference path.
+
+Run from the ``Console-ComputationalVision`` directory::
+
+    python -m tools.benchmark_lean_inference --model-path models/coke_water_vision.pt
+
+Both paths run on the same test-split frames (resized to the capture size) on
+CPU by default. Besides end-to-end latency, the network forward pass alone is
+timed so the difference can be read as pre/post-processing overhead, and both
+outputs are scored against the ground truth to confirm they agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import torch
+
+from services.lean_inference import LeanDetector
+from services.vision_service import _load_model, _results_to_array
+from tools.dataset_eval import DetectionEvaluator, iter_split
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/coke_water_vision.pt")
+    parser.add_argument("--device", choices=("cpu", "cuda"), default="cpu")
+    parser.add_argument("--split", default="test")
+    parser.add_argument("--frame-width", type=int, default=1280)
+    parser.add_argument("--frame-height", type=int, default=720)
+    parser.add_argument("--imgsz", type=int, default=None)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads before measuring.")
+    return parser.parse_args()
+
+
+def _summary(values: list[float]) -> str:
+    ordered = sorted(values)
+    p90 = ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+    return f"p50 {statistics.median(ordered):7.2f} ms  p90 {p90:7.2f} ms  mean {statistics.fmean(ordered):7.2f} ms"
+
+
+def main() -> None:
+    args = parse_arguments()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    model = _load_model(args.model_path, args.device)
+    lean = LeanDetector(model, args.device, args.imgsz)
+    samples = list(iter_split(args.split, frame_size=(args.frame_width, args.frame_height), limit=args.limit))
+    if not samples:
+        raise SystemExit(f"No images found for split '{args.split}'.")
+
+    options = {"imgsz": args.imgsz} if args.imgsz else {}
+
+    def predict(frame):
+        return _results_to_array(model.predict(frame, device=args.device, verbose=False, conf=args.conf, **options))
+
+    def lean_detect(frame):
+        return lean.detect([frame], args.conf)[0]
+
+    paths = {"model.predict": predict, "lean": lean_detect}
+    latencies: dict[str, list[float]] = {name: [] for name in paths}
+    evaluators = {name: DetectionEvaluator() for name in paths}
+    forward_ms: list[float] = []
+
+    with torch.inference_mode():
+        for run in paths.values():
+            for sample in samples[: args.warmup]:
+                run(sample.image)
+        for sample in samples:
+            for name, run in paths.items():
+                start = time.perf_counter()
+                detections = run(sample.image)
+                latencies[name].append((time.perf_counter() - start) * 1000.0)
+                evaluators[name].add(detections, sample.boxes)
+            tensor, _ = lean._letterbox([sample.image])
+            start = time.perf_counter()
+            lean.network(tensor)
+            forward_ms.append((time.perf_counter() - start) * 1000.0)
+
+    forward = statistics.median(forward_ms)
+    print(
+        f"{len(samples)} '{args.split}' frames at {args.frame_width}x{args.frame_height}, "
+        f"input {lean.imgsz}px, device {args.device}, {torch.get_num_threads()} threads"
+    )
+    print(f"{'network forward':<15} {_summary(forward_ms)}")
+    for name in paths:
+        overhead = statistics.median(latencies[name]) - forward
+        print(
+            f"{name:<15} {_summary(latencies[name])}  overhead {overhead:6.2f} ms  "
+            f"mAP@0.5 {evaluators[name].mean_average_precision():.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare full-frame and tiled inference on the bundled test split.
+
+Run from the ``Console-ComputationalVision`` directory::
+
+    python -m tools.benchmark_tiling --model-path models/coke_water_vision.pt
+
+Images are resized to the capture size (1280x720 by default) before inference
+so the comparison matches what the camera pipeline sees. The report lists
+mAP@0.5, recall on small objects (< 32x32 px) and per-frame latency for both
+modes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import torch
+
+from services.vision_service import (
+    _compute_tiles,
+    _load_model,
+    _predict_regions,
+    _results_to_array,
+)
+from tools.dataset_eval import DetectionEvaluator, iter_split
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/coke_water_vision.pt")
+    parser.add_argument("--device", choices=("cpu", "cuda"), default=None)
+    parser.add_argument("--split", default="test")
+    parser.add_argument("--frame-width", type=int, default=1280)
+    parser.add_argument("--frame-height", type=int, default=720)
+    parser.add_argument("--tile-size", type=int, default=640)
+    parser.add_argument("--tile-overlap", type=float, default=0.2)
+    parser.add_argument("--tile-nms-iou", type=float, default=0.5)
+    parser.add_argument("--conf", type=float, default=0.25, help="Prediction confidence used for both modes.")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N images of the split.")
+    parser.add_argument("--warmup", type=int, default=3)
+    return parser.parse_args()
+
+
+def _timed(function):
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    result = function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+def main() -> None:
+    args = parse_arguments()
+    device = args.device or ("cuda" if torch.cuda.is_available() else "cpu")
+    model = _load_model(args.model_path, device)
+    frame_size = (args.frame_width, args.frame_height)
+    tiles = _compute_tiles(args.frame_width, args.frame_height, args.tile_size, args.tile_overlap)
+
+    modes = {
+        "full-frame": lambda frame: _results_to_array(
+            model.predict(frame, device=device, verbose=False, conf=args.conf)
+        ),
+        "tiled": lambda frame: _predict_regions(
+            model,
+            frame,
+            tiles,
+            device=device,
+            conf=args.conf,
+            iou_threshold=args.tile_nms_iou,
+            include_full_frame=False,
+        ),
+        "tiled+full": lambda frame: _predict_regions(
+            model,
+            frame,
+            tiles,
+            device=device,
+            conf=args.conf,
+            iou_threshold=args.tile_nms_iou,
+            include_full_frame=True,
+        ),
+    }
+    evaluators = {name: DetectionEvaluator() for name in modes}
+    latencies: dict[str, list[float]] = {name: [] for name in modes}
+
+    samples = list(iter_split(args.split, frame_size=frame_size, limit=args.limit))
+    if not samples:
+        raise SystemExit(f"No images found for split '{args.split}'.")
+
+    with torch.inference_mode():
+        for name, predict in modes.items():
+            for sample in samples[: args.warmup]:
+                predict(sample.image)
+            for sample in samples:
+                detections, elapsed_ms = _timed(lambda: predict(sample.image))
+                latencies[name].append(elapsed_ms)
+                evaluators[name].add(detections, sample.boxes)
+
+    print(
+        f"{len(samples)} '{args.split}' images at {args.frame_width}x{args.frame_height} on {device}; "
+        f"{len(tiles)} tiles of {args.tile_size}px, overlap {args.tile_overlap:.2f}"
+    )
+    print(f"{'mode':<12} {'mAP@0.5':>8} {'small R':>8} {'p50 ms':>8} {'p90 ms':>8} {'FPS':>7}")
+    for name in modes:
+        values = sorted(latencies[name])
+        p50 = statistics.median(values)
+        p90 = values[min(len(values) - 1, int(0.9 * len(values)))]
+        print(
+            f"{name:<12} {evaluators[name].mean_average_precision():>8.3f} "
+            f"{evaluators[name].small_recall:>8.3f} {p50:>8.1f} {p90:>8.1f} {1000.0 / p50:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Build the colour/size profile used by the cascade's first stage.
+
+Run from the ``Console-ComputationalVision`` directory::
+
+    python -m tools.build_cascade_profile
+
+Hue/saturation histograms of labelled boxes and of background pixels are
+collected from the dataset's ``train`` split, and the box area range is taken
+from the same labels. The profile is written to ``models/cascade_profile.json``
+where ``--cascade`` picks it up by default.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from services.cascade import DEFAULT_PROFILE_PATH, CascadeProfile
+from tools.dataset_eval import DATASETS_DIR, iter_split
+
+DEFAULT_DATASET = "Challenge2025-SPI_moday_29_09"
+CLASSES = ["agua", "butter", "coco", "coke", "soap", "tomate"]
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--split", default="train")
+    parser.add_argument("--frame-width", type=int, default=320, help="Images are resized to the gate's working size.")
+    parser.add_argument("--frame-height", type=int, default=180)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--output", default=str(DEFAULT_PROFILE_PATH))
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_arguments()
+    samples = [
+        (sample.image, sample.boxes)
+        for sample in iter_split(
+            args.split,
+            frame_size=(args.frame_width, args.frame_height),
+            limit=args.limit,
+            dataset=args.dataset,
+        )
+    ]
+    if not samples:
+        raise SystemExit(f"No '{args.split}' images for dataset '{args.dataset}' under {DATASETS_DIR}.")
+
+    profile = CascadeProfile.build(samples, CLASSES)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    profile.save(output)
+    print(
+        f"Profile from {len(samples)} images: box area {profile.min_area_frac:.4f}-"
+        f"{profile.max_area_frac:.4f} of the frame -> {output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
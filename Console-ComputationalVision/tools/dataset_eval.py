@@ -0,0 +1,148 @@
+"""Helpers to evaluate detectors against the bundled YOLO-format dataset.
+
+Labels are read from ``<split>/labels/*.txt`` (``cls cx cy w h`` normalised to
+the image size) and detections are ``(N, 6)`` arrays of ``x1, y1, x2, y2,
+conf, cls`` in pixels, the format returned by the vision service helpers.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import cv2
+import numpy as np
+
+DATASETS_DIR = Path(__file__).resolve().parent.parent / "datasets"
+
+
+@dataclass
+class LabelledImage:
+    path: Path
+    image: np.ndarray
+    boxes: np.ndarray  # (M, 5): x1, y1, x2, y2, cls in pixels of ``image``
+
+
+def split_images(split: str = "test", dataset: Optional[str] = None) -> list[Path]:
+    pattern = f"{dataset or '*'}/{split}/images/*.jpg"
+    return sorted(DATASETS_DIR.glob(pattern))
+
+
+def _read_labels(label_path: Path, width: int, height: int) -> np.ndarray:
+    rows = []
+    if label_path.exists():
+        for line in label_path.read_text(encoding="utf-8").splitlines():
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            cls, cx, cy, w, h = int(parts[0]), *map(float, parts[1:5])
+            rows.append(
+                (
+                    (cx - w / 2) * width,
+                    (cy - h / 2) * height,
+                    (cx + w / 2) * width,
+                    (cy + h / 2) * height,
+                    cls,
+                )
+            )
+    if not rows:
+        return np.zeros((0, 5), dtype=np.float32)
+    return np.asarray(rows, dtype=np.float32)
+
+
+def iter_split(
+    split: str = "test",
+    *,
+    frame_size: Optional[tuple[int, int]] = None,
+    limit: Optional[int] = None,
+    dataset: Optional[str] = None,
+) -> Iterator[LabelledImage]:
+    """Yield images of a split with their ground truth, optionally resized to ``(width, height)``."""
+
+    paths = split_images(split, dataset)
+    if limit is not None:
+        paths = paths[:limit]
+    for path in paths:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        if frame_size is not None:
+            image = cv2.resize(image, frame_size, interpolation=cv2.INTER_AREA)
+        height, width = image.shape[:2]
+        label_path = path.parent.parent / "labels" / f"{path.stem}.txt"
+        yield LabelledImage(path=path, image=image, boxes=_read_labels(label_path, width, height))
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between ``(N, 4)`` and ``(M, 4)`` xyxy boxes."""
+
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:4], boxes_b[None, :, 2:4])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+class DetectionEvaluator:
+    """Accumulate detections and compute per-class AP at a single IoU threshold."""
+
+    def __init__(self, iou_threshold: float = 0.5) -> None:
+        self.iou_threshold = iou_threshold
+        self._scores: dict[int, list[tuple[float, bool]]] = {}
+        self._gt_counts: dict[int, int] = {}
+        self._small_hits = 0
+        self._small_total = 0
+
+    def add(self, detections: np.ndarray, ground_truth: np.ndarray, small_area: float = 32 * 32) -> None:
+        for cls in np.unique(ground_truth[:, 4]).astype(int) if len(ground_truth) else []:
+            self._gt_counts[cls] = self._gt_counts.get(cls, 0) + int((ground_truth[:, 4] == cls).sum())
+
+        gt_areas = (ground_truth[:, 2] - ground_truth[:, 0]) * (ground_truth[:, 3] - ground_truth[:, 1])
+        small = gt_areas < small_area
+        self._small_total += int(small.sum())
+
+        matched = np.zeros(len(ground_truth), dtype=bool)
+        order = np.argsort(-detections[:, 4]) if len(detections) else []
+        ious = box_iou(detections[:, :4], ground_truth[:, :4])
+        for index in order:
+            cls = int(detections[index, 5])
+            candidates = np.where((ground_truth[:, 4] == cls) & ~matched)[0] if len(ground_truth) else []
+            hit = False
+            if len(candidates):
+                best = candidates[np.argmax(ious[index, candidates])]
+                if ious[index, best] >= self.iou_threshold:
+                    matched[best] = True
+                    hit = True
+            self._scores.setdefault(cls, []).append((float(detections[index, 4]), hit))
+        self._small_hits += int((matched & small).sum())
+
+    def average_precision(self) -> dict[int, float]:
+        result: dict[int, float] = {}
+        for cls, total in self._gt_counts.items():
+            entries = sorted(self._scores.get(cls, []), key=lambda item: -item[0])
+            if not entries:
+                result[cls] = 0.0
+                continue
+            hits = np.array([hit for _, hit in entries], dtype=np.float64)
+            true_positives = np.cumsum(hits)
+            precision = true_positives / np.arange(1, len(hits) + 1)
+            recall = true_positives / max(total, 1)
+            # All-point interpolation, as in the VOC/COCO toolkits.
+            precision = np.concatenate(([1.0], precision, [0.0]))
+            recall = np.concatenate(([0.0], recall, [recall[-1]]))
+            precision = np.maximum.accumulate(precision[::-1])[::-1]
+            steps = np.where(recall[1:] != recall[:-1])[0]
+            result[cls] = float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+        return result
+
+    def mean_average_precision(self) -> float:
+        ap = self.average_precision()
+        return float(np.mean(list(ap.values()))) if ap else 0.0
+
+    @property
+    def small_recall(self) -> float:
+        return self._small_hits / self._small_total if self._small_total else float("nan")
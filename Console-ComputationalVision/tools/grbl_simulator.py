@@ -0,0 +1,209 @@
+"""In-process stand-in for a GRBL controller on a serial port.
+
+:class:`SimulatedGrbl` implements the part of the ``serial.Serial`` interface
+the senders use (``write``, ``flush``, ``read``, ``readline``,
+``in_waiting``, ``is_open``, ``close``) and models what limits GRBL
+streaming: bytes take ``10 / baud_rate`` seconds each on the wire plus a
+fixed USB/driver latency per direction, the controller holds at most
+``rx_buffer_size`` unread bytes, and each line takes ``line_time_s`` to parse
+and plan before its ``ok`` is sent. Bytes that arrive while the RX buffer is
+full are dropped and counted in ``overflows``, as on the real controller.
+
+:class:`PtyGrbl` answers on a pseudo-terminal instead (POSIX only), for code
+that opens the port itself.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import threading
+import time
+from collections import deque
+
+from services.GrblSender import RX_BUFFER_SIZE
+
+
+class SimulatedGrbl:
+    def __init__(
+        self,
+        *,
+        baud_rate: int = 115200,
+        rx_buffer_size: int = RX_BUFFER_SIZE,
+        link_latency_s: float = 0.001,
+        line_time_s: float = 0.0005,
+        timeout: float = 1.0,
+    ) -> None:
+        self.timeout = timeout
+        self.is_open = True
+        self.rx_buffer_size = rx_buffer_size
+        self.link_latency_s = link_latency_s
+        self.line_time_s = line_time_s
+        self.overflows = 0
+        self.lines_processed = 0
+        self.busy_s = 0.0
+        self.received: list[str] = []
+        self._byte_time = 10.0 / baud_rate
+        self._condition = threading.Condition()
+        self._incoming: deque[tuple[float, bytes]] = deque()
+        self._outgoing: deque[tuple[float, bytes]] = deque()
+        self._rx = bytearray()
+        self._wire_free_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="SimulatedGrbl", daemon=True)
+        self._thread.start()
+
+    # serial.Serial interface -------------------------------------------------
+
+    def write(self, data: bytes) -> int:
+        with self._condition:
+            now = time.monotonic()
+            start = max(now, self._wire_free_at)
+            self._wire_free_at = start + len(data) * self._byte_time
+            self._incoming.append((self._wire_free_at + self.link_latency_s, bytes(data)))
+            self._condition.notify_all()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def read(self, size: int = 1) -> bytes:
+        """Up to ``size`` bytes that have reached the host, blocking up to ``timeout`` for the first."""
+
+        deadline = time.monotonic() + (self.timeout if self.timeout is not None else 1e9)
+        data = bytearray()
+        with self._condition:
+            while self.is_open:
+                now = time.monotonic()
+                while self._outgoing and self._outgoing[0][0] <= now and len(data) < size:
+                    ready, chunk = self._outgoing.popleft()
+                    taken = chunk[: size - len(data)]
+                    data.extend(taken)
+                    if len(taken) < len(chunk):
+                        self._outgoing.appendleft((ready, chunk[len(taken) :]))
+                if data or now >= deadline:
+                    break
+                wake = self._outgoing[0][0] if self._outgoing else deadline
+                self._condition.wait(max(0.0, min(wake, deadline) - now))
+        return bytes(data)
+
+    def readline(self) -> bytes:
+        deadline = time.monotonic() + (self.timeout if self.timeout is not None else 1e9)
+        with self._condition:
+            while self.is_open:
+                now = time.monotonic()
+                if self._outgoing and self._outgoing[0][0] <= now:
+                    return self._outgoing.popleft()[1]
+                if now >= deadline:
+                    break
+                wake = self._outgoing[0][0] if self._outgoing else deadline
+                self._condition.wait(max(0.0, min(wake, deadline) - now))
+        return b""
+
+    @property
+    def in_waiting(self) -> int:
+        now = time.monotonic()
+        with self._condition:
+            return sum(len(data) for ready, data in self._outgoing if ready <= now)
+
+    def reset_input_buffer(self) -> None:
+        with self._condition:
+            self._outgoing.clear()
+
+    def close(self) -> None:
+        with self._condition:
+            self.is_open = False
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+
+    # controller ----------------------------------------------------------------
+
+    def _receive_arrived(self, now: float) -> None:
+        while self._incoming and self._incoming[0][0] <= now:
+            data = self._incoming.popleft()[1]
+            room = self.rx_buffer_size - len(self._rx)
+            if len(data) > room:
+                self.overflows += 1
+                data = data[: max(0, room)]
+            self._rx.extend(data)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self.is_open:
+                    now = time.monotonic()
+                    self._receive_arrived(now)
+                    if b"\n" in self._rx:
+                        break
+                    wake = self._incoming[0][0] - now if self._incoming else None
+                    self._condition.wait(wake)
+                if not self.is_open:
+                    return
+                index = self._rx.index(b"\n")
+                line = self._rx[:index].decode("utf-8", errors="replace").strip()
+                # GRBL frees RX space as soon as the line is read into its line buffer.
+                del self._rx[: index + 1]
+
+            start = time.perf_counter()
+            time.sleep(self.line_time_s)
+            elapsed = time.perf_counter() - start
+
+            with self._condition:
+                self.busy_s += elapsed
+                self.lines_processed += 1
+                self.received.append(line)
+                ready = time.monotonic() + 4 * self._byte_time + self.link_latency_s
+                self._outgoing.append((ready, b"ok\r\n"))
+                self._condition.notify_all()
+
+
+class PtyGrbl:
+    """GRBL stand-in behind a pseudo-terminal, for code that opens a real port.
+
+    ``port`` is the slave device path to pass to ``serial.Serial``. A thread
+    on the master side answers each received line with ``ok`` after
+    ``line_time_s``; realtime ``?`` gets an idle status report. There is no
+    baud-rate or RX buffer model: this exercises the OS serial path (file
+    descriptors, termios, the event loop) rather than the controller.
+    """
+
+    def __init__(self, *, line_time_s: float = 0.0005) -> None:
+        import tty  # POSIX only
+
+        self.line_time_s = line_time_s
+        self.lines_processed = 0
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="PtyGrbl", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        buffer = bytearray()
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._master], [], [], 0.05)
+            if not readable:
+                continue
+            try:
+                data = os.read(self._master, 4096)
+            except OSError:
+                return
+            if b"?" in data:
+                data = data.replace(b"?", b"")
+                os.write(self._master, b"<Idle|MPos:0.000,0.000,0.000|FS:0,0>\r\n")
+            buffer.extend(data)
+            while b"\n" in buffer:
+                index = buffer.index(b"\n")
+                del buffer[: index + 1]
+                time.sleep(self.line_time_s)
+                self.lines_processed += 1
+                os.write(self._master, b"ok\r\n")
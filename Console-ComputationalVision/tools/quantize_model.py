@@ -0,0 +1,202 @@
+"""Build an INT8 variant of a YOLO model and register it with its latency and mAP.
+
+Run from the ``Console-ComputationalVision`` directory::
+
+    python -m tools.quantize_model models/coke_water_vision.pt
+
+The network is BN-fused and quantised with FX graph-mode post-training static
+quantisation (x86/fbgemm backend). Activation ranges are calibrated on images
+from the dataset's ``train`` split, letterboxed exactly like inference
+inputs. The detection head stays in float, because its anchor decoding
+depends on the input shape and is not FX-traceable. The quantised graph is
+traced for one square input size and saved as ``<name>_int8.torchscript``
+with the metadata ultralytics reads from ``config.txt``, so ``YOLO()`` and the
+GUI load it like any other model. mAP@0.5 is validated on the ``valid`` split
+for the original and quantised models, CPU latency is measured on the same
+images, and the result is written to ``models/model_registry.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+
+from services.model_optimizer import _HeadOutput
+from services.model_registry import ModelRecord, register_model
+from tools.dataset_eval import DATASETS_DIR, split_images
+
+DEFAULT_DATASET = "Challenge2025-SPI_moday_29_09"
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model_path", help="Float .pt model from models/.")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--imgsz", type=int, default=640, help="Square input size the INT8 model is built for.")
+    parser.add_argument("--calibration-images", type=int, default=300)
+    parser.add_argument("--latency-images", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Defaults to <model>_int8.torchscript next to the model.")
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads for the latency runs.")
+    return parser.parse_args()
+
+
+def _letterbox_square(image: np.ndarray, size: int) -> torch.Tensor:
+    height, width = image.shape[:2]
+    scale = size / max(height, width)
+    resized_width, resized_height = round(width * scale), round(height * scale)
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    left, top = (size - resized_width) // 2, (size - resized_height) // 2
+    canvas[top : top + resized_height, left : left + resized_width] = cv2.resize(
+        image,
+        (resized_width, resized_height),
+        interpolation=cv2.INTER_LINEAR,
+    )
+    return torch.from_numpy(canvas[:, :, ::-1].copy()).permute(2, 0, 1).unsqueeze(0).float() / 255.0
+
+
+def _dataset_yaml(dataset: str, names: dict) -> Path:
+    """The bundled data.yaml carries Windows paths; write one that points at the local copy."""
+
+    root = DATASETS_DIR / dataset
+    payload = {
+        "path": str(root),
+        "train": "train/images",
+        "val": "valid/images",
+        "test": "test/images",
+        "names": {int(index): str(name) for index, name in names.items()},
+    }
+    handle = tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False, encoding="utf-8")
+    with handle:
+        json.dump(payload, handle)  # JSON is valid YAML.
+    return Path(handle.name)
+
+
+def quantize(model, imgsz: int, calibration: list[Path]) -> torch.jit.ScriptModule:
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.fx.custom_config import PrepareCustomConfig
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+    from ultralytics.nn.modules import Detect
+
+    engine = "x86" if "x86" in torch.backends.quantized.supported_engines else "fbgemm"
+    torch.backends.quantized.engine = engine
+
+    network = model.model.fuse(verbose=False).eval().cpu().float()
+    head = _HeadOutput(network).eval()
+    example = torch.rand(1, 3, imgsz, imgsz)
+
+    qconfig_mapping = get_default_qconfig_mapping(engine).set_object_type(Detect, None)
+    custom_config = PrepareCustomConfig().set_non_traceable_module_classes([Detect])
+    prepared = prepare_fx(head, qconfig_mapping, example_inputs=(example,), prepare_custom_config=custom_config)
+
+    # Observers update their ranges in place, which inference mode forbids on module buffers.
+    with torch.no_grad():
+        for index, path in enumerate(calibration, start=1):
+            image = cv2.imread(str(path))
+            if image is None:
+                continue
+            prepared(_letterbox_square(image, imgsz))
+            if index % 50 == 0:
+                print(f"  calibrated {index}/{len(calibration)} images")
+
+    quantized = convert_fx(prepared).eval()
+    with torch.no_grad():
+        traced = torch.jit.trace(quantized, example, check_trace=False)
+    return torch.jit.freeze(traced)
+
+
+def _save(module: torch.jit.ScriptModule, output: Path, model, imgsz: int, source: Path) -> None:
+    metadata = {
+        "description": f"INT8 static quantisation of {source.name}",
+        "date": datetime.now(timezone.utc).isoformat(),
+        "stride": int(max(model.model.stride)),
+        "task": "detect",
+        "batch": 1,
+        "imgsz": [imgsz, imgsz],
+        "names": {int(index): str(name) for index, name in model.names.items()},
+    }
+    torch.jit.save(module, str(output), _extra_files={"config.txt": json.dumps(metadata)})
+
+
+def _validate(weights: Path, data: Path, imgsz: int) -> float:
+    from ultralytics import YOLO
+
+    model = YOLO(str(weights), task="detect")
+    metrics = model.val(data=str(data), split="val", imgsz=imgsz, batch=1, device="cpu", plots=False, verbose=False)
+    return float(metrics.box.map50)
+
+
+def _latency(weights: Path, images: list[Path], imgsz: int) -> float:
+    from ultralytics import YOLO
+
+    model = YOLO(str(weights), task="detect")
+    frames = [frame for frame in (cv2.imread(str(path)) for path in images) if frame is not None]
+    for frame in frames[:3]:
+        model.predict(frame, device="cpu", verbose=False, imgsz=imgsz)
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        model.predict(frame, device="cpu", verbose=False, imgsz=imgsz)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(latencies)
+
+
+def main() -> None:
+    args = parse_arguments()
+    from ultralytics import YOLO
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    source = Path(args.model_path).resolve()
+    output = Path(args.output).resolve() if args.output else source.with_name(f"{source.stem}_int8.torchscript")
+    calibration = split_images("train", args.dataset)[: args.calibration_images]
+    validation = split_images("valid", args.dataset)
+    if not calibration or not validation:
+        raise SystemExit(f"Dataset '{args.dataset}' needs train and valid images under {DATASETS_DIR}.")
+
+    model = YOLO(str(source))
+    data = _dataset_yaml(args.dataset, model.names)
+    try:
+        print(f"Calibrating on {len(calibration)} train images at {args.imgsz}px...")
+        module = quantize(model, args.imgsz, calibration)
+        _save(module, output, model, args.imgsz, source)
+        print(f"Saved {output}")
+
+        print(f"Validating on {len(validation)} valid images...")
+        baseline_map = _validate(source, data, args.imgsz)
+        quantized_map = _validate(output, data, args.imgsz)
+    finally:
+        data.unlink(missing_ok=True)
+
+    latency_images = validation[: args.latency_images]
+    baseline_ms = _latency(source, latency_images, args.imgsz)
+    quantized_ms = _latency(output, latency_images, args.imgsz)
+
+    record = ModelRecord(
+        path=output.name,
+        source=source.name,
+        precision="int8",
+        imgsz=args.imgsz,
+        latency_ms=quantized_ms,
+        baseline_latency_ms=baseline_ms,
+        map50=quantized_map,
+        baseline_map50=baseline_map,
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        calibration_images=len(calibration),
+        device="cpu",
+    )
+    registry = register_model(output.parent, record)
+    print(f"{output.name}: {record.describe()}")
+    print(f"Registered in {registry}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Try a few thread/CPU layouts and report throughput and jitter for each.
+
+Run from the ``Console-ComputationalVision`` directory::
+
+    python -m tools.tune_resources --model-path models/coke_water_vision.pt
+
+Every layout runs in a fresh subprocess, because torch inter-op threads and
+OpenMP pools can only be configured once per process. A worker mimics the
+application:
+- a capture thread decodes test-split JPEGs at the target FPS;
+- the inference loop predicts on the newest frame;
+- a GUI stand-in ticks every 30 ms like the Tk ``after`` loops.
+Each role is pinned by the same :class:`ResourceGovernor` the application
+uses. The report lists inference FPS, p50/p99 latency, latency jitter
+(p99 - p50) and GUI timer lateness, then prints the flags of the best layout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from services.resource_governor import ResourceGovernor, ResourceLayout, available_cpus, format_cpu_list
+
+_GUI_TICK_S = 0.030
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-path", default="models/coke_water_vision.pt")
+    parser.add_argument("--frame-width", type=int, default=1280)
+    parser.add_argument("--frame-height", type=int, default=720)
+    parser.add_argument("--target-fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=15.0, help="Measured duration per layout.")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def candidate_layouts(cpus: list[int]) -> dict[str, ResourceLayout]:
+    count = len(cpus)
+    layouts = {"library defaults": ResourceLayout()}
+    layouts[f"torch={count}, unpinned"] = ResourceLayout(torch_threads=count, interop_threads=1, cv2_threads=1)
+    if count >= 2:
+        inference = cpus[:-1]
+        layouts["1 core for capture+gui"] = ResourceLayout(
+            torch_threads=len(inference),
+            interop_threads=1,
+            cv2_threads=1,
+            cpus={"inference": frozenset(inference), "capture": frozenset(cpus[-1:]), "gui": frozenset(cpus[-1:])},
+        )
+    if count >= 4:
+        inference = cpus[:-2]
+        layouts["capture and gui on own cores"] = ResourceLayout(
+            torch_threads=len(inference),
+            interop_threads=1,
+            cv2_threads=1,
+            cpus={"inference": frozenset(inference), "capture": frozenset(cpus[-2:-1]), "gui": frozenset(cpus[-1:])},
+        )
+        half = cpus[: count // 2]
+        layouts["inference on half the cores"] = ResourceLayout(
+            torch_threads=len(half),
+            interop_threads=1,
+            cv2_threads=1,
+            cpus={"inference": frozenset(half), "capture": frozenset(cpus[count // 2 :]), "gui": frozenset(cpus[count // 2 :])},
+        )
+    return layouts
+
+
+def _layout_to_json(layout: ResourceLayout) -> str:
+    return json.dumps(
+        {
+            "torch_threads": layout.torch_threads,
+            "interop_threads": layout.interop_threads,
+            "cv2_threads": layout.cv2_threads,
+            "cpus": {role: sorted(cpus) for role, cpus in layout.cpus.items()},
+        }
+    )
+
+
+def _layout_from_json(text: str) -> ResourceLayout:
+    raw = json.loads(text)
+    cpus = {role: frozenset(values) for role, values in raw.pop("cpus").items()}
+    return ResourceLayout(cpus=cpus, **raw)
+
+
+def run_worker(args: argparse.Namespace) -> dict:
+    """Measure one layout in this process and return its statistics."""
+
+    import cv2
+
+    from services.vision_service import _load_model, _resolve_device
+    from tools.dataset_eval import split_images
+
+    governor = ResourceGovernor(_layout_from_json(args.worker))
+    governor.apply_process()
+    governor.pin_current_thread("inference")
+    model = _load_model(args.model_path, _resolve_device("cpu"))
+    paths = split_images("test")[:40]
+    if not paths:
+        raise SystemExit("The test split is empty.")
+
+    stop = threading.Event()
+    latest: list = [None]
+    condition = threading.Condition()
+    gui_lateness: list[float] = []
+
+    def capture() -> None:
+        governor.pin_current_thread("capture")
+        index = 0
+        period = 1.0 / args.target_fps
+        while not stop.is_set():
+            started = time.perf_counter()
+            frame = cv2.imread(str(paths[index % len(paths)]))
+            frame = cv2.resize(frame, (args.frame_width, args.frame_height), interpolation=cv2.INTER_AREA)
+            with condition:
+                latest[0] = frame
+                condition.notify()
+            index += 1
+            time.sleep(max(0.0, period - (time.perf_counter() - started)))
+
+    def gui() -> None:
+        governor.pin_current_thread("gui")
+        deadline = time.perf_counter() + _GUI_TICK_S
+        while not stop.is_set():
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            now = time.perf_counter()
+            gui_lateness.append((now - deadline) * 1000.0)
+            deadline = now + _GUI_TICK_S
+
+    threads = [threading.Thread(target=capture, daemon=True), threading.Thread(target=gui, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    def next_frame():
+        with condition:
+            condition.wait_for(lambda: latest[0] is not None)
+            frame, latest[0] = latest[0], None
+        return frame
+
+    for _ in range(5):
+        model.predict(next_frame(), device="cpu", verbose=False)
+    gui_lateness.clear()
+
+    latencies: list[float] = []
+    measure_start = time.perf_counter()
+    while time.perf_counter() - measure_start < args.seconds:
+        frame = next_frame()
+        start = time.perf_counter()
+        model.predict(frame, device="cpu", verbose=False)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    elapsed = time.perf_counter() - measure_start
+    stop.set()
+
+    ordered = sorted(latencies)
+    lateness = sorted(gui_lateness) or [0.0]
+    return {
+        "fps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(ordered),
+        "p99_ms": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+        "gui_p99_late_ms": lateness[min(len(lateness) - 1, int(0.99 * len(lateness)))],
+    }
+
+
+def main() -> None:
+    args = parse_arguments()
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    cpus = available_cpus()
+    print(f"CPUs available: {format_cpu_list(cpus)}")
+    results: dict[str, dict] = {}
+    layouts = candidate_layouts(cpus)
+    for name, layout in layouts.items():
+        command = [
+            sys.executable,
+            "-m",
+            "tools.tune_resources",
+            "--worker",
+            _layout_to_json(layout),
+            "--model-path",
+            args.model_path,
+            "--frame-width",
+            str(args.frame_width),
+            "--frame-height",
+            str(args.frame_height),
+            "--target-fps",
+            str(args.target_fps),
+            "--seconds",
+            str(args.seconds),
+        ]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{name}: failed\n{completed.stderr.strip()}")
+            continue
+        results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    if not results:
+        raise SystemExit("No layout could be measured.")
+
+    print(f"{'layout':<32} {'FPS':>6} {'p50 ms':>8} {'p99 ms':>8} {'jitter':>8} {'GUI late p99':>13}")
+    for name, stats in results.items():
+        print(
+            f"{name:<32} {stats['fps']:>6.1f} {stats['p50_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+            f"{stats['p99_ms'] - stats['p50_ms']:>8.1f} {stats['gui_p99_late_ms']:>11.1f} ms"
+        )
+
+    # Throughput first; among layouts within 5% of the best, prefer the steadiest.
+    best_fps = max(stats["fps"] for stats in results.values())
+    contenders = {name: stats for name, stats in results.items() if stats["fps"] >= 0.95 * best_fps}
+    best = min(contenders, key=lambda name: contenders[name]["p99_ms"] - contenders[name]["p50_ms"])
+    print(f"\nBest: {best} ({layouts[best].describe()})")
+    print("Flags: " + " ".join(layouts[best].to_args()))
+
+
+if __name__ == "__main__":
+    main()